@@ -0,0 +1,73 @@
+"""Benchmark CardClassifier inference backends against the fp32 model.
+
+Reports single-image latency, batched throughput and top-1 agreement with
+eager fp32 predictions::
+
+    python benchmarks/bench_backends.py --model scanner/card_model.pt \
+        --images assets/scans
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from pathlib import Path
+import copy
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import torch
+
+from scanner.classifier import BACKENDS, INPUT_SIZE, CardClassifier
+from scanner.export_model import load_calibration_images
+
+
+def _mean_seconds(fn, iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark CardClassifier inference backends")
+    parser.add_argument("--model", help="fp32 checkpoint; random weights when omitted")
+    parser.add_argument("--images", help="Directory with evaluation images")
+    parser.add_argument("--classes", type=int, default=500, help="Classes for random model")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    images = load_calibration_images(args.images) if args.images else []
+    if not images:
+        images = list(torch.rand(args.batch_size * 2, 3, *INPUT_SIZE))
+    batch = (images * args.batch_size)[: args.batch_size]
+
+    if args.model:
+        base = CardClassifier.load(args.model, device="cpu")
+    else:
+        base = CardClassifier(num_classes=args.classes, device="cpu")
+        base.classes_ = [str(i) for i in range(args.classes)]
+
+    def build(backend: str) -> CardClassifier:
+        return copy.deepcopy(base).compile(backend, calibration=images)
+
+    reference = base.predict(images)
+    print(f"{'backend':<14}{'latency ms':>12}{'cards/s':>12}{'top-1 agree':>14}")
+    for backend in BACKENDS:
+        clf = build(backend)
+        latency = _mean_seconds(lambda: clf.predict(batch[:1]), args.iterations)
+        per_batch = _mean_seconds(lambda: clf.predict(batch), args.iterations)
+        preds = clf.predict(images)
+        agreement = sum(a == b for a, b in zip(preds, reference)) / len(reference)
+        print(
+            f"{backend:<14}{latency * 1000:>12.2f}{args.batch_size / per_batch:>12.1f}"
+            f"{agreement:>13.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
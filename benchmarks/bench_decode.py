@@ -0,0 +1,59 @@
+"""Compare full-resolution decoding with the reduced-resolution fast path.
+
+Reports milliseconds per image for producing the 64x64 model input::
+
+    python benchmarks/bench_decode.py --images assets/scans
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+from torchvision import transforms
+
+from scanner import preprocessing
+
+
+def full_decode(path: Path):
+    transform = transforms.Compose([transforms.Resize((64, 64)), transforms.ToTensor()])
+    return transform(Image.open(path).convert("RGB"))
+
+
+def draft_decode(path: Path):
+    return preprocessing.to_tensor(preprocessing.open_rgb(path))
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark image decode for model input")
+    parser.add_argument("--images", default="assets/scans")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = sorted(Path(args.images).glob("*.jpg"))
+    if not paths:
+        raise SystemExit(f"No JPEG files in {args.images}")
+
+    print(f"{len(paths)} images, {args.repeat} passes")
+    print(f"{'path':<14}{'ms/image':>12}")
+    timings = {}
+    for name, fn in (("full decode", full_decode), ("draft decode", draft_decode)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for path in paths:
+                fn(path)
+        timings[name] = (time.perf_counter() - start) / (args.repeat * len(paths))
+        print(f"{name:<14}{timings[name] * 1000:>12.2f}")
+    print(f"speed-up: {timings['full decode'] / timings['draft decode']:.1f}x")
+
+    diff = max(float((full_decode(p) - draft_decode(p)).abs().mean()) for p in paths)
+    print(f"max mean abs pixel difference: {diff:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare two-model inference with the shared-backbone multi-head model.
+
+Both paths use randomly initialised weights, so only timing is meaningful::
+
+    python benchmarks/bench_multihead.py --classes 500 --batch-size 32
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import torch
+
+from scanner.classifier import CardClassifier, MultiHeadCardClassifier
+
+
+def _time(fn, iterations: int) -> float:
+    """Return mean seconds per call of ``fn`` after one warm-up call."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark multi-head vs two-model inference")
+    parser.add_argument("--classes", type=int, default=500, help="Number of card IDs")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    card_ids = [f"set-{i}" for i in range(args.classes)]
+    types = ["common", "holo", "reverse"]
+
+    id_clf = CardClassifier(num_classes=len(card_ids), device="cpu")
+    id_clf.classes_ = card_ids
+    type_clf = CardClassifier(num_classes=len(types), device="cpu")
+    type_clf.classes_ = types
+    multi_clf = MultiHeadCardClassifier(num_classes=len(card_ids), num_types=len(types), device="cpu")
+    multi_clf.classes_ = card_ids
+    multi_clf.type_classes_ = types
+
+    batch = list(torch.rand(args.batch_size, 3, 64, 64))
+
+    def two_models():
+        id_clf.predict(batch)
+        type_clf.predict(batch)
+
+    def multihead():
+        multi_clf.predict_with_type(batch)
+
+    two = _time(two_models, args.iterations)
+    one = _time(multihead, args.iterations)
+    print(f"batch size: {args.batch_size}, classes: {args.classes}")
+    print(f"{'path':<12}{'ms/batch':>12}{'ms/card':>12}")
+    for name, seconds in (("two-model", two), ("multi-head", one)):
+        print(f"{name:<12}{seconds * 1000:>12.2f}{seconds * 1000 / args.batch_size:>12.3f}")
+    print(f"speed-up: {two / one:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare a SequenceMatcher scan over all names with the trigram index.
+
+Uses the card names of the synced catalog, or synthetic names when it has
+not been synced, and queries them with single-character OCR typos::
+
+    python benchmarks/bench_name_index.py --names 20000
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from difflib import SequenceMatcher
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scanner.catalog import get_catalog
+from scanner.name_index import NameIndex
+
+SYLLABLES = ["pi", "ka", "chu", "char", "man", "der", "zard", "bul", "ba", "saur", "mew", "two", "ee", "vee", "gen", "gar", "don", "ite"]
+
+
+def synthetic_names(count: int, rng: random.Random) -> list[str]:
+    names = set()
+    while len(names) < count:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        names.add(word + rng.choice(["", "", " ex", " V", " VMAX", " GX"]))
+    return sorted(names)
+
+
+def typo(name: str, rng: random.Random) -> str:
+    i = rng.randrange(len(name))
+    return name[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + name[i + 1:]
+
+
+def scan(names: list[str], query: str) -> str:
+    query = query.lower()
+    return max(names, key=lambda n: SequenceMatcher(None, query, n.lower()).ratio())
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark fuzzy card name lookup")
+    parser.add_argument("--names", type=int, default=20000, help="Synthetic names without a catalog")
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    catalog = get_catalog()
+    names = catalog.card_names() if catalog is not None else []
+    names = names or synthetic_names(args.names, rng)
+    queries = [typo(rng.choice(names), rng) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = NameIndex(names)
+    print(f"{len(names)} names, index built in {time.perf_counter() - start:.2f} s")
+
+    print(f"{'path':<18}{'ms/query':>10}")
+    timings = {}
+    for label, fn in (
+        ("SequenceMatcher", lambda q: scan(names, q)),
+        ("trigram index", lambda q: index.best(q)),
+    ):
+        start = time.perf_counter()
+        for query in queries:
+            fn(query)
+        timings[label] = (time.perf_counter() - start) / len(queries)
+        print(f"{label:<18}{timings[label] * 1000:>10.3f}")
+    print(f"speed-up: {timings['SequenceMatcher'] / timings['trigram index']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compare the PIL OCR preprocessing chain with the batched NumPy path.
+
+All variants start from decoded card images and produce the name and number
+crops handed to Tesseract: the PIL chain enhancing the full card before
+cropping, the same chain run on each crop, and the batched NumPy path::
+
+    python benchmarks/bench_ocr_preprocess.py --images assets/scans
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+
+from scanner.card_scanner import enhance_for_ocr, safe_crop
+from scanner.ocr_preprocessing import NAME_REGION, NUMBER_REGION, prepare_card_rois, region_box
+
+
+def pil_full_card(images: list[Image.Image]) -> list[Image.Image]:
+    crops = []
+    for image in images:
+        gray = enhance_for_ocr(image)
+        for region in (NAME_REGION, NUMBER_REGION):
+            crops.append(safe_crop(gray, region_box(gray.size, region)))
+    return crops
+
+
+def pil_per_crop(images: list[Image.Image]) -> list[Image.Image]:
+    return [
+        enhance_for_ocr(safe_crop(image, region_box(image.size, region)))
+        for image in images
+        for region in (NAME_REGION, NUMBER_REGION)
+    ]
+
+
+def numpy_batch(images: list[Image.Image]) -> list[Image.Image]:
+    names, numbers = prepare_card_rois(images)
+    return names + numbers
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark OCR crop preprocessing")
+    parser.add_argument("--images", default="assets/scans")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = sorted(Path(args.images).glob("*.jpg"))
+    if not paths:
+        raise SystemExit(f"No JPEG files in {args.images}")
+    images = [Image.open(p).convert("RGB") for p in paths]
+
+    print(f"{len(images)} cards, {args.repeat} passes")
+    print(f"{'path':<16}{'ms/card':>10}")
+    timings = {}
+    variants = (
+        ("PIL full card", pil_full_card),
+        ("PIL per crop", pil_per_crop),
+        ("NumPy batch", numpy_batch),
+    )
+    for name, fn in variants:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            fn(images)
+        timings[name] = (time.perf_counter() - start) / (args.repeat * len(images))
+        print(f"{name:<16}{timings[name] * 1000:>10.2f}")
+    for name in ("PIL full card", "PIL per crop"):
+        print(f"speed-up vs {name}: {timings[name] / timings['NumPy batch']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
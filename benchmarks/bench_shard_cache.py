@@ -0,0 +1,68 @@
+"""Compare a training epoch read from JPEGs with one read from shards.
+
+The scans are linked into a temporary one-class ``ImageFolder``; both
+variants iterate the same DataLoader settings without running a model::
+
+    python benchmarks/bench_shard_cache.py --images assets/scans
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import torch
+from torchvision import datasets, transforms
+
+from scanner.preprocessing import open_rgb
+from scanner.shard_cache import ShardDataset, build_shards
+
+
+def epoch(dataset, workers: int) -> float:
+    loader = torch.utils.data.DataLoader(dataset, batch_size=32, shuffle=True, num_workers=workers)
+    start = time.perf_counter()
+    for _ in loader:
+        pass
+    return (time.perf_counter() - start) / len(dataset)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark training input from JPEGs and shards")
+    parser.add_argument("--images", default="assets/scans")
+    parser.add_argument("--copies", type=int, default=10, help="Links per scan")
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = sorted(Path(args.images).resolve().glob("*.jpg"))
+    if not paths:
+        raise SystemExit(f"No JPEG files in {args.images}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp) / "cards" / "card"
+        folder.mkdir(parents=True)
+        for copy in range(args.copies):
+            for path in paths:
+                (folder / f"{copy}-{path.name}").symlink_to(path)
+        transform = transforms.Compose([transforms.Resize((64, 64)), transforms.ToTensor()])
+        jpegs = datasets.ImageFolder(folder.parent, transform=transform, loader=open_rgb)
+
+        start = time.perf_counter()
+        build_shards(folder.parent, Path(tmp) / "shards")
+        build = time.perf_counter() - start
+        shards = ShardDataset(Path(tmp) / "shards")
+
+        print(f"{len(jpegs)} images, one-time shard build {build:.2f} s")
+        print(f"{'source':<10}{'ms/image':>10}")
+        timings = {"JPEG": epoch(jpegs, args.workers), "shards": epoch(shards, args.workers)}
+        for name, seconds in timings.items():
+            print(f"{name:<10}{seconds * 1000:>10.3f}")
+        print(f"speed-up: {timings['JPEG'] / timings['shards']:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
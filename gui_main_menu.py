@@ -1,9 +1,12 @@
 from pathlib import Path
+import queue
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import customtkinter as ctk
 from PIL import Image, ImageTk
 from scanner import card_scanner
+from scanner.enrichment import STATUS_FIELD, EnrichmentQueue, without_status
+from scanner.scan_cache import ScanCache
 from gui_utils import (
     init_tk_theme,
     set_window_icon,
@@ -131,14 +134,39 @@ def show_scan_progress(paths: list[Path]) -> None:
         status.config(text=f"{current} / {total}")
         frame.update()
 
-    data = card_scanner.scan_files(paths, progress_callback=update_progress)
+    # Card details are looked up in the background so the progress bar
+    # follows the models rather than the API.
+    enrichment_queue = EnrichmentQueue()
+    cache = ScanCache()
+
+    def close_when_enriched() -> None:
+        # Rows are cached as their lookups finish, so the cache stays open
+        # until the queue is idle.
+        if enrichment_queue.pending:
+            _root.after(500, close_when_enriched)
+            return
+        enrichment_queue.close()
+        cache.close()
+
+    try:
+        data = card_scanner.scan_files(
+            paths,
+            progress_callback=update_progress,
+            cache=cache,
+            enrichment_queue=enrichment_queue,
+        )
+    finally:
+        close_when_enriched()
     running = False
-    show_scan_results(data)
+    show_scan_results(data, enrichment_queue)
     back_btn.config(state="normal")
 
 
-def show_scan_results(data: list[dict]) -> None:
-    """Display scanned card information and allow saving to CSV."""
+def show_scan_results(data: list[dict], enrichment_queue: EnrichmentQueue | None = None) -> None:
+    """Display scanned card information and allow saving to CSV.
+
+    Rows still being enriched by ``enrichment_queue`` are updated in place.
+    """
     if _content is None:
         return
 
@@ -147,19 +175,49 @@ def show_scan_results(data: list[dict]) -> None:
     frame.pack(fill="both", expand=True)
 
     columns = ["CardID", "Name", "Number", "Set", "Type"]
+    if enrichment_queue is not None:
+        columns.append(STATUS_FIELD)
     tree = ttk.Treeview(frame, columns=columns, show="headings")
     vsb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
     tree.configure(yscrollcommand=vsb.set)
     for col in columns:
         tree.heading(col, text=col)
         tree.column(col, width=120)
-    for row in data:
+    item_ids = {id(row): str(i) for i, row in enumerate(data)}
+
+    # ``on_update`` runs on the enrichment thread; rows are handed over
+    # through a queue and drawn from the Tk thread.
+    updates: queue.Queue[dict] = queue.Queue()
+
+    def poll() -> None:
+        if not tree.winfo_exists():
+            return
+        while True:
+            try:
+                row = updates.get_nowait()
+            except queue.Empty:
+                break
+            tree.item(item_ids[id(row)], values=[row.get(c, "") for c in columns])
+        # Rows are handed over before ``pending`` drops, so none are left.
+        if enrichment_queue.pending:
+            frame.after(100, poll)
+
+    if enrichment_queue is not None:
+        enrichment_queue.on_update = updates.put
+        frame.after(100, poll)
+    for i, row in enumerate(data):
         values = [row.get(c, "") for c in columns]
-        tree.insert("", "end", values=values)
+        tree.insert("", "end", iid=str(i), values=values)
     tree.pack(side="left", fill="both", expand=True, pady=10)
     vsb.pack(side="right", fill="y")
 
     def save() -> None:
+        if enrichment_queue is not None and enrichment_queue.pending:
+            if not messagebox.askyesno(
+                "Pobieranie danych",
+                f"Dane {enrichment_queue.pending} kart są jeszcze pobierane. Zapisać mimo to?",
+            ):
+                return
         save_path = filedialog.asksaveasfilename(
             title="Zapisz dane skanowania",
             initialdir="data",
@@ -167,7 +225,9 @@ def show_scan_results(data: list[dict]) -> None:
             filetypes=[("CSV", "*.csv")],
         )
         if save_path:
-            card_scanner.export_to_csv(data, save_path)
+            # Cached rows carry no enrichment status, fresh ones do; the
+            # column is dropped so every row has the same fields.
+            card_scanner.export_to_csv([without_status(row) for row in data], save_path)
             messagebox.showinfo(
                 "Skanowanie zakonczone",
                 f"Zapisano {len(data)} rekordów do {save_path}"
@@ -1,2 +1,2 @@
-from scanner import image_analyzer
-image_analyzer.train_type_classifier("scanner/dataset.csv", "scanner/type_model.pt", epochs=5)
+from scanner import image_analyzer
+image_analyzer.train_type_classifier("scanner/dataset.csv", image_analyzer.MODEL_PATH, epochs=5)
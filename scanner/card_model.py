@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from argparse import ArgumentParser
 from pathlib import Path
-from PIL import Image
+import random
 
 try:
     import torch
@@ -13,57 +14,131 @@ except Exception:  # pragma: no cover - torch may be missing
     transforms = None
 
 from .classifier import CardClassifier
+from .model_registry import get_classifier
+from .preprocessing import load_tensor, open_rgb
+from .shard_cache import prepare_dataset
 
 MODEL_PATH = Path(__file__).resolve().parent / "card_model.pt"
 
-_model: CardClassifier | None = None
-
 
 def load(model_path: str | Path = MODEL_PATH) -> CardClassifier:
     """Return a loaded :class:`CardClassifier` from ``model_path``."""
     if not torch:
         raise ImportError("PyTorch is required for prediction")
-    global _model
-    if _model is None:
-        if not Path(model_path).exists():
-            raise RuntimeError("Card classifier model not found")
-        _model = CardClassifier.load(model_path, device="cpu")
-    return _model
+    if not Path(model_path).exists():
+        raise RuntimeError("Card classifier model not found")
+    return get_classifier(model_path)
 
 
 def predict(image_path: str, model_path: str | Path = MODEL_PATH) -> str:
     """Return predicted card identifier for ``image_path``."""
     clf = load(model_path)
-    transform = transforms.Compose([transforms.Resize((64, 64)), transforms.ToTensor()])
-    img = Image.open(image_path).convert("RGB")
-    tensor = transform(img)
-    return clf.predict([tensor])[0]
+    return clf.predict([load_tensor(image_path)])[0]
 
-def train_card_classifier(dataset_dir: Path, output_model_path: Path):
-    """Train a model to recognize card IDs (e.g., swsh9-124)."""
-    import torch
-    from torchvision import datasets, transforms
-    from torch.utils.data import DataLoader
-
-    transform = transforms.Compose([
-        transforms.Resize((64, 64)),
-        transforms.ToTensor(),
-    ])
-    dataset = datasets.ImageFolder(dataset_dir, transform=transform)
-    loader = DataLoader(dataset, batch_size=32, shuffle=True)
-
-    X, y = [], []
-    for img, label in loader:
-        for i in range(img.size(0)):
-            X.append(img[i])
-            y.append(dataset.classes[label[i]])
-
-    clf = CardClassifier(model_name="resnet18", num_classes=len(set(y)))
-    clf.fit(X, y, epochs=10)
+def train_card_classifier(
+    dataset_dir: Path,
+    output_model_path: Path,
+    num_workers: int | None = None,
+    use_shards: bool = True,
+):
+    """Train a model to recognize card IDs (e.g., swsh9-124).
+
+    Images are read from the preprocessed shards of ``dataset_dir`` (see
+    :mod:`scanner.shard_cache`), which are brought up to date first. With
+    ``use_shards=False`` the JPEGs are decoded by loader workers instead.
+    """
+    if use_shards:
+        dataset = prepare_dataset(dataset_dir)
+    else:
+        from torchvision import datasets
+
+        transform = transforms.Compose([
+            transforms.Resize((64, 64)),
+            transforms.ToTensor(),
+        ])
+        dataset = datasets.ImageFolder(dataset_dir, transform=transform, loader=open_rgb)
+
+    clf = CardClassifier(model_name="resnet18", num_classes=len(dataset.classes))
+    clf.fit(dataset, epochs=10, num_workers=num_workers)
     clf.save(output_model_path)
     print(f"[✓] Model zapisany do {output_model_path}")
 
+
+def replay_indices(targets: list[int], classes: list[str], known: set[str], per_class: int, seed: int = 0) -> list[int]:
+    """Return indices of every sample of a new class and of up to
+    ``per_class`` random samples of each ``known`` class.
+    """
+    order = list(range(len(targets)))
+    random.Random(seed).shuffle(order)
+    taken: dict[int, int] = {}
+    indices = []
+    for idx in order:
+        target = targets[idx]
+        if classes[target] in known:
+            if taken.get(target, 0) >= per_class:
+                continue
+            taken[target] = taken.get(target, 0) + 1
+        indices.append(idx)
+    return sorted(indices)
+
+
+def extend_card_classifier(
+    dataset_dir: Path,
+    model_path: Path = MODEL_PATH,
+    output_model_path: Path | None = None,
+    replay_per_class: int = 4,
+    epochs: int = 3,
+    freeze_backbone: bool = False,
+    num_workers: int | None = None,
+) -> list[str]:
+    """Add the card IDs of ``dataset_dir`` missing from an existing model.
+
+    The checkpoint at ``model_path`` is fine-tuned with
+    :meth:`CardClassifier.partial_fit` on every image of the new card IDs
+    plus ``replay_per_class`` images of each card it already knows, instead
+    of retraining on the whole dataset. Returns the added card IDs.
+    """
+    dataset = prepare_dataset(dataset_dir)
+    clf = CardClassifier.load(model_path)
+    known = set(clf.classes_)
+    added = [c for c in dataset.classes if c not in known]
+    if not added:
+        print("[INFO] Brak nowych kart do dodania")
+        return []
+
+    subset = torch.utils.data.Subset(
+        dataset, replay_indices(dataset.targets, dataset.classes, known, replay_per_class)
+    )
+    print(f"[INFO] Nowe karty: {len(added)}, obrazów do treningu: {len(subset)}")
+    clf.partial_fit(
+        subset,
+        dataset.classes,
+        epochs=epochs,
+        freeze_backbone=freeze_backbone,
+        num_workers=num_workers,
+    )
+    output_model_path = output_model_path or model_path
+    clf.save(output_model_path)
+    print(f"[✓] Model zapisany do {output_model_path}")
+    return added
+
+
 if __name__ == "__main__":
-    dataset_path = Path("data/card_dataset")  # folder z obrazami kart pogrupowanymi wg ID
-    model_path = Path(__file__).resolve().parent / "card_model.pt"
-    train_card_classifier(dataset_path, model_path)
\ No newline at end of file
+    parser = ArgumentParser(description="Train or extend the card ID classifier")
+    parser.add_argument("command", nargs="?", choices=["train", "extend"], default="train")
+    parser.add_argument("--dataset", default="data/card_dataset", help="Folder z obrazami kart pogrupowanymi wg ID")
+    parser.add_argument("--freeze-backbone", action="store_true", help="Extend: train the output layer only")
+    parser.add_argument("--replay", type=int, default=4, help="Extend: images replayed per known card")
+    parser.add_argument("--epochs", type=int, default=3, help="Extend: fine-tuning epochs")
+    args = parser.parse_args()
+
+    if args.command == "extend":
+        extend_card_classifier(
+            Path(args.dataset),
+            MODEL_PATH,
+            replay_per_class=args.replay,
+            epochs=args.epochs,
+            freeze_backbone=args.freeze_backbone,
+        )
+    else:
+        train_card_classifier(Path(args.dataset), MODEL_PATH)
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+from argparse import ArgumentParser
 from pathlib import Path
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 import re
 import sys
 from difflib import SequenceMatcher
+import pickle
 
 # Allow running the script directly from the ``scanner`` directory
 if __name__ == "__main__" and __package__ is None:
@@ -15,9 +17,19 @@ if __name__ == "__main__" and __package__ is None:
 
 # Use absolute imports so the script can be executed directly
 # or via ``python -m`` without package issues.
-from scanner.data_exporter import export_to_csv
-from scanner.image_analyzer import predict_type
-from scanner.classifier import CardClassifier
+from scanner.data_exporter import CsvAppender, export_to_csv, iter_csv_rows, read_column
+from scanner.image_analyzer import MODEL_PATH as TYPE_MODEL_PATH, predict_types
+from scanner.classifier import EXPORT_SUFFIX, CardClassifier
+from scanner.model_registry import get_classifier
+from scanner import embedding_index, enrichment, multihead_model
+from scanner.scan_cache import ScanCache, model_version
+from scanner.preprocessing import load_tensor
+from scanner.ocr_preprocessing import prepare_card_rois
+from scanner.catalog import get_catalog
+from scanner.enrichment import EnrichmentQueue
+from scanner.set_index import get_set_index
+from scanner.name_index import CARD, SET, get_name_index
+from scanner.tcgdex_client import get_client
 from PIL import Image
 import requests
 
@@ -154,6 +166,36 @@ def safe_crop(image: Image.Image, bbox: tuple[int, int, int, int]):
     return image.crop(bbox)
 
 
+def ocr_card_texts(images: list[Image.Image]) -> list[tuple[str, str]]:
+    """Return OCR ``(name_text, number_text)`` for every card image.
+
+    The name and number regions of all cards are preprocessed as stacked
+    arrays (see :mod:`scanner.ocr_preprocessing`) and recognised in one
+    batch by the shared :mod:`scanner.ocr_engine` worker pool.
+    """
+    from scanner import ocr_engine
+
+    names, numbers = prepare_card_rois(images)
+    items = []
+    for name, number in zip(names, numbers):
+        items.append((name, NAME_OCR_CONFIG))
+        items.append((number, NUMBER_OCR_CONFIG))
+    texts = ocr_engine.extract_texts(items)
+    return [(texts[i], texts[i + 1]) for i in range(0, len(texts), 2)]
+
+
+def ocr_cards(paths: list[Path]) -> list[dict]:
+    """Identify cards in ``paths`` from OCR of their name and number."""
+    images = []
+    for path in paths:
+        with Image.open(path) as img:
+            images.append(img.convert("RGB"))
+    return [
+        {**parse_card_text(name, number), "ImagePath": str(path)}
+        for path, (name, number) in zip(paths, ocr_card_texts(images))
+    ]
+
+
 API_BASE_URL = "https://api.tcgdex.net/v2"
 SET_LIST_URL = f"{API_BASE_URL}/en/sets"
 CARD_URL_TEMPLATE = f"{API_BASE_URL}/en/cards/{{set_id}}-{{card_number}}"
@@ -231,7 +273,11 @@ def parse_set(text: str) -> str | None:
     from scanner.set_mapping import SET_MAP
 
     # Normalize using mapping when available.
-    return SET_MAP.get(raw.upper(), raw)
+    if raw.upper() in SET_MAP:
+        return SET_MAP[raw.upper()]
+    index = get_name_index()
+    match = index.best(raw, kind=SET, min_score=NAME_MATCH_THRESHOLD) if index is not None else None
+    return match or raw
 
 
 def query_tcg_api(
@@ -250,7 +296,17 @@ def query_tcg_api(
         Card number detected via OCR.
     set_name : str or None, optional
         Additional set identifier.
+
+    The offline catalog is consulted first when it has been synced.
     """
+    catalog = get_catalog()
+    if catalog is not None:
+        matches = catalog.find_cards(
+            name if name and name != "Unknown" else None, number, set_name, lang=lang, limit=1
+        )
+        if matches:
+            return matches[0]
+
     params = {}
     if name and name != "Unknown":
         params["name"] = name
@@ -261,9 +317,7 @@ def query_tcg_api(
 
     try:
         url = f"{API_BASE_URL}/{lang}/cards"
-        resp = requests.get(url, params=params, timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
+        data = get_client().get_json(url, params=params)
 
         if not data or "cards" not in data or not data["cards"]:
             print(f"[API] No results for params: {params}")
@@ -281,12 +335,19 @@ def query_tcg_api(
 
 
 def query_card_by_id(card_id: str, lang: str = "en") -> dict | None:
-    """Query the TCGdex API for a card given its identifier."""
+    """Query the TCGdex API for a card given its identifier.
+
+    The offline catalog is consulted first when it has been synced.
+    """
+    catalog = get_catalog()
+    if catalog is not None:
+        card = catalog.get_card(card_id, lang)
+        if card is not None:
+            return card
+
     try:
         url = f"{API_BASE_URL}/{lang}/cards/{card_id}"
-        resp = requests.get(url, timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
+        data = get_client().get_json(url)
     except requests.HTTPError as e:
         print(f"[API ID ERROR] {e}")
         return None
@@ -303,39 +364,92 @@ def query_card_by_id(card_id: str, lang: str = "en") -> dict | None:
     }
 
 
+def query_cards_by_id(card_ids: Iterable[str], lang: str = "en") -> dict[str, dict | None]:
+    """Return :func:`query_card_by_id` results for every distinct ID.
+
+    Lookups run concurrently on the shared pooled client, and an ID already
+    being looked up by another thread is not requested a second time.
+    """
+    details = enrichment.resolve(
+        ((lang, card_id) for card_id in card_ids),
+        lambda key: query_card_by_id(key[1], lang),
+        flight=enrichment.card_flight,
+        run=get_client().map,
+    )
+    return {card_id: result for (_, card_id), result in details.items()}
+
+
 def is_similar(a: str, b: str, threshold: float = 0.7) -> bool:
     """Return ``True`` if two strings are similar enough."""
     return SequenceMatcher(None, a.lower(), b.lower()).ratio() >= threshold
 
 
+# Minimum trigram similarity for snapping an OCR name to a catalog name.
+NAME_MATCH_THRESHOLD = 0.6
+
+
+def match_card_name(name: str, lang: str = "en") -> str:
+    """Return the catalog card name closest to the OCR ``name``.
+
+    ``name`` is returned unchanged when the catalog has not been synced or
+    no card name is similar enough.
+    """
+    index = get_name_index(lang)
+    if index is None:
+        return name
+    match = index.best(name, kind=CARD, min_score=NAME_MATCH_THRESHOLD)
+    if match is None:
+        return name
+    if match != name:
+        print(f"[NAME] '{name}' → '{match}'")
+    return match
+
+
 def lookup_card_by_number_and_total(card_number: str, set_total: str, approx_name: str = "") -> dict | None:
     """Return card details by number and set size with optional fuzzy name."""
+    catalog = get_catalog()
+    if catalog is not None and set_total and str(set_total).isdigit():
+        matches = catalog.find_by_number_and_total(card_number, set_total)
+        if matches:
+            return _pick_match(matches, card_number, set_total, approx_name)
+
     try:
-        resp = requests.get(SET_LIST_URL, timeout=10)
-        resp.raise_for_status()
-        all_sets = resp.json()
+        candidates = get_set_index(SET_LIST_URL).set_ids(set_total)
     except Exception as exc:
         print(f"[TCGdex] Error loading sets: {exc}")
         return None
-
-    candidates = [s["id"] for s in all_sets if str(s.get("total")) == str(set_total)]
     print(f"[DEBUG] Candidate sets for total {set_total}: {candidates}")
 
-    matches: list[dict] = []
-    for set_id in candidates:
+    def fetch(set_id: str) -> dict | None:
         url = CARD_URL_TEMPLATE.format(set_id=set_id, card_number=card_number)
         try:
-            card_resp = requests.get(url, timeout=5)
-            if card_resp.status_code == 200:
-                card = card_resp.json()
-                api_name = card.get("name", "")
-                if approx_name and is_similar(approx_name, api_name):
-                    print(f"[MATCH] Found close name match: {api_name} in set {set_id}")
-                    return {"Name": api_name, "Number": card.get("number"), "Set": set_id}
-                matches.append({"Name": api_name, "Number": card.get("number"), "Set": set_id})
+            card = get_client().get_json(url)
+        except requests.HTTPError:
+            return None
         except Exception as exc:
             print(f"[WARN] Failed to get card {set_id}-{card_number}: {exc}")
-            continue
+            return None
+        return {"Name": card.get("name", ""), "Number": card.get("number"), "Set": set_id}
+
+    def strong(match: dict | None) -> bool:
+        return bool(match and approx_name and is_similar(approx_name, match["Name"]))
+
+    # Candidate sets are queried concurrently; the first close name match wins.
+    hit, results = get_client().find_first(fetch, candidates, strong)
+    if hit is not None:
+        print(f"[MATCH] Found close name match: {hit['Name']} in set {hit['Set']}")
+        return hit
+    matches = [m for m in results if m is not None]
+    return _pick_match(matches, card_number, set_total, approx_name)
+
+
+def _pick_match(matches: list[dict], card_number: str, set_total: str, approx_name: str) -> dict | None:
+    """Return the match whose name resembles ``approx_name`` or the only match."""
+    if approx_name:
+        for m in matches:
+            if is_similar(approx_name, m.get("Name") or ""):
+                print(f"[MATCH] Found close name match: {m['Name']} in set {m['Set']}")
+                return m
 
     if len(matches) == 1:
         m = matches[0]
@@ -371,7 +485,7 @@ def parse_card_text(
     print(f"[DEBUG] OCR raw name: '{raw_name}' → Cleaned: '{cleaned}'")
     if len(cleaned) < 3:
         cleaned = "Unknown"
-    name = cleaned
+    name = match_card_name(cleaned, lang) if cleaned != "Unknown" else cleaned
 
     number = ""
     promo_match = None
@@ -418,34 +532,83 @@ def parse_card_text(
 
 
 CARD_MODEL_PATH = Path(__file__).resolve().parent / "card_model.pt"
-_card_clf: CardClassifier | None = None
+# Inference backend for the card classifier, see ``classifier.BACKENDS``.
+CARD_MODEL_BACKEND = "eager"
+# How card IDs are predicted: ``classifier`` uses the softmax over the
+# trained classes, ``index`` looks up the nearest reference embedding in
+# ``CARD_INDEX_PATH`` (see :mod:`scanner.embedding_index`).
+CARD_ID_MODE = "classifier"
+CARD_INDEX_PATH = embedding_index.INDEX_PATH
+
+# Raised when the type model is missing or not an ``image_analyzer``
+# checkpoint; such scans fall back to the ``common`` type.
+TYPE_MODEL_ERRORS = (OSError, KeyError, RuntimeError, pickle.UnpicklingError)
+
+# Number of images sent through the models in a single forward pass.
+DEFAULT_BATCH_SIZE = 32
+
+
+def _load_card_classifier(
+    model_path: str | Path = CARD_MODEL_PATH,
+    backend: str | None = None,
+) -> CardClassifier:
+    """Return the shared card classifier from the model registry."""
+    if not torch:
+        raise ImportError("PyTorch is required for prediction")
+    backend = backend or CARD_MODEL_BACKEND
+    if backend == "static_int8" and Path(model_path).suffix != EXPORT_SUFFIX:
+        # Quantized models are calibrated once by ``scanner.export_model``,
+        # which writes them next to the checkpoint under this name.
+        model_path = Path(model_path).with_suffix(f".static_int8{EXPORT_SUFFIX}")
+    if not Path(model_path).exists():
+        raise RuntimeError(f"Card classifier model not found: {model_path}")
+    return get_classifier(model_path, backend=backend)
+
+
+def _image_tensor(image_path: str | Path) -> "torch.Tensor":
+    """Return the 64x64 model input tensor for ``image_path``."""
+    return load_tensor(image_path)
+
+
+def predict_card_ids(tensors: list, model_path: str | Path = CARD_MODEL_PATH) -> list[str]:
+    """Return predicted card identifiers for a batch of image ``tensors``."""
+    if not tensors:
+        return []
+    if CARD_ID_MODE == "index":
+        clf = _load_card_classifier(model_path, backend="eager")
+        return embedding_index.identify(tensors, clf, embedding_index.get_index(CARD_INDEX_PATH))
+    return _load_card_classifier(model_path).predict(tensors)
 
 
 def predict_card_id(image_path: str, model_path: str | Path = CARD_MODEL_PATH) -> str:
     """Return predicted card identifier for ``image_path``."""
-    if not torch:
-        raise ImportError("PyTorch is required for prediction")
-    global _card_clf
-    if _card_clf is None:
-        if not Path(model_path).exists():
-            raise RuntimeError("Card classifier model not found")
-        _card_clf = CardClassifier.load(model_path, device="cpu")
-    transform = transforms.Compose([transforms.Resize((64, 64)), transforms.ToTensor()])
-    img = Image.open(image_path).convert("RGB")
-    tensor = transform(img)
-    return _card_clf.predict([tensor])[0]
-
-
-def scan_image(path: Path) -> dict:
-    """Scan a single image and return predicted data."""
-    card_id = predict_card_id(str(path))
-    try:
-        card_type = predict_type(str(path))
-    except Exception:  # pragma: no cover - prediction may fail in tests
-        card_type = "common"
+    return predict_card_ids([_image_tensor(image_path)], model_path)[0]
+
+
+def predict_card_ids_and_types(
+    tensors: list,
+    model_path: str | Path = multihead_model.MODEL_PATH,
+) -> list[tuple[str, str]]:
+    """Return ``(card_id, card_type)`` pairs from one multi-head forward pass."""
+    if not tensors:
+        return []
+    return multihead_model.load(model_path).predict_with_type(tensors)
+
+
+def predict_card_id_and_type(
+    image_path: str,
+    model_path: str | Path = multihead_model.MODEL_PATH,
+) -> tuple[str, str]:
+    """Return predicted card identifier and type for ``image_path``."""
+    return predict_card_ids_and_types([_image_tensor(image_path)], model_path)[0]
 
-    api_data = query_card_by_id(card_id)
 
+# Columns of every scan row, in the order of ``_build_result``.
+SCAN_FIELDS = ("CardID", "Name", "Number", "Set", "Type", "ImagePath")
+
+
+def _build_result(path: Path, card_id: str, card_type: str, api_data: dict | None) -> dict:
+    """Return the scan row for ``path`` enriched with ``api_data``."""
     result = {
         "CardID": card_id,
         "Name": "Unknown",
@@ -454,28 +617,157 @@ def scan_image(path: Path) -> dict:
         "Type": card_type,
         "ImagePath": str(path),
     }
-    if api_data:
-        result.update({k: v for k, v in api_data.items() if v})
-    else:
-        if "-" in card_id:
-            set_id, number = card_id.split("-", 1)
-            result["Set"] = set_id
-            result["Number"] = number
+    return enrichment.fill_row(result, api_data)
+
+
+def scan_model_version(multihead: bool = False) -> str:
+    """Return the version of the models and settings used to scan.
+
+    Cached scan rows are only reused while this value is unchanged.
+    """
+    if multihead:
+        return model_version(Path(multihead_model.MODEL_PATH), "multihead")
+    return model_version(
+        Path(CARD_MODEL_PATH),
+        Path(TYPE_MODEL_PATH),
+        CARD_MODEL_BACKEND,
+        CARD_ID_MODE,
+        Path(CARD_INDEX_PATH) if CARD_ID_MODE == "index" else "",
+    )
+
+
+def scan_image(path: Path, multihead: bool = False, cache: ScanCache | None = None) -> dict:
+    """Scan a single image and return predicted data.
+
+    With ``multihead`` the card ID and type come from the shared-backbone
+    model in a single forward pass instead of two separate models. When a
+    ``cache`` is given, unchanged images return their stored row.
+    """
+    key = None
+    if cache is not None:
+        key = cache.key(path, scan_model_version(multihead))
+        cached = cache.get(key)
+        if cached is not None:
+            cached["ImagePath"] = str(path)
+            return cached
+
+    # A batch of one decodes the image once for both models.
+    result = scan_batch([path], multihead=multihead)[0]
+
+    if key is not None:
+        _cache_row(cache, key, result)
     return result
 
 
-def scan_directory(dir_path: Path) -> list:
+def scan_batch(paths: list[Path], multihead: bool = False, enrich: bool = True) -> list[dict]:
+    """Scan ``paths`` running each model once on the stacked batch.
+
+    Every image is decoded and resized a single time; the resulting tensors
+    are shared by the card ID and type models. Card details for the whole
+    batch are fetched concurrently unless ``enrich`` is false, in which case
+    set and number are only derived from the card ID. Results keep input
+    order.
+    """
+    if not paths:
+        return []
+    tensors = [_image_tensor(p) for p in paths]
+    if multihead:
+        pairs = predict_card_ids_and_types(tensors)
+        card_ids = [card_id for card_id, _ in pairs]
+        card_types = [card_type for _, card_type in pairs]
+    else:
+        card_ids = predict_card_ids(tensors)
+        try:
+            card_types = predict_types(tensors)
+        except TYPE_MODEL_ERRORS as exc:
+            print(f"[WARN] Type model unavailable ({exc}); using 'common'")
+            card_types = ["common"] * len(paths)
+    cards = query_cards_by_id(card_ids) if enrich else {}
+    return [
+        _build_result(path, card_id, card_type, cards.get(card_id))
+        for path, card_id, card_type in zip(paths, card_ids, card_types)
+    ]
+
+
+def scan_directory(
+    dir_path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    multihead: bool = False,
+    workers: int = 1,
+    cache: ScanCache | None = None,
+) -> list:
     """Scan all images in the given directory."""
-    results = []
+    return scan_files(
+        directory_images(dir_path),
+        batch_size=batch_size,
+        multihead=multihead,
+        workers=workers,
+        cache=cache,
+    )
+
+
+def directory_images(dir_path: Path) -> list[Path]:
+    """Return JPEG then PNG images in ``dir_path``, each sorted by name."""
+    paths = []
     for ext in ("*.jpg", "*.png"):
-        for img_path in sorted(Path(dir_path).glob(ext)):
-            results.append(scan_image(img_path))
-    return results
+        paths.extend(sorted(Path(dir_path).glob(ext)))
+    return paths
+
+
+def iter_scan_files(
+    files: Iterable[Path],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    multihead: bool = False,
+    cache: ScanCache | None = None,
+) -> Iterator[dict]:
+    """Yield scan rows for ``files`` in input order as each batch finishes.
+
+    ``files`` may be any iterable, so at most one batch of paths and rows is
+    held in memory at a time.
+    """
+    batch: list[Path] = []
+    for path in files:
+        batch.append(path)
+        if len(batch) >= batch_size:
+            yield from scan_files(batch, batch_size=batch_size, multihead=multihead, cache=cache)
+            batch = []
+    if batch:
+        yield from scan_files(batch, batch_size=batch_size, multihead=multihead, cache=cache)
+
+
+def iter_scan_directory(
+    dir_path: Path,
+    skip: set[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    multihead: bool = False,
+    cache: ScanCache | None = None,
+) -> Iterator[dict]:
+    """Yield scan rows for images in ``dir_path`` not listed in ``skip``."""
+    skip = skip or set()
+    paths = (p for p in directory_images(dir_path) if str(p) not in skip)
+    yield from iter_scan_files(paths, batch_size=batch_size, multihead=multihead, cache=cache)
+
+
+def iter_ocr_files(files: Iterable[Path], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[dict]:
+    """Yield OCR rows for ``files`` in input order, one batch of crops at a time."""
+    batch: list[Path] = []
+    for path in files:
+        batch.append(path)
+        if len(batch) >= batch_size:
+            yield from ocr_cards(batch)
+            batch = []
+    if batch:
+        yield from ocr_cards(batch)
 
 
 def scan_files(
     files: list[Path],
     progress_callback: Callable[[int, int], None] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    multihead: bool = False,
+    workers: int = 1,
+    cache: ScanCache | None = None,
+    enrichment_queue: EnrichmentQueue | None = None,
 ) -> list:
     """Scan a list of image paths.
 
@@ -485,17 +777,112 @@ def scan_files(
         Images to process.
     progress_callback : callable, optional
         Function called with the current index and total after each file.
+    batch_size : int, optional
+        Number of images passed through the models in one forward pass.
+    multihead : bool, optional
+        Use the shared-backbone model for card ID and type.
+    workers : int, optional
+        Number of worker processes; values above one scan batches in a
+        process pool (see :mod:`scanner.parallel_scanner`).
+    cache : ScanCache, optional
+        Persistent result cache; only images missing from it are scanned.
+    enrichment_queue : EnrichmentQueue, optional
+        Defer card detail lookups to this background queue. Rows are
+        returned as soon as the models ran and are filled in later.
     """
+    if cache is not None:
+        return _scan_files_cached(
+            files, cache, progress_callback, batch_size, multihead, workers, enrichment_queue
+        )
+
+    if workers > 1:
+        from scanner.parallel_scanner import scan_files_parallel
+
+        return scan_files_parallel(
+            files,
+            workers,
+            progress_callback,
+            batch_size=batch_size,
+            multihead=multihead,
+            enrichment_queue=enrichment_queue,
+        )
+
     results = []
+    files = list(files)
     total = len(files)
-    for idx, img_path in enumerate(files, 1):
-        results.append(scan_image(img_path))
+    batch_size = max(1, batch_size)
+    for start in range(0, total, batch_size):
+        batch = files[start:start + batch_size]
+        if enrichment_queue is None:
+            rows = scan_batch(batch, multihead=multihead)
+        else:
+            rows = scan_batch(batch, multihead=multihead, enrich=False)
+            enrichment_queue.submit(rows)
+        results.extend(rows)
         if progress_callback:
-            progress_callback(idx, total)
+            for idx in range(start + 1, start + len(batch) + 1):
+                progress_callback(idx, total)
     return results
 
 
-def aggregate_cards(data: list[dict]) -> list[dict]:
+def _cache_row(cache: ScanCache, key: str, row: dict) -> None:
+    """Store ``row`` under ``key`` once its card details were found.
+
+    Rows whose lookup is pending, unresolved or failed are left out so the
+    next scan looks them up again; the enrichment status is never stored.
+    """
+    if row.get(enrichment.STATUS_FIELD, enrichment.DONE) != enrichment.DONE or row.get("Name") == "Unknown":
+        return
+    cache.put(key, enrichment.without_status(row))
+
+
+def _scan_files_cached(
+    files: list[Path],
+    cache: ScanCache,
+    progress_callback: Callable[[int, int], None] | None,
+    batch_size: int,
+    multihead: bool,
+    workers: int,
+    enrichment_queue: EnrichmentQueue | None = None,
+) -> list:
+    """Return rows for ``files`` from ``cache``, scanning only the misses.
+
+    With an ``enrichment_queue`` new rows are cached once they are resolved.
+    """
+    files = list(files)
+    total = len(files)
+    version = scan_model_version(multihead)
+    keys = [cache.key(path, version) for path in files]
+    rows = [cache.get(key) for key in keys]
+    pending = [i for i, row in enumerate(rows) if row is None]
+    hits = total - len(pending)
+
+    callback = None
+    if progress_callback:
+        for idx in range(1, hits + 1):
+            progress_callback(idx, total)
+        callback = lambda idx, _total: progress_callback(hits + idx, total)
+
+    scanned = scan_files(
+        [files[i] for i in pending],
+        callback,
+        batch_size=batch_size,
+        multihead=multihead,
+        workers=workers,
+        enrichment_queue=enrichment_queue,
+    )
+    for i, row in zip(pending, scanned):
+        if enrichment_queue is None:
+            _cache_row(cache, keys[i], row)
+        else:
+            enrichment_queue.when_done(row, lambda done, key=keys[i]: _cache_row(cache, key, done))
+        rows[i] = row
+    for path, row in zip(files, rows):
+        row["ImagePath"] = str(path)
+    return rows
+
+
+def aggregate_cards(data: Iterable[dict]) -> list[dict]:
     """Aggregate duplicate cards by name and number."""
     aggregated: dict[tuple[str, str], dict] = defaultdict(
         lambda: {"Name": "", "Number": "", "Ilość": 0}
@@ -509,10 +896,38 @@ def aggregate_cards(data: list[dict]) -> list[dict]:
 
 
 def main():
+    parser = ArgumentParser(description="Scan card images from assets/scans into CSV")
+    parser.add_argument(
+        "--ocr",
+        action="store_true",
+        help="Identify cards from OCR of their name and number instead of the classifier",
+    )
+    args = parser.parse_args()
+
     scans_dir = Path("assets/scans")
+    rows_path = Path("data/cards_scanned_rows.csv")
     output_path = Path("data/cards_scanned.csv")
-    scanned_data = scan_directory(scans_dir)
-    grouped_data = aggregate_cards(scanned_data)
+
+    # Rows already written to ``rows_path`` act as the resume checkpoint.
+    done = read_column(str(rows_path), "ImagePath")
+    if done:
+        print(f"[RESUME] Pomijam {len(done)} zeskanowanych plików")
+    if args.ocr:
+        from scanner import ocr_engine
+
+        paths = (p for p in directory_images(scans_dir) if str(p) not in done)
+        rows = iter_ocr_files(paths)
+    else:
+        rows = iter_scan_directory(scans_dir, skip=done, cache=ScanCache())
+    try:
+        with CsvAppender(str(rows_path)) as out:
+            for row in rows:
+                out.write(row)
+    finally:
+        if args.ocr:
+            ocr_engine.shutdown()
+
+    grouped_data = aggregate_cards(iter_csv_rows(str(rows_path)))
     export_to_csv(grouped_data, str(output_path))
     print(f"Zapisano {len(grouped_data)} rekordów do pliku {output_path}")
 
@@ -0,0 +1,279 @@
+"""Offline mirror of the TCGdex card catalog.
+
+Card lookups in :mod:`scanner.card_scanner` consult this SQLite store before
+calling the API, so scanning keeps working offline and is not bound by
+network latency. Populate or refresh it with::
+
+    python -m scanner.catalog sync --lang en
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from pathlib import Path
+import sqlite3
+import sys
+import threading
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scanner.tcgdex_client import get_client
+
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "tcgdex_catalog.sqlite"
+API_BASE_URL = "https://api.tcgdex.net/v2"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sets (
+    lang TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT,
+    total INTEGER,
+    official INTEGER,
+    PRIMARY KEY (lang, id)
+);
+CREATE TABLE IF NOT EXISTS cards (
+    lang TEXT NOT NULL,
+    id TEXT NOT NULL,
+    set_id TEXT NOT NULL,
+    number TEXT,
+    number_key TEXT,
+    name TEXT,
+    set_total INTEGER,
+    set_official INTEGER,
+    PRIMARY KEY (lang, id)
+);
+CREATE INDEX IF NOT EXISTS cards_set_number ON cards (lang, set_id, number_key);
+CREATE INDEX IF NOT EXISTS cards_name ON cards (lang, name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS cards_official_number ON cards (lang, set_official, number_key);
+CREATE INDEX IF NOT EXISTS cards_total_number ON cards (lang, set_total, number_key);
+"""
+
+
+def number_key(number: str | None) -> str:
+    """Return ``number`` normalised for matching (``"058"`` -> ``"58"``)."""
+    number = str(number or "").strip()
+    if "/" in number:
+        number = number.split("/", 1)[0]
+    return number.lstrip("0") or ("0" if number else "")
+
+
+def _set_counts(data: dict) -> tuple[int | None, int | None]:
+    """Return ``(total, official)`` card counts of a set payload."""
+    counts = data.get("cardCount") if isinstance(data.get("cardCount"), dict) else {}
+    total = counts.get("total", data.get("total"))
+    official = counts.get("official", total)
+    return total, official
+
+
+def _row(row: tuple) -> dict:
+    name, number, set_id = row
+    return {"Name": name, "Number": number, "Set": set_id}
+
+
+class CardCatalog:
+    """Local card catalog stored in SQLite."""
+
+    def __init__(self, path: str | Path = CATALOG_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ------------------------------------------------------------------
+    def get_card(self, card_id: str, lang: str = "en") -> dict | None:
+        """Return the card with identifier ``card_id`` or ``None``."""
+        rows = self._query(
+            "SELECT name, number, set_id FROM cards WHERE lang = ? AND id = ?", (lang, card_id)
+        )
+        return _row(rows[0]) if rows else None
+
+    def find_cards(
+        self,
+        name: str | None = None,
+        number: str | None = None,
+        set_id: str | None = None,
+        lang: str = "en",
+        limit: int = 20,
+    ) -> list[dict]:
+        """Return cards matching all given criteria.
+
+        ``name`` matches case-insensitively as a substring, like the API's
+        name filter. A ``number`` of the form ``X/Y`` also restricts the
+        printed set size to ``Y``.
+        """
+        clauses = ["lang = ?"]
+        params: list = [lang]
+        if name:
+            clauses.append("name LIKE ? COLLATE NOCASE")
+            params.append(f"%{name}%")
+        if number:
+            clauses.append("number_key = ?")
+            params.append(number_key(number))
+            if "/" in number:
+                total = number.split("/", 1)[1].strip()
+                if total.isdigit():
+                    clauses.append("(set_official = ? OR set_total = ?)")
+                    params.extend([int(total), int(total)])
+        if set_id:
+            clauses.append("set_id = ?")
+            params.append(set_id)
+        if len(clauses) == 1:
+            return []
+        sql = (
+            f"SELECT name, number, set_id FROM cards WHERE {' AND '.join(clauses)} "
+            "ORDER BY set_id, id LIMIT ?"
+        )
+        return [_row(r) for r in self._query(sql, (*params, limit))]
+
+    def find_by_number_and_total(self, number: str, total: str | int, lang: str = "en") -> list[dict]:
+        """Return cards numbered ``number`` in sets with ``total`` cards."""
+        total = int(total)
+        rows = self._query(
+            "SELECT name, number, set_id FROM cards WHERE lang = ? AND number_key = ? "
+            "AND (set_official = ? OR set_total = ?) ORDER BY set_id",
+            (lang, number_key(number), total, total),
+        )
+        return [_row(r) for r in rows]
+
+    def set_ids_by_total(self, total: str | int, lang: str = "en") -> list[str]:
+        """Return identifiers of sets with ``total`` cards."""
+        total = int(total)
+        rows = self._query(
+            "SELECT id FROM sets WHERE lang = ? AND (official = ? OR total = ?) ORDER BY id",
+            (lang, total, total),
+        )
+        return [r[0] for r in rows]
+
+    def card_names(self, lang: str = "en") -> list[str]:
+        """Return the distinct card names of ``lang``."""
+        rows = self._query(
+            "SELECT DISTINCT name FROM cards WHERE lang = ? AND name IS NOT NULL ORDER BY name", (lang,)
+        )
+        return [r[0] for r in rows]
+
+    def card_count(self, lang: str | None = None) -> int:
+        if lang is None:
+            return self._query("SELECT COUNT(*) FROM cards", ())[0][0]
+        return self._query("SELECT COUNT(*) FROM cards WHERE lang = ?", (lang,))[0][0]
+
+    # ------------------------------------------------------------------
+    def store_set(self, data: dict, lang: str = "en") -> int:
+        """Insert or replace the set ``data`` and its cards.
+
+        ``data`` is a TCGdex set payload with a ``cards`` list. Returns the
+        number of stored cards.
+        """
+        set_id = data["id"]
+        total, official = _set_counts(data)
+        cards = [
+            (
+                lang,
+                card["id"],
+                set_id,
+                str(card.get("localId", card.get("number", ""))),
+                number_key(card.get("localId", card.get("number", ""))),
+                card.get("name"),
+                total,
+                official,
+            )
+            for card in data.get("cards") or []
+            if card.get("id")
+        ]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sets (lang, id, name, total, official) VALUES (?, ?, ?, ?, ?)",
+                (lang, set_id, data.get("name"), total, official),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cards "
+                "(lang, id, set_id, number, number_key, name, set_total, set_official) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                cards,
+            )
+            self._conn.commit()
+        return len(cards)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def sync_catalog(
+    catalog: CardCatalog,
+    lang: str = "en",
+    base_url: str = API_BASE_URL,
+    timeout: float = 30,
+) -> int:
+    """Download every set of ``lang`` with its cards into ``catalog``.
+
+    Sets are fetched concurrently through the shared TCGdex client. Returns
+    the number of stored cards.
+    """
+    client = get_client()
+    briefs = [s for s in client.get_json(f"{base_url}/{lang}/sets", timeout=timeout, cached=False) if s.get("id")]
+
+    def fetch(brief: dict) -> dict | None:
+        try:
+            url = f"{base_url}/{lang}/sets/{brief['id']}"
+            return client.get_json(url, timeout=timeout, cached=False)
+        except Exception as exc:
+            print(f"[CATALOG] Failed to fetch set {brief['id']}: {exc}")
+            return None
+
+    stored = 0
+    for brief, data in zip(briefs, client.map(fetch, briefs)):
+        if data is None:
+            continue
+        count = catalog.store_set({**brief, **data}, lang)
+        stored += count
+        print(f"[CATALOG] {brief['id']}: {count} kart")
+
+    # Name indexes loaded before the sync no longer match the catalog.
+    from scanner.name_index import clear_name_indexes
+
+    clear_name_indexes()
+    return stored
+
+
+_catalog: CardCatalog | None = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog(path: str | Path | None = None) -> CardCatalog | None:
+    """Return the shared catalog, or ``None`` if it has not been synced."""
+    global _catalog
+    path = Path(path or CATALOG_PATH)
+    with _catalog_lock:
+        if _catalog is not None and _catalog.path == path:
+            return _catalog
+        if not path.exists():
+            return None
+        _catalog = CardCatalog(path)
+        return _catalog
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Manage the offline TCGdex catalog")
+    parser.add_argument("command", choices=["sync", "stats"])
+    parser.add_argument("--lang", action="append", help="Language to sync (repeatable)")
+    parser.add_argument("--path", default=str(CATALOG_PATH))
+    parser.add_argument("--base-url", default=API_BASE_URL)
+    args = parser.parse_args()
+
+    catalog = CardCatalog(args.path)
+    if args.command == "sync":
+        for lang in args.lang or ["en"]:
+            stored = sync_catalog(catalog, lang, args.base_url)
+            print(f"[OK] Zsynchronizowano {stored} kart ({lang}) do {args.path}")
+    else:
+        print(f"Kart w katalogu: {catalog.card_count()}")
+
+
+if __name__ == "__main__":
+    main()
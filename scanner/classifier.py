@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import copy
+import json
+import os
 from pathlib import Path
 from typing import Iterable, List
 
@@ -23,6 +26,52 @@ except Exception:  # pragma: no cover - torch may be missing when tests run
     models = None
 
 
+# Inference backends supported by :meth:`CardClassifier.compile`.
+BACKENDS = ("eager", "torchscript", "dynamic_int8", "static_int8")
+
+# File suffix of TorchScript archives written by :meth:`CardClassifier.export`.
+EXPORT_SUFFIX = ".ts"
+
+# Spatial size of the model input images.
+INPUT_SIZE = (64, 64)
+
+
+def make_loader(
+    dataset: "torch.utils.data.Dataset",
+    batch_size: int = 32,
+    shuffle: bool = True,
+    num_workers: int | None = None,
+    device: str = "cpu",
+) -> "torch.utils.data.DataLoader":
+    """Return a loader streaming ``dataset`` for training.
+
+    Images are decoded by ``num_workers`` worker processes (up to four by
+    default) that stay alive between epochs and prefetch two batches each.
+    Batches are collated into pinned memory when training on CUDA.
+    """
+    if not torch:
+        raise ImportError("PyTorch is required for training")
+    workers = min(4, os.cpu_count() or 1) if num_workers is None else num_workers
+    extra = {"persistent_workers": True, "prefetch_factor": 2} if workers > 0 else {}
+    return torch.utils.data.DataLoader(
+        dataset,
+        batch_size=batch_size,
+        shuffle=shuffle,
+        num_workers=workers,
+        pin_memory=str(device).startswith("cuda"),
+        **extra,
+    )
+
+
+def _grow_linear(layer: "nn.Linear", extra: int) -> "nn.Linear":
+    """Return a copy of ``layer`` with ``extra`` freshly initialised output rows."""
+    grown = nn.Linear(layer.in_features, layer.out_features + extra).to(layer.weight.device)
+    with torch.no_grad():
+        grown.weight[: layer.out_features] = layer.weight
+        grown.bias[: layer.out_features] = layer.bias
+    return grown
+
+
 class CardClassifier(BaseEstimator):
     """Image classifier for predicting card IDs."""
 
@@ -31,6 +80,7 @@ class CardClassifier(BaseEstimator):
         self.num_classes = num_classes
         self.device = device or ("cuda" if torch and torch.cuda.is_available() else "cpu")
         self.classes_: List[str] = []
+        self.backend = "eager"
         self.model: nn.Module | None = None
         if torch:
             self._build_model()
@@ -55,35 +105,143 @@ class CardClassifier(BaseEstimator):
         self.model.to(self.device)
 
     # ------------------------------------------------------------------
-    def fit(self, X: Iterable[torch.Tensor], y: Iterable[str], epochs: int = 1, lr: float = 1e-3, batch_size: int = 32):
-        """Train the classifier on tensors ``X`` with labels ``y``."""
+    def fit(
+        self,
+        X: Iterable[torch.Tensor] | "torch.utils.data.Dataset" | "torch.utils.data.DataLoader",
+        y: Iterable[str] | None = None,
+        epochs: int = 1,
+        lr: float = 1e-3,
+        batch_size: int = 32,
+        num_workers: int | None = None,
+    ):
+        """Train the classifier.
+
+        Parameters
+        ----------
+        X : iterable of torch.Tensor, Dataset or DataLoader
+            Image tensors labelled by ``y``, or a dataset (or loader)
+            yielding ``(image, target)`` with integer targets. Datasets are
+            streamed batch by batch through :func:`make_loader`, so memory
+            use does not grow with the dataset size.
+        y : iterable of str, optional
+            Card IDs of the tensors in ``X``. For datasets, the class names
+            in target order; ``dataset.classes`` (as set by ``ImageFolder``)
+            is used when omitted.
+        num_workers : int, optional
+            Loader worker processes for datasets, see :func:`make_loader`.
+        """
         if not torch:
             raise ImportError("PyTorch is required for training")
 
-        self.classes_ = sorted({str(label) for label in y})
-        cls_to_idx = {c: i for i, c in enumerate(self.classes_)}
-        targets = [cls_to_idx[str(label)] for label in y]
-
+        loader, self.classes_ = self._loader(X, y, batch_size, num_workers)
         if self.model is None or (self.num_classes != len(self.classes_)):
             self.num_classes = len(self.classes_)
             self._build_model()
+        self._train(loader, epochs, lr)
+        return self
+
+    def partial_fit(
+        self,
+        X: Iterable[torch.Tensor] | "torch.utils.data.Dataset" | "torch.utils.data.DataLoader",
+        y: Iterable[str] | None = None,
+        epochs: int = 1,
+        lr: float = 1e-4,
+        batch_size: int = 32,
+        num_workers: int | None = None,
+        freeze_backbone: bool = False,
+    ):
+        """Fine-tune the fitted model, adding classes it has not seen yet.
+
+        Existing classes keep their output rows and indices; rows for new
+        card IDs are appended to the output layer (see
+        :meth:`extend_classes`). ``X`` and ``y`` are given as for
+        :meth:`fit` and should mix samples of the new classes with replayed
+        samples of known ones, so those are not forgotten. With
+        ``freeze_backbone`` only the output layer is trained, on features
+        computed without gradients.
+        """
+        if not torch:
+            raise ImportError("PyTorch is required for training")
+        if not self.classes_:
+            return self.fit(X, y, epochs, lr, batch_size, num_workers)
+        if self.backend != "eager":
+            raise RuntimeError("Compiled models cannot be trained")
+
+        loader, classes = self._loader(X, y, batch_size, num_workers)
+        self.extend_classes(classes)
+        remap = torch.tensor([self.classes_.index(c) for c in classes], device=self.device)
+        self._train(loader, epochs, lr, remap=remap, freeze_backbone=freeze_backbone)
+        return self
+
+    def extend_classes(self, classes: Iterable[str]) -> List[str]:
+        """Append unseen ``classes`` to the output layer and return them.
+
+        Weights of the existing classes are copied unchanged; the new rows
+        start from the default initialisation.
+        """
+        added = [c for c in dict.fromkeys(str(c) for c in classes) if c not in self.classes_]
+        if not added:
+            return []
+        self._set_head(_grow_linear(self._head(), len(added)))
+        self.classes_ = [*self.classes_, *added]
+        self.num_classes = len(self.classes_)
+        return added
+
+    # ------------------------------------------------------------------
+    def _loader(self, X, y, batch_size: int, num_workers: int | None):
+        """Return a training loader for ``X`` and the class names of its targets."""
+        data = torch.utils.data
+        if isinstance(X, (data.Dataset, data.DataLoader)):
+            if isinstance(X, data.DataLoader):
+                loader = X
+            else:
+                loader = make_loader(X, batch_size, num_workers=num_workers, device=self.device)
+            classes = y if y is not None else getattr(loader.dataset, "classes", None)
+            if classes is None:
+                raise ValueError("Class names are required for a dataset without a classes attribute")
+            return loader, [str(c) for c in classes]
+
+        y = [str(label) for label in y]
+        classes = sorted(set(y))
+        cls_to_idx = {c: i for i, c in enumerate(classes)}
+        dataset = data.TensorDataset(torch.stack(list(X)), torch.tensor([cls_to_idx[label] for label in y]))
+        return data.DataLoader(dataset, batch_size=batch_size, shuffle=True), classes
 
-        dataset = torch.utils.data.TensorDataset(torch.stack(list(X)), torch.tensor(targets))
-        loader = torch.utils.data.DataLoader(dataset, batch_size=batch_size, shuffle=True)
+    def _train(
+        self,
+        loader,
+        epochs: int,
+        lr: float,
+        remap: torch.Tensor | None = None,
+        freeze_backbone: bool = False,
+    ) -> None:
+        """Run ``epochs`` of training; ``remap`` maps loader targets to class indices."""
         criterion = nn.CrossEntropyLoss()
-        optimizer = torch.optim.Adam(self.model.parameters(), lr=lr)
+        if freeze_backbone:
+            backbone = self._backbone().eval()
+            head = self._head().train()
+            params = head.parameters()
+        else:
+            self.model.train()
+            params = self.model.parameters()
+        optimizer = torch.optim.Adam(params, lr=lr)
 
-        self.model.train()
         for _ in range(max(1, epochs)):
             for images, labels in loader:
-                images = images.to(self.device)
-                labels = labels.to(self.device)
+                images = images.to(self.device, non_blocking=True)
+                labels = labels.to(self.device, non_blocking=True)
+                if remap is not None:
+                    labels = remap[labels]
                 optimizer.zero_grad()
-                output = self.model(images)
+                if freeze_backbone:
+                    with torch.no_grad():
+                        features = backbone(images)
+                    output = head(features)
+                else:
+                    output = self.model(images)
                 loss = criterion(output, labels)
                 loss.backward()
                 optimizer.step()
-        return self
 
     # ------------------------------------------------------------------
     def predict(self, X: Iterable[torch.Tensor]) -> List[str]:
@@ -99,33 +257,415 @@ class CardClassifier(BaseEstimator):
             idxs = output.argmax(dim=1).cpu().tolist()
         return [self.classes_[i] for i in idxs]
 
+    # ------------------------------------------------------------------
+    def _backbone(self) -> nn.Module:
+        """Return the network up to (not including) the final linear layer."""
+        if self.backend != "eager":
+            raise RuntimeError("Embeddings require the eager backend")
+        name = self.model_name.lower()
+        if name in ("mobilenet", "efficientnet"):
+            return nn.Sequential(
+                self.model.features,
+                nn.AdaptiveAvgPool2d(1),
+                nn.Flatten(),
+                *list(self.model.classifier)[:-1],
+            )
+        return nn.Sequential(*list(self.model.children())[:-1], nn.Flatten())
+
+    def _head(self) -> nn.Linear:
+        """Return the final linear layer producing the class scores."""
+        if self.model_name.lower() in ("mobilenet", "efficientnet"):
+            return self.model.classifier[1]
+        return self.model.fc
+
+    def _set_head(self, layer: nn.Linear) -> None:
+        if self.model_name.lower() in ("mobilenet", "efficientnet"):
+            self.model.classifier[1] = layer
+        else:
+            self.model.fc = layer
+
+    def embed(self, X: Iterable[torch.Tensor], batch_size: int = 64) -> torch.Tensor:
+        """Return backbone feature vectors for tensors ``X``, one row per image."""
+        if not torch:
+            raise ImportError("PyTorch is required for prediction")
+        backbone = self._backbone().eval()
+        X = list(X)
+        chunks = []
+        with torch.no_grad():
+            for start in range(0, len(X), batch_size):
+                images = torch.stack(X[start:start + batch_size]).to(self.device)
+                chunks.append(backbone(images).cpu())
+        return torch.cat(chunks) if chunks else torch.empty(0)
+
+    # ------------------------------------------------------------------
+    def compile(self, backend: str = "eager", calibration: Iterable[torch.Tensor] | None = None) -> "CardClassifier":
+        """Convert the fp32 model for ``backend`` inference.
+
+        Parameters
+        ----------
+        backend : str
+            One of ``eager``, ``torchscript`` (traced and frozen graph),
+            ``dynamic_int8`` (int8 linear layers) or ``static_int8`` (fully
+            quantized graph, CPU only).
+        calibration : iterable of torch.Tensor, optional
+            Representative input images used to calibrate ``static_int8``
+            activation ranges; required for that backend.
+        """
+        if not torch:
+            raise ImportError("PyTorch is required to compile the model")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        if backend == self.backend:
+            return self
+        if self.backend != "eager":
+            raise RuntimeError(f"Model is already compiled for {self.backend}")
+        samples = list(calibration) if calibration is not None else []
+        if backend == "static_int8" and not samples:
+            raise ValueError("static_int8 needs calibration images")
+
+        model = self.model.eval()
+        example = torch.rand(1, 3, *INPUT_SIZE, device=self.device)
+        if backend == "torchscript":
+            with torch.no_grad():
+                self.model = torch.jit.freeze(torch.jit.trace(model, example))
+        else:
+            if self.device != "cpu":
+                raise RuntimeError("int8 backends require CPU inference")
+            if backend == "dynamic_int8":
+                self.model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+            else:
+                from torch.ao.quantization import get_default_qconfig_mapping
+                from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+                prepared = prepare_fx(
+                    copy.deepcopy(model), get_default_qconfig_mapping(), example_inputs=(example,)
+                )
+                with torch.no_grad():
+                    for start in range(0, len(samples), 32):
+                        prepared(torch.stack(samples[start:start + 32]))
+                self.model = convert_fx(prepared)
+        self.backend = backend
+        return self
+
+    # ------------------------------------------------------------------
+    def _metadata(self) -> dict:
+        """Return the metadata needed to rebuild this classifier."""
+        return {
+            "classes": self.classes_,
+            "model_name": self.model_name,
+            "num_classes": self.num_classes,
+        }
+
+    @classmethod
+    def _from_metadata(cls, data: dict, device: str | None) -> "CardClassifier":
+        """Return an unfitted classifier built from saved ``data``."""
+        obj = cls(data.get("model_name", "resnet18"), data.get("num_classes"), device=device)
+        obj.classes_ = data.get("classes", [])
+        return obj
+
     # ------------------------------------------------------------------
     def save(self, path: str | Path) -> None:
         """Save model weights and metadata to ``path``."""
         if not torch:
             raise ImportError("PyTorch is required to save the model")
+        if self.backend != "eager":
+            raise RuntimeError("Compiled models must be saved with export()")
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
         torch.save(
-            {
-                "model_state": self.model.state_dict() if self.model else None,
-                "classes": self.classes_,
-                "model_name": self.model_name,
-                "num_classes": self.num_classes,
-            },
+            {"model_state": self.model.state_dict() if self.model else None, **self._metadata()},
             str(path),
         )
 
+    # ------------------------------------------------------------------
+    def export(self, path: str | Path) -> None:
+        """Write the model as a self-contained TorchScript archive to ``path``."""
+        if not torch:
+            raise ImportError("PyTorch is required to export the model")
+        model = self.model
+        if not isinstance(model, torch.jit.ScriptModule):
+            example = torch.rand(1, 3, *INPUT_SIZE, device=self.device)
+            with torch.no_grad():
+                model = torch.jit.freeze(torch.jit.trace(model.eval(), example))
+        backend = "torchscript" if self.backend == "eager" else self.backend
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {**self._metadata(), "backend": backend}
+        torch.jit.save(model, str(path), _extra_files={"meta.json": json.dumps(meta)})
+
     # ------------------------------------------------------------------
     @classmethod
-    def load(cls, path: str | Path, device: str | None = None) -> "CardClassifier":
-        """Load classifier from ``path``."""
+    def load(
+        cls,
+        path: str | Path,
+        device: str | None = None,
+        backend: str = "eager",
+        calibration: Iterable[torch.Tensor] | None = None,
+    ) -> "CardClassifier":
+        """Load classifier from ``path``.
+
+        Checkpoints saved with :meth:`save` are converted to ``backend`` via
+        :meth:`compile`. Archives written by :meth:`export` (``.ts`` files)
+        are loaded as they are and keep the backend they were exported with.
+        """
         if not torch:
             raise ImportError("PyTorch is required to load the model")
-        data = torch.load(str(path), map_location=device or ("cuda" if torch.cuda.is_available() else "cpu"))
-        obj = cls(data.get("model_name", "resnet18"), data.get("num_classes"), device=device)
-        obj.classes_ = data.get("classes", [])
+        map_location = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        if Path(path).suffix == EXPORT_SUFFIX:
+            extra = {"meta.json": ""}
+            module = torch.jit.load(str(path), map_location=map_location, _extra_files=extra)
+            meta = json.loads(extra["meta.json"])
+            obj = cls._from_metadata(meta, device)
+            obj.model = module
+            obj.backend = meta.get("backend", "torchscript")
+            return obj
+
+        data = torch.load(str(path), map_location=map_location)
+        obj = cls._from_metadata(data, device)
         if obj.model:
             obj.model.load_state_dict(data.get("model_state", {}))
-        return obj
+        return obj.compile(backend, calibration)
+
+
+
+if nn is not None:
 
+    class _MultiHeadNet(nn.Module):
+        """Shared backbone feeding separate card ID and card type heads."""
+
+        def __init__(self, backbone: nn.Module, in_features: int, num_classes: int, num_types: int):
+            super().__init__()
+            self.backbone = backbone
+            self.id_head = nn.Linear(in_features, num_classes)
+            self.type_head = nn.Linear(in_features, num_types)
+
+        def forward(self, x):
+            features = self.backbone(x)
+            return self.id_head(features), self.type_head(features)
+
+
+class MultiHeadCardClassifier(CardClassifier):
+    """Card classifier predicting card ID and type in a single forward pass."""
+
+    def __init__(
+        self,
+        model_name: str = "resnet18",
+        num_classes: int | None = None,
+        num_types: int | None = None,
+        device: str | None = None,
+    ):
+        self.num_types = num_types
+        self.type_classes_: List[str] = []
+        super().__init__(model_name, num_classes, device=device)
+
+    # ------------------------------------------------------------------
+    def _build_model(self) -> None:
+        if not torch:
+            return
+        name = self.model_name.lower()
+        if name == "mobilenet":
+            backbone = models.mobilenet_v2(weights=None)
+            in_features = backbone.classifier[1].in_features
+            backbone.classifier[1] = nn.Identity()
+        elif name == "efficientnet":
+            backbone = models.efficientnet_b0(weights=None)
+            in_features = backbone.classifier[1].in_features
+            backbone.classifier[1] = nn.Identity()
+        else:
+            backbone = models.resnet18(weights=None)
+            in_features = backbone.fc.in_features
+            backbone.fc = nn.Identity()
+        self.model = _MultiHeadNet(backbone, in_features, self.num_classes or 1, self.num_types or 1)
+        self.model.to(self.device)
+
+    # ------------------------------------------------------------------
+    def fit(
+        self,
+        X: Iterable[torch.Tensor] | "torch.utils.data.Dataset" | "torch.utils.data.DataLoader",
+        y: Iterable[str] | None = None,
+        types: Iterable[str] | None = None,
+        epochs: int = 1,
+        lr: float = 1e-3,
+        batch_size: int = 32,
+        num_workers: int | None = None,
+    ):
+        """Train both heads on ``X`` with card IDs ``y`` and ``types``.
+
+        ``X`` is given as for :meth:`CardClassifier.fit`, except that
+        datasets yield ``(image, id target, type target)``. Their type names
+        are taken from ``types`` or ``dataset.type_classes``.
+        """
+        if not torch:
+            raise ImportError("PyTorch is required for training")
+
+        loader, self.classes_, self.type_classes_ = self._typed_loader(X, y, types, batch_size, num_workers)
+        if (
+            self.model is None
+            or self.num_classes != len(self.classes_)
+            or self.num_types != len(self.type_classes_)
+        ):
+            self.num_classes = len(self.classes_)
+            self.num_types = len(self.type_classes_)
+            self._build_model()
+        self._train_heads(loader, epochs, lr)
+        return self
+
+    def partial_fit(
+        self,
+        X: Iterable[torch.Tensor] | "torch.utils.data.Dataset" | "torch.utils.data.DataLoader",
+        y: Iterable[str] | None = None,
+        types: Iterable[str] | None = None,
+        epochs: int = 1,
+        lr: float = 1e-4,
+        batch_size: int = 32,
+        num_workers: int | None = None,
+        freeze_backbone: bool = False,
+    ):
+        """Fine-tune both heads, adding card IDs and types not seen yet.
+
+        Known card IDs and types keep their output rows; see
+        :meth:`CardClassifier.partial_fit`.
+        """
+        if not torch:
+            raise ImportError("PyTorch is required for training")
+        if not self.classes_ or not self.type_classes_:
+            return self.fit(X, y, types, epochs, lr, batch_size, num_workers)
+        if self.backend != "eager":
+            raise RuntimeError("Compiled models cannot be trained")
+
+        loader, classes, type_classes = self._typed_loader(X, y, types, batch_size, num_workers)
+        self.extend_classes(classes)
+        self.extend_types(type_classes)
+        remap = torch.tensor([self.classes_.index(c) for c in classes], device=self.device)
+        type_remap = torch.tensor([self.type_classes_.index(t) for t in type_classes], device=self.device)
+        self._train_heads(loader, epochs, lr, freeze_backbone, remap, type_remap)
+        return self
+
+    def _typed_loader(self, X, y, types, batch_size: int, num_workers: int | None):
+        """Return a training loader for ``X`` with its card ID and type names."""
+        data = torch.utils.data
+        if isinstance(X, (data.Dataset, data.DataLoader)):
+            loader, classes = self._loader(X, y, batch_size, num_workers)
+            if types is None:
+                types = getattr(loader.dataset, "type_classes", None)
+            if types is None:
+                raise ValueError("Card type labels are required for the type head")
+            return loader, classes, [str(t) for t in types]
+
+        if types is None:
+            raise ValueError("Card type labels are required for the type head")
+        y = [str(label) for label in y]
+        types = [str(label) for label in types]
+        classes = sorted(set(y))
+        type_classes = sorted(set(types))
+        cls_to_idx = {c: i for i, c in enumerate(classes)}
+        type_to_idx = {c: i for i, c in enumerate(type_classes)}
+        dataset = data.TensorDataset(
+            torch.stack(list(X)),
+            torch.tensor([cls_to_idx[label] for label in y]),
+            torch.tensor([type_to_idx[label] for label in types]),
+        )
+        return data.DataLoader(dataset, batch_size=batch_size, shuffle=True), classes, type_classes
+
+    def extend_types(self, types: Iterable[str]) -> List[str]:
+        """Append unseen card ``types`` to the type head and return them."""
+        added = [t for t in dict.fromkeys(str(t) for t in types) if t not in self.type_classes_]
+        if not added:
+            return []
+        self.model.type_head = _grow_linear(self.model.type_head, len(added))
+        self.type_classes_ = [*self.type_classes_, *added]
+        self.num_types = len(self.type_classes_)
+        return added
+
+    def _train_heads(
+        self,
+        loader,
+        epochs: int,
+        lr: float,
+        freeze_backbone: bool = False,
+        remap: torch.Tensor | None = None,
+        type_remap: torch.Tensor | None = None,
+    ) -> None:
+        """Train on ``(image, id, type)`` batches; only the heads when ``freeze_backbone``.
+
+        ``remap`` and ``type_remap`` map loader targets to head indices.
+        """
+        criterion = nn.CrossEntropyLoss()
+        net = self.model
+        if freeze_backbone:
+            net.eval()
+            params = [*net.id_head.parameters(), *net.type_head.parameters()]
+        else:
+            net.train()
+            params = net.parameters()
+        optimizer = torch.optim.Adam(params, lr=lr)
+
+        for _ in range(max(1, epochs)):
+            for images, id_labels, type_labels in loader:
+                images = images.to(self.device, non_blocking=True)
+                id_labels = id_labels.to(self.device, non_blocking=True)
+                type_labels = type_labels.to(self.device, non_blocking=True)
+                if remap is not None:
+                    id_labels = remap[id_labels]
+                if type_remap is not None:
+                    type_labels = type_remap[type_labels]
+                optimizer.zero_grad()
+                if freeze_backbone:
+                    with torch.no_grad():
+                        features = net.backbone(images)
+                    id_out, type_out = net.id_head(features), net.type_head(features)
+                else:
+                    id_out, type_out = net(images)
+                loss = criterion(id_out, id_labels) + criterion(type_out, type_labels)
+                loss.backward()
+                optimizer.step()
+
+    # ------------------------------------------------------------------
+    def predict_with_type(self, X: Iterable[torch.Tensor]) -> List[tuple[str, str]]:
+        """Return ``(card_id, card_type)`` pairs for tensors ``X``."""
+        if not torch:
+            raise ImportError("PyTorch is required for prediction")
+        if not self.classes_ or not self.type_classes_:
+            raise RuntimeError("Model has not been fitted")
+        self.model.eval()
+        with torch.no_grad():
+            images = torch.stack(list(X)).to(self.device)
+            id_out, type_out = self.model(images)
+            id_idxs = id_out.argmax(dim=1).cpu().tolist()
+            type_idxs = type_out.argmax(dim=1).cpu().tolist()
+        return [(self.classes_[i], self.type_classes_[t]) for i, t in zip(id_idxs, type_idxs)]
+
+    def predict(self, X: Iterable[torch.Tensor]) -> List[str]:
+        """Return predicted card IDs for tensors ``X``."""
+        return [card_id for card_id, _ in self.predict_with_type(X)]
+
+    def _backbone(self) -> nn.Module:
+        if self.backend != "eager":
+            raise RuntimeError("Embeddings require the eager backend")
+        return self.model.backbone
+
+    def _head(self) -> nn.Linear:
+        return self.model.id_head
+
+    def _set_head(self, layer: nn.Linear) -> None:
+        self.model.id_head = layer
+
+    # ------------------------------------------------------------------
+    def _metadata(self) -> dict:
+        return {
+            **super()._metadata(),
+            "type_classes": self.type_classes_,
+            "num_types": self.num_types,
+        }
+
+    @classmethod
+    def _from_metadata(cls, data: dict, device: str | None) -> "MultiHeadCardClassifier":
+        obj = cls(
+            data.get("model_name", "resnet18"),
+            data.get("num_classes"),
+            data.get("num_types"),
+            device=device,
+        )
+        obj.classes_ = data.get("classes", [])
+        obj.type_classes_ = data.get("type_classes", [])
+        return obj
@@ -2,6 +2,7 @@
 
 from pathlib import Path
 import csv
+import os
 
 
 def export_to_csv(data, path: str) -> None:
@@ -28,3 +29,123 @@ def export_to_csv(data, path: str) -> None:
         writer = csv.DictWriter(fh, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(data)
+
+
+def _ends_with_newline(target: Path) -> bool:
+    with target.open("rb") as fh:
+        end = fh.seek(0, os.SEEK_END)
+        if not end:
+            return True
+        fh.seek(end - 1)
+        return fh.read(1) == b"\n"
+
+
+def iter_csv_rows(path: str):
+    """Yield rows of the CSV file at ``path`` as dictionaries.
+
+    Nothing is yielded when the file does not exist or is empty. A last line
+    without a newline is a row cut off by a crash and is skipped, matching
+    what :class:`CsvAppender` removes before appending.
+    """
+    target = Path(path)
+    if not target.exists():
+        return
+    complete = _ends_with_newline(target)
+    with target.open(newline="", encoding="utf-8") as fh:
+        rows = csv.DictReader(fh)
+        previous = next(rows, None)
+        for row in rows:
+            yield previous
+            previous = row
+        if previous is not None and complete:
+            yield previous
+
+
+def read_header(path: str) -> list[str] | None:
+    """Return the header of the CSV file at ``path``, or ``None`` if it has none."""
+    target = Path(path)
+    if not target.exists() or not target.stat().st_size:
+        return None
+    with target.open(newline="", encoding="utf-8") as fh:
+        return next(csv.reader(fh), None)
+
+
+def read_column(path: str, column: str) -> set:
+    """Return the set of values in ``column`` of the CSV file at ``path``."""
+    return {row[column] for row in iter_csv_rows(path) if row.get(column)}
+
+
+class CsvAppender:
+    """Append dictionaries to a CSV file, flushing every ``flush_every`` rows.
+
+    The header is taken from an existing file or from the first written row.
+    A partial last line left by an interrupted run is removed before
+    appending. Use as a context manager so buffered rows are flushed on exit.
+    """
+
+    def __init__(self, path: str, flush_every: int = 50):
+        self.path = Path(path)
+        self.flush_every = max(1, flush_every)
+        self.rows_written = 0
+        self._fh = None
+        self._writer = None
+        self._pending = 0
+
+    def _drop_partial_row(self) -> None:
+        """Truncate the file after its last newline if it does not end in one."""
+        if _ends_with_newline(self.path):
+            return
+        with self.path.open("rb+") as fh:
+            pos = fh.seek(0, os.SEEK_END)
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                fh.seek(pos)
+                newline = fh.read(step).rfind(b"\n")
+                if newline >= 0:
+                    pos += newline + 1
+                    break
+            fh.truncate(pos)
+        print(f"[CSV] Usunięto niepełny ostatni wiersz z {self.path}")
+
+    def _open(self, row: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self._drop_partial_row()
+        fieldnames = read_header(str(self.path))
+        self._fh = self.path.open("a", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(
+            self._fh, fieldnames=fieldnames or list(row.keys()), extrasaction="ignore"
+        )
+        if not fieldnames:
+            self._writer.writeheader()
+
+    def write(self, row: dict) -> None:
+        """Append a single ``row``."""
+        if self._writer is None:
+            self._open(row)
+        self._writer.writerow(row)
+        self.rows_written += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows to disk."""
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self.flush()
+            self._fh.close()
+            self._fh = None
+            self._writer = None
+
+    def __enter__(self) -> "CsvAppender":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
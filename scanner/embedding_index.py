@@ -0,0 +1,298 @@
+"""Nearest-neighbour card identification over backbone embeddings.
+
+Instead of a closed-set softmax over ``CardClassifier.classes_`` the card is
+identified by the closest reference image in a persisted vector index. New
+cards are added to the index without retraining the network.
+
+Build an index from a folder of reference images grouped by card ID and add
+a new set later::
+
+    python -m scanner.embedding_index build data/card_dataset
+    python -m scanner.embedding_index add data/new_set
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from pathlib import Path
+import sys
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from scanner.classifier import CardClassifier
+from scanner.model_registry import get_classifier, registry
+from scanner.preprocessing import open_rgb, to_tensor
+
+INDEX_PATH = Path(__file__).resolve().parent / "card_index.npz"
+MODEL_PATH = Path(__file__).resolve().parent / "card_model.pt"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Return ``vectors`` as float32 rows scaled to unit length."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the ``k`` highest ``scores`` in descending order."""
+    k = min(k, scores.shape[-1])
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+
+class BruteForceIndex:
+    """Exact cosine-similarity search over all stored embeddings."""
+
+    kind = "flat"
+
+    def __init__(self, dim: int | None = None):
+        self.dim = dim
+        self.labels: list[str] = []
+        self._chunks: list[np.ndarray] = []
+        self._matrix: np.ndarray | None = None
+
+    # ------------------------------------------------------------------
+    @property
+    def embeddings(self) -> np.ndarray:
+        """Return all stored embeddings as one ``(N, dim)`` array."""
+        if self._matrix is None:
+            self._matrix = (
+                np.concatenate(self._chunks) if self._chunks else np.empty((0, self.dim or 0), np.float32)
+            )
+            self._chunks = [self._matrix] if len(self._matrix) else []
+        return self._matrix
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    # ------------------------------------------------------------------
+    def add(self, embeddings: np.ndarray, labels: list[str]) -> None:
+        """Append ``embeddings`` with their card ID ``labels``."""
+        vectors = _normalize(embeddings)
+        if len(vectors) != len(labels):
+            raise ValueError("Number of embeddings and labels differ")
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional embeddings")
+        self._chunks.append(vectors)
+        self._matrix = None
+        self.labels.extend(str(label) for label in labels)
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray | None:
+        """Return row indices to score for ``query``; ``None`` means all."""
+        return None
+
+    def search(self, queries: np.ndarray, k: int = 1) -> list[list[tuple[str, float]]]:
+        """Return the ``k`` best ``(card_id, similarity)`` pairs per query."""
+        queries = _normalize(queries)
+        matrix = self.embeddings
+        results: list[list[tuple[str, float]]] = []
+        if not len(matrix):
+            return [[] for _ in queries]
+        for query in queries:
+            rows = self._candidates(query)
+            candidates = matrix if rows is None else matrix[rows]
+            if not len(candidates):
+                results.append([])
+                continue
+            scores = candidates @ query
+            best = _top_k(scores, k)
+            ids = best if rows is None else rows[best]
+            results.append([(self.labels[i], float(scores[j])) for i, j in zip(ids, best)])
+        return results
+
+    # ------------------------------------------------------------------
+    def _arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "kind": np.array(self.kind),
+            "embeddings": self.embeddings,
+            "labels": np.array(self.labels, dtype=str),
+        }
+
+    def save(self, path: str | Path) -> None:
+        """Write the index to ``path`` as an ``.npz`` file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as fh:
+            np.savez(fh, **self._arrays())
+
+    def _restore(self, data) -> None:
+        embeddings = data["embeddings"].astype(np.float32)
+        self.dim = embeddings.shape[1] if embeddings.ndim == 2 else None
+        self._chunks = [embeddings] if len(embeddings) else []
+        self._matrix = None
+        self.labels = [str(label) for label in data["labels"]]
+
+
+class IVFIndex(BruteForceIndex):
+    """Approximate index partitioning embeddings into ``nlist`` k-means cells.
+
+    Only the ``nprobe`` cells closest to a query are scored, which keeps
+    lookups fast for galleries with tens of thousands of reference cards.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, dim: int | None = None, nlist: int = 256, nprobe: int = 8):
+        super().__init__(dim)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.centroids: np.ndarray | None = None
+        self._assign: list[np.ndarray] = []
+        self._lists: list[np.ndarray] | None = None
+
+    # ------------------------------------------------------------------
+    def train(self, embeddings: np.ndarray, iterations: int = 10, seed: int = 0) -> None:
+        """Fit the coarse k-means centroids on ``embeddings``."""
+        vectors = _normalize(embeddings)
+        rng = np.random.default_rng(seed)
+        nlist = min(self.nlist, len(vectors))
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)]
+        for _ in range(iterations):
+            assign = np.argmax(vectors @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = vectors[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+        self.centroids = centroids
+        self.nlist = nlist
+
+    def add(self, embeddings: np.ndarray, labels: list[str]) -> None:
+        """Append ``embeddings``, training centroids on the first call."""
+        vectors = _normalize(embeddings)
+        if self.centroids is None:
+            self.train(vectors)
+        super().add(vectors, labels)
+        self._assign.append(np.argmax(vectors @ self.centroids.T, axis=1))
+        self._lists = None
+
+    def _candidates(self, query: np.ndarray) -> np.ndarray | None:
+        if self._lists is None:
+            assign = np.concatenate(self._assign) if self._assign else np.empty(0, int)
+            order = np.argsort(assign, kind="stable")
+            bounds = np.searchsorted(assign[order], np.arange(self.nlist + 1))
+            self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(self.nlist)]
+        probes = _top_k(self.centroids @ query, self.nprobe)
+        return np.concatenate([self._lists[c] for c in probes])
+
+    # ------------------------------------------------------------------
+    def _arrays(self) -> dict[str, np.ndarray]:
+        return {
+            **super()._arrays(),
+            "centroids": self.centroids if self.centroids is not None else np.empty((0, 0), np.float32),
+            "assign": np.concatenate(self._assign) if self._assign else np.empty(0, int),
+            "nprobe": np.array(self.nprobe),
+        }
+
+    def _restore(self, data) -> None:
+        super()._restore(data)
+        self.centroids = data["centroids"].astype(np.float32)
+        self.nlist = len(self.centroids)
+        self.nprobe = int(data["nprobe"])
+        self._assign = [data["assign"]]
+        self._lists = None
+
+
+def load_index(path: str | Path) -> BruteForceIndex:
+    """Load an index written by :meth:`BruteForceIndex.save`."""
+    with np.load(str(path), allow_pickle=False) as data:
+        index = IVFIndex() if str(data["kind"]) == IVFIndex.kind else BruteForceIndex()
+        index._restore(data)
+    return index
+
+
+def get_index(path: str | Path = INDEX_PATH) -> BruteForceIndex:
+    """Return the shared index at ``path`` from the model registry."""
+    if not Path(path).exists():
+        raise RuntimeError("Card embedding index not found")
+    return registry.get(path, load_index, "embedding_index")
+
+
+def identify(tensors: list, clf: CardClassifier, index: BruteForceIndex) -> list[str]:
+    """Return the nearest reference card ID for each image tensor."""
+    if not tensors:
+        return []
+    hits = index.search(clf.embed(tensors).numpy(), k=1)
+    return [h[0][0] if h else "Unknown" for h in hits]
+
+
+# ---------------------------------------------------------------------------
+# Building indexes from reference images
+# ---------------------------------------------------------------------------
+
+def _iter_reference_images(dataset_dir: Path):
+    """Yield ``(path, card_id)`` for images in ``dataset_dir/<card_id>/``."""
+    for card_dir in sorted(p for p in Path(dataset_dir).iterdir() if p.is_dir()):
+        for pattern in ("*.jpg", "*.png"):
+            for path in sorted(card_dir.glob(pattern)):
+                yield path, card_dir.name
+
+
+def add_reference_images(
+    index: BruteForceIndex,
+    clf: CardClassifier,
+    dataset_dir: str | Path,
+    batch_size: int = 64,
+) -> int:
+    """Embed reference images from ``dataset_dir`` into ``index``.
+
+    Returns the number of images added.
+    """
+    tensors: list = []
+    labels: list[str] = []
+    added = 0
+
+    def flush() -> None:
+        nonlocal added
+        if tensors:
+            index.add(clf.embed(tensors, batch_size=batch_size).numpy(), labels)
+            added += len(labels)
+            tensors.clear()
+            labels.clear()
+
+    for path, card_id in _iter_reference_images(Path(dataset_dir)):
+        tensors.append(to_tensor(open_rgb(path)))
+        labels.append(card_id)
+        if len(tensors) >= batch_size:
+            flush()
+    flush()
+    return added
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Build or extend the card embedding index")
+    parser.add_argument("command", choices=["build", "add"])
+    parser.add_argument("dataset_dir", help="Folder with images grouped by card ID")
+    parser.add_argument("--model", default=str(MODEL_PATH))
+    parser.add_argument("--index", default=str(INDEX_PATH))
+    parser.add_argument("--approximate", action="store_true", help="Use the IVF index")
+    parser.add_argument("--nlist", type=int, default=256)
+    args = parser.parse_args()
+
+    clf = get_classifier(args.model)
+    if args.command == "add" and Path(args.index).exists():
+        index = load_index(args.index)
+        added = add_reference_images(index, clf, args.dataset_dir)
+    else:
+        index = BruteForceIndex()
+        added = add_reference_images(index, clf, args.dataset_dir)
+        if args.approximate:
+            # Train the cells on the whole gallery rather than the first batch.
+            flat = index
+            index = IVFIndex(nlist=args.nlist)
+            index.train(flat.embeddings)
+            index.add(flat.embeddings, flat.labels)
+    index.save(args.index)
+    print(f"[OK] Dodano {added} obrazów, indeks zawiera {len(index)} wpisów: {args.index}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Card metadata enrichment shared by all scan paths.
+
+Predicted card IDs are resolved to their details once per distinct ID and
+the result is fanned back out to every row with that ID. Concurrent lookups
+of the same key, e.g. from parallel scan threads, share a single in-flight
+call through :class:`SingleFlight`, independently of any response caching.
+
+With an :class:`EnrichmentQueue` the lookups are deferred to a background
+thread: scans return rows with ``CardID`` and ``Type`` straight away and the
+card details are filled in as they arrive.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Future
+import queue
+import threading
+from typing import Any
+
+ResultRow = dict[str, Any]
+
+# Column flagging the enrichment state of rows scanned with deferred lookups.
+STATUS_FIELD = "Enrichment"
+PENDING = "pending"
+DONE = "done"
+UNRESOLVED = "unresolved"
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share it."""
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._pending: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return ``fn()``, or the result of the call already running for ``key``."""
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                self.shared += 1
+                waiting = True
+            else:
+                future = self._pending[key] = Future()
+                self.calls += 1
+                waiting = False
+        if waiting:
+            return future.result()
+        try:
+            future.set_result(fn())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._pending[key]
+        return future.result()
+
+
+# Lookups of card details by ``(lang, card_id)``.
+card_flight = SingleFlight()
+
+
+def resolve(
+    keys: Iterable[Hashable],
+    lookup: Callable[[Hashable], Any],
+    flight: SingleFlight | None = None,
+    run: Callable[[Callable, list], list] | None = None,
+) -> dict:
+    """Return ``{key: lookup(key)}`` for every distinct key.
+
+    ``run`` evaluates the lookups, e.g. a thread pool ``map``; they run one
+    after another by default. With a ``flight``, keys already being looked
+    up elsewhere wait for that call instead of starting another.
+    """
+    unique = list(dict.fromkeys(keys))
+    if flight is not None:
+        call = lambda key: flight.do(key, lambda: lookup(key))  # noqa: E731
+    else:
+        call = lookup
+    results = run(call, unique) if run is not None else [call(key) for key in unique]
+    return dict(zip(unique, results))
+
+
+def fill_row(row: ResultRow, details: dict | None) -> ResultRow:
+    """Update scan ``row`` in place with card ``details`` and return it.
+
+    Without details the set and number are derived from the card ID.
+    """
+    if details:
+        row.update({k: v for k, v in details.items() if v})
+    else:
+        card_id = row.get("CardID", "")
+        if "-" in card_id:
+            set_id, number = card_id.split("-", 1)
+            row["Set"] = set_id
+            row["Number"] = number
+    return row
+
+
+def without_status(row: ResultRow) -> ResultRow:
+    """Return a copy of ``row`` without the enrichment status column."""
+    return {k: v for k, v in row.items() if k != STATUS_FIELD}
+
+
+class EnrichmentQueue:
+    """Background worker filling in card details of submitted scan rows.
+
+    Rows are updated in place. Each row is flagged ``pending`` when
+    submitted and ``done`` or ``unresolved`` once its lookup finished, after
+    which ``on_update`` is called with it from the worker thread.
+
+    Parameters
+    ----------
+    lookup : callable, optional
+        Function mapping a list of card IDs to ``{card_id: details}``;
+        defaults to :func:`scanner.card_scanner.query_cards_by_id`.
+    on_update : callable, optional
+        Called with every row once it has been resolved.
+    batch_size : int, optional
+        Maximum number of rows resolved together.
+    """
+
+    def __init__(
+        self,
+        lookup: Callable[[list[str]], dict[str, dict | None]] | None = None,
+        on_update: Callable[[ResultRow], None] | None = None,
+        batch_size: int = 64,
+    ):
+        if lookup is None:
+            from scanner.card_scanner import query_cards_by_id as lookup
+        self.lookup = lookup
+        self.on_update = on_update
+        self.batch_size = max(1, batch_size)
+        self.pending = 0
+        self.resolved = 0
+        self.unresolved = 0
+        self._queue: queue.Queue[ResultRow | None] = queue.Queue()
+        self._waiters: dict[int, list[Callable[[ResultRow], None]]] = {}
+        self._idle = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, rows: Iterable[ResultRow]) -> None:
+        """Queue ``rows`` for enrichment and flag them as pending."""
+        rows = list(rows)
+        with self._idle:
+            for row in rows:
+                row[STATUS_FIELD] = PENDING
+            self.pending += len(rows)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="enrichment", daemon=True)
+                self._thread.start()
+        for row in rows:
+            self._queue.put(row)
+
+    def when_done(self, row: ResultRow, fn: Callable[[ResultRow], None]) -> None:
+        """Call ``fn(row)`` once ``row`` is resolved, immediately if it already is."""
+        with self._idle:
+            if row.get(STATUS_FIELD) == PENDING:
+                self._waiters.setdefault(id(row), []).append(fn)
+                return
+        fn(row)
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until all submitted rows are resolved; return ``False`` on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self.pending == 0, timeout)
+
+    def close(self) -> None:
+        """Finish the queued rows and stop the worker thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    def _next_batch(self) -> list[ResultRow] | None:
+        row = self._queue.get()
+        if row is None:
+            return None
+        batch = [row]
+        while len(batch) < self.batch_size:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is None:
+                self._queue.put(None)
+                break
+            batch.append(row)
+        return batch
+
+    def _run(self) -> None:
+        while (batch := self._next_batch()) is not None:
+            try:
+                details = self.lookup([row.get("CardID", "") for row in batch])
+            except Exception as exc:
+                print(f"[ENRICH] Lookup failed for {len(batch)} rows: {exc}")
+                details = {}
+            for row in batch:
+                found = details.get(row.get("CardID", ""))
+                fill_row(row, found)
+                with self._idle:
+                    row[STATUS_FIELD] = DONE if found else UNRESOLVED
+                    if found:
+                        self.resolved += 1
+                    else:
+                        self.unresolved += 1
+                    waiters = self._waiters.pop(id(row), [])
+                if self.on_update is not None:
+                    waiters.append(self.on_update)
+                for fn in waiters:
+                    try:
+                        fn(row)
+                    except Exception as exc:  # keep enriching the remaining rows
+                        print(f"[ENRICH] Callback failed: {exc}")
+            with self._idle:
+                self.pending -= len(batch)
+                self._idle.notify_all()
@@ -0,0 +1,73 @@
+"""Export a trained card classifier to a compiled inference backend.
+
+Example::
+
+    python -m scanner.export_model --backend static_int8 \
+        --calibration-dir data/card_dataset --output scanner/card_model.int8.ts
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from pathlib import Path
+import sys
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import torch
+except Exception:  # pragma: no cover - torch may be missing
+    torch = None
+
+from scanner.classifier import BACKENDS, EXPORT_SUFFIX, CardClassifier
+from scanner.preprocessing import open_rgb, to_tensor
+
+MODEL_PATH = Path(__file__).resolve().parent / "card_model.pt"
+
+
+def load_calibration_images(directory: str | Path, limit: int = 256) -> list[torch.Tensor]:
+    """Return up to ``limit`` model input tensors from images under ``directory``."""
+    tensors: list[torch.Tensor] = []
+    for pattern in ("*.jpg", "*.png"):
+        for path in sorted(Path(directory).rglob(pattern)):
+            if len(tensors) >= limit:
+                return tensors
+            tensors.append(to_tensor(open_rgb(path)))
+    return tensors
+
+
+def export_model(
+    model_path: str | Path,
+    output_path: str | Path,
+    backend: str = "torchscript",
+    calibration_dir: str | Path | None = None,
+) -> Path:
+    """Compile ``model_path`` for ``backend`` and write it to ``output_path``."""
+    calibration = load_calibration_images(calibration_dir) if calibration_dir else None
+    clf = CardClassifier.load(model_path, device="cpu", backend=backend, calibration=calibration)
+    output_path = Path(output_path)
+    clf.export(output_path)
+    print(f"[OK] Wyeksportowano model ({backend}) do {output_path}")
+    return output_path
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Export the card classifier for fast CPU inference")
+    parser.add_argument("--model", default=str(MODEL_PATH), help="Path to the fp32 checkpoint")
+    parser.add_argument("--backend", choices=[b for b in BACKENDS if b != "eager"], default="torchscript")
+    parser.add_argument("--output", help=f"Destination ({EXPORT_SUFFIX} archive)")
+    parser.add_argument(
+        "--calibration-dir",
+        help="Images used to calibrate static_int8 activation ranges",
+    )
+    args = parser.parse_args()
+    if args.backend == "static_int8" and not args.calibration_dir:
+        parser.error("--calibration-dir is required for static_int8")
+
+    output = args.output or str(Path(args.model).with_suffix(f".{args.backend}{EXPORT_SUFFIX}"))
+    export_model(args.model, output, args.backend, args.calibration_dir)
+
+
+if __name__ == "__main__":
+    main()
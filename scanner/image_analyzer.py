@@ -1,5 +1,7 @@
 # image_analyzer.py
 
+import time
+
 import torch
 from torchvision import transforms, models
 from torch import nn, optim
@@ -8,60 +10,96 @@ import pandas as pd
 from pathlib import Path
 from tqdm import tqdm
 
-def train_type_classifier(csv_path: str | Path, model_path: str | Path, epochs: int = 5) -> None:
-    """Trenuje klasyfikator typu karty (normal / reverse / holo) na podstawie dataset.csv"""
-    df = pd.read_csv(csv_path)
-    classes = []
-    images = []
+from scanner.classifier import make_loader
+from scanner.model_registry import registry
+from scanner.preprocessing import load_tensor, open_rgb, to_tensor
+
+# Kept apart from ``type_model.MODEL_PATH``, whose checkpoint is a CardClassifier.
+MODEL_PATH = Path(__file__).resolve().parent / "type_resnet.pt"
+
+
+def _get_type(row) -> str:
+    if row.get("holo", False): return "holo"
+    if row.get("reverse", False): return "reverse"
+    return "normal"
+
+
+class TypeDataset(torch.utils.data.Dataset):
+    """Card images and type indices, decoded only when a batch needs them."""
 
-    def get_type(row):
-        if row.get("holo", False): return "holo"
-        if row.get("reverse", False): return "reverse"
-        return "normal"
+    def __init__(self, samples: list[tuple[Path, int]]):
+        self.samples = samples
 
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def __getitem__(self, idx: int):
+        path, target = self.samples[idx]
+        return to_tensor(open_rgb(path)), target
+
+
+def _read_samples(csv_path: str | Path) -> tuple[list[tuple[Path, int]], dict[str, int]]:
+    """Return ``(path, class index)`` of readable images in ``csv_path`` and the class mapping."""
+    df = pd.read_csv(csv_path)
+    rows = []
     for _, row in df.iterrows():
         path = Path(row["image_path"])
         if not path.exists():
             continue
-        label = get_type(row)
         try:
-            img = Image.open(path).convert("RGB")
+            # Only the header is read here; pixels are decoded during training.
+            Image.open(path).close()
         except Exception:
             continue
-        images.append(img)
-        classes.append(label)
+        rows.append((path, _get_type(row)))
+
+    class_to_idx = {cls: i for i, cls in enumerate(sorted({label for _, label in rows}))}
+    return [(path, class_to_idx[label]) for path, label in rows], class_to_idx
 
-    class_names = sorted(set(classes))
-    class_to_idx = {cls: i for i, cls in enumerate(class_names)}
 
-    X = []
-    y = []
-    transform = transforms.Compose([
-        transforms.Resize((64, 64)),
-        transforms.ToTensor(),
-    ])
+def train_type_classifier(
+    csv_path: str | Path,
+    model_path: str | Path,
+    epochs: int = 5,
+    batch_size: int = 32,
+    num_workers: int | None = None,
+    lr: float = 0.001,
+) -> None:
+    """Trenuje klasyfikator typu karty (normal / reverse / holo) na podstawie dataset.csv
 
-    for img, label in zip(images, classes):
-        X.append(transform(img))
-        y.append(class_to_idx[label])
+    Obrazy są wczytywane partiami przez ``num_workers`` procesów, więc
+    zużycie pamięci zależy od ``batch_size``, a nie od rozmiaru zbioru.
+    """
+    samples, class_to_idx = _read_samples(csv_path)
+    if not samples:
+        raise ValueError(f"No readable images listed in {csv_path}")
 
-    X_tensor = torch.stack(X)
-    y_tensor = torch.tensor(y)
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    loader = make_loader(TypeDataset(samples), batch_size, num_workers=num_workers, device=device)
 
     model = models.resnet18(weights=None)
-    model.fc = nn.Linear(model.fc.in_features, len(class_names))
+    model.fc = nn.Linear(model.fc.in_features, len(class_to_idx))
+    model.to(device)
 
     criterion = nn.CrossEntropyLoss()
-    optimizer = optim.Adam(model.parameters(), lr=0.001)
+    optimizer = optim.Adam(model.parameters(), lr=lr)
 
     for epoch in range(epochs):
         model.train()
-        optimizer.zero_grad()
-        outputs = model(X_tensor)
-        loss = criterion(outputs, y_tensor)
-        loss.backward()
-        optimizer.step()
-        print(f"[Epoch {epoch+1}] Loss: {loss.item():.4f}")
+        seen = 0
+        total_loss = 0.0
+        start = time.perf_counter()
+        for images, labels in tqdm(loader, desc=f"Epoch {epoch+1}/{epochs}", leave=False):
+            images = images.to(device, non_blocking=True)
+            labels = labels.to(device, non_blocking=True)
+            optimizer.zero_grad()
+            loss = criterion(model(images), labels)
+            loss.backward()
+            optimizer.step()
+            seen += len(labels)
+            total_loss += loss.item() * len(labels)
+        elapsed = time.perf_counter() - start
+        print(f"[Epoch {epoch+1}] Loss: {total_loss / seen:.4f}, {seen / elapsed:.1f} img/s")
 
     torch.save({
         "model_state_dict": model.state_dict(),
@@ -69,11 +107,8 @@ def train_type_classifier(csv_path: str | Path, model_path: str | Path, epochs:
     }, model_path)
     print(f"✅ Zapisano model typu: {model_path}")
 
-def predict_type(image_path: str | Path, model_path: str | Path) -> str:
-    """
-    Przewiduje typ karty ('normal', 'reverse', 'holo') na podstawie obrazu.
-    """
-    image_path = Path(image_path)
+def _load_type_model(model_path: str | Path) -> tuple[nn.Module, dict[int, str]]:
+    """Return the type model stored at ``model_path`` and its index mapping."""
     checkpoint = torch.load(model_path, map_location="cpu")
 
     model = models.resnet18(weights=None)
@@ -82,18 +117,31 @@ def predict_type(image_path: str | Path, model_path: str | Path) -> str:
     model.eval()
 
     idx_to_class = {v: k for k, v in checkpoint["class_to_idx"].items()}
+    return model, idx_to_class
 
-    transform = transforms.Compose([
-        transforms.Resize((64, 64)),
-        transforms.ToTensor(),
-    ])
 
-    image = Image.open(image_path).convert("RGB")
-    tensor = transform(image).unsqueeze(0)
+def load_type_model(model_path: str | Path = MODEL_PATH) -> tuple[nn.Module, dict[int, str]]:
+    """Return the shared type model from the model registry."""
+    return registry.get(model_path, _load_type_model, "type_resnet")
+
+
+def predict_types(tensors: list[torch.Tensor], model_path: str | Path = MODEL_PATH) -> list[str]:
+    """
+    Przewiduje typy kart dla całej partii tensorów 64x64 w jednym przebiegu.
+    """
+    if not tensors:
+        return []
+    model, idx_to_class = load_type_model(model_path)
 
     with torch.no_grad():
-        output = model(tensor)
-        predicted = torch.argmax(output, dim=1).item()
-        predicted_class = idx_to_class[predicted]
+        output = model(torch.stack(list(tensors)))
+        predicted = torch.argmax(output, dim=1).tolist()
+
+    return [idx_to_class[i] for i in predicted]
+
 
-    return predicted_class
+def predict_type(image_path: str | Path, model_path: str | Path = MODEL_PATH) -> str:
+    """
+    Przewiduje typ karty ('normal', 'reverse', 'holo') na podstawie obrazu.
+    """
+    return predict_types([load_tensor(image_path)], model_path)[0]
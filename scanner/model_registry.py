@@ -0,0 +1,99 @@
+"""Process-wide registry of loaded model checkpoints.
+
+Every module that needs a model asks the registry instead of keeping its own
+global copy. Each checkpoint is loaded once, shared by all callers, reloaded
+when the ``.pt`` file changes on disk and evicted in LRU order when too many
+models are resident.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+import threading
+from typing import Any
+
+from scanner.classifier import EXPORT_SUFFIX, CardClassifier
+
+# Maximum number of models kept in memory at the same time.
+DEFAULT_MAX_MODELS = 4
+
+
+class ModelRegistry:
+    """LRU cache of models keyed by loader kind and checkpoint path."""
+
+    def __init__(self, max_models: int = DEFAULT_MAX_MODELS):
+        self.max_models = max(1, max_models)
+        self._models: OrderedDict[tuple[str, str], tuple[int, Any]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    def get(self, path: str | Path, loader: Callable[[Path], Any], kind: str) -> Any:
+        """Return the model at ``path``, loading it with ``loader`` if needed.
+
+        The model is reloaded when the file's modification time differs from
+        the one recorded at load time.
+        """
+        path = Path(path).resolve()
+        mtime = path.stat().st_mtime_ns
+        key = (kind, str(path))
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and entry[0] == mtime:
+                self._models.move_to_end(key)
+                return entry[1]
+            model = loader(path)
+            self._models[key] = (mtime, model)
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+            return model
+
+    # ------------------------------------------------------------------
+    def evict(self, path: str | Path, kind: str | None = None) -> None:
+        """Drop cached models loaded from ``path``."""
+        path = str(Path(path).resolve())
+        with self._lock:
+            for key in [k for k in self._models if k[1] == path and kind in (None, k[0])]:
+                del self._models[key]
+
+    def clear(self) -> None:
+        """Drop all cached models."""
+        with self._lock:
+            self._models.clear()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def __contains__(self, path: object) -> bool:
+        resolved = str(Path(path).resolve())  # type: ignore[arg-type]
+        return any(k[1] == resolved for k in self._models)
+
+
+registry = ModelRegistry()
+
+
+def get_classifier(
+    path: str | Path,
+    device: str = "cpu",
+    cls: type[CardClassifier] = CardClassifier,
+    backend: str = "eager",
+) -> CardClassifier:
+    """Return the shared classifier of type ``cls`` stored at ``path``.
+
+    ``backend`` selects the inference backend passed to
+    :meth:`CardClassifier.load`; each backend is cached separately.
+    ``static_int8`` is only served from archives calibrated and written by
+    ``python -m scanner.export_model``.
+    """
+    if backend == "static_int8" and Path(path).suffix != EXPORT_SUFFIX:
+        raise ValueError(
+            f"static_int8 needs a calibrated {EXPORT_SUFFIX} archive, not {path}; "
+            "create one with `python -m scanner.export_model --backend static_int8`"
+        )
+    return registry.get(
+        path,
+        lambda p: cls.load(p, device=device, backend=backend),
+        f"{cls.__name__}:{device}:{backend}",
+    )
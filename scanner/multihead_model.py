@@ -0,0 +1,115 @@
+"""Utilities for training and using the combined card ID and type model."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import csv
+
+try:
+    import torch
+except Exception:  # pragma: no cover - torch may be missing
+    torch = None
+
+from .classifier import MultiHeadCardClassifier
+from .model_registry import get_classifier
+from .preprocessing import load_tensor, open_rgb, to_tensor
+
+DATASET_PATH = Path(__file__).resolve().parent / "dataset.csv"
+MODEL_PATH = Path(__file__).resolve().parent / "multihead_model.pt"
+
+TRUE_VALUES = {"1", "true", "t"}
+
+
+def row_type(row: dict) -> str:
+    """Return ``holo``, ``reverse`` or ``common`` for a dataset row."""
+    if str(row.get("holo", "")).lower() in TRUE_VALUES:
+        return "holo"
+    if str(row.get("reverse", "")).lower() in TRUE_VALUES:
+        return "reverse"
+    return "common"
+
+
+class MultiHeadDataset(torch.utils.data.Dataset if torch else object):
+    """Card images with card ID and type indices, decoded only when a batch needs them.
+
+    Class names are exposed as ``classes`` and ``type_classes``, so the
+    dataset can be passed straight to :meth:`MultiHeadCardClassifier.fit`.
+    """
+
+    def __init__(self, samples: list[tuple[Path, str, str]]):
+        self.classes = sorted({card_id for _, card_id, _ in samples})
+        self.type_classes = sorted({card_type for _, _, card_type in samples})
+        cls_to_idx = {c: i for i, c in enumerate(self.classes)}
+        type_to_idx = {t: i for i, t in enumerate(self.type_classes)}
+        self.samples = [
+            (path, cls_to_idx[card_id], type_to_idx[card_type]) for path, card_id, card_type in samples
+        ]
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def __getitem__(self, idx: int):
+        path, card_id, card_type = self.samples[idx]
+        return to_tensor(open_rgb(path)), card_id, card_type
+
+
+def _load_dataset(csv_path: str | Path) -> MultiHeadDataset:
+    """Return the labelled images of ``csv_path`` as a streaming dataset."""
+    if not torch:
+        raise ImportError("PyTorch is required for training")
+    samples: list[tuple[Path, str, str]] = []
+    with open(csv_path, newline="", encoding="utf-8") as fh:
+        reader = csv.DictReader(fh)
+        for row in reader:
+            card_id = str(row.get("card_id", "")).strip()
+            path = Path(str(row.get("image_path", "")))
+            if not card_id or card_id.lower() == "unknown" or not path.exists():
+                continue
+            samples.append((path, card_id, row_type(row)))
+    return MultiHeadDataset(samples)
+
+
+def train_multihead_classifier(
+    csv_path: str | Path = DATASET_PATH,
+    output_model_path: str | Path = MODEL_PATH,
+    epochs: int = 10,
+    num_workers: int | None = None,
+) -> MultiHeadCardClassifier:
+    """Train the shared-backbone model on card IDs and types from ``csv_path``.
+
+    Images are streamed from disk by ``num_workers`` loader workers (see
+    :func:`scanner.classifier.make_loader`), so memory use does not grow
+    with the dataset size.
+    """
+    dataset = _load_dataset(csv_path)
+    if not len(dataset):
+        raise RuntimeError(f"No usable rows in {csv_path}")
+
+    clf = MultiHeadCardClassifier(
+        model_name="resnet18",
+        num_classes=len(dataset.classes),
+        num_types=len(dataset.type_classes),
+    )
+    clf.fit(dataset, epochs=epochs, num_workers=num_workers)
+    clf.save(output_model_path)
+    print(f"[OK] Model zapisany do {output_model_path}")
+    return clf
+
+
+def load(model_path: str | Path = MODEL_PATH) -> MultiHeadCardClassifier:
+    """Return the shared multi-head classifier from the model registry."""
+    if not torch:
+        raise ImportError("PyTorch is required for prediction")
+    if not Path(model_path).exists():
+        raise RuntimeError("Multi-head classifier model not found")
+    return get_classifier(model_path, cls=MultiHeadCardClassifier)
+
+
+def predict(image_path: str, model_path: str | Path = MODEL_PATH) -> tuple[str, str]:
+    """Return predicted ``(card_id, card_type)`` for ``image_path``."""
+    clf = load(model_path)
+    return clf.predict_with_type([load_tensor(image_path)])[0]
+
+
+if __name__ == "__main__":
+    train_multihead_classifier(DATASET_PATH, MODEL_PATH)
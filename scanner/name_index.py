@@ -0,0 +1,237 @@
+"""Fuzzy lookup of OCR text against known card and set names.
+
+Names from the offline card catalog (see :mod:`scanner.catalog`) and
+:mod:`scanner.set_mapping` are split into character trigrams and stored in
+an inverted index. A query only touches the postings of its own trigrams and
+scores every name at once with the Dice coefficient, so lookups stay well
+under a millisecond for tens of thousands of names.
+
+The index is built once per catalog language and saved next to the catalog;
+it is rebuilt when the catalog changes::
+
+    python -m scanner.name_index build --lang en
+    python -m scanner.name_index query "Pikachv"
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from collections.abc import Sequence
+from pathlib import Path
+import re
+import sys
+import threading
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from scanner.catalog import CardCatalog, get_catalog
+
+CARD = "card"
+SET = "set"
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    """Return ``text`` lowercased with punctuation collapsed to single spaces."""
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def trigrams(text: str) -> set[str]:
+    """Return the character trigrams of the normalised ``text``.
+
+    The text is padded so that short names and word starts still produce
+    trigrams (``"mew"`` -> ``"  m"``, ``" me"``, ``"mew"``, ``"ew "``).
+    """
+    text = normalize(text)
+    if not text:
+        return set()
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Trigram index over ``names`` labelled with their ``kinds``.
+
+    Parameters
+    ----------
+    names : sequence of str
+        Names to index; duplicates of the same kind are dropped.
+    kinds : sequence of str, optional
+        ``CARD`` or ``SET`` for every name; all names are cards by default.
+    """
+
+    def __init__(self, names: Sequence[str] = (), kinds: Sequence[str] | None = None):
+        kinds = list(kinds) if kinds is not None else [CARD] * len(names)
+        if len(kinds) != len(names):
+            raise ValueError("Number of names and kinds differ")
+        unique = dict.fromkeys(zip(kinds, names))
+        self.kinds = np.array([k for k, _ in unique], dtype=str)
+        self.names = np.array([n for _, n in unique], dtype=str)
+
+        postings: dict[str, list[int]] = {}
+        sizes = np.zeros(len(self.names), dtype=np.int32)
+        for idx, name in enumerate(self.names):
+            grams = trigrams(name)
+            sizes[idx] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(idx)
+        self.sizes = sizes
+        self._set_postings(
+            sorted(postings),
+            [np.asarray(postings[g], dtype=np.int32) for g in sorted(postings)],
+        )
+
+    def _set_postings(self, grams: Sequence[str], lists: Sequence[np.ndarray]) -> None:
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p) for p in lists])
+        self._ids = np.concatenate(lists) if lists else np.empty(0, dtype=np.int32)
+        self._offsets = offsets
+        self._grams = {g: (offsets[i], offsets[i + 1]) for i, g in enumerate(grams)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # ------------------------------------------------------------------
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        kind: str | None = None,
+        min_score: float = 0.0,
+    ) -> list[tuple[str, float]]:
+        """Return up to ``k`` ``(name, score)`` pairs most similar to ``query``.
+
+        ``score`` is the Dice coefficient of the trigram sets, from 0 to 1.
+        Only names of ``kind`` are returned when it is given.
+        """
+        grams = trigrams(query)
+        spans = [self._grams[g] for g in grams if g in self._grams]
+        if not spans or k <= 0:
+            return []
+        hits = np.concatenate([self._ids[start:end] for start, end in spans])
+        common = np.bincount(hits, minlength=len(self.names))
+        scores = 2.0 * common / (len(grams) + self.sizes)
+        if kind is not None:
+            scores[self.kinds != kind] = 0.0
+        k = min(k, len(scores))
+        # Every name tied with the k-th best score stays a candidate, so ties
+        # go to the name closest in length to the query rather than to
+        # whichever one the partition happened to keep.
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        top = np.flatnonzero((scores >= kth) & (scores > 0) & (scores >= min_score))
+        gaps = np.abs(self.sizes[top].astype(np.int64) - len(grams))
+        order = top[np.lexsort((gaps, -scores[top]))[:k]]
+        return [(str(self.names[i]), float(scores[i])) for i in order]
+
+    def best(self, query: str, kind: str | None = None, min_score: float = 0.0) -> str | None:
+        """Return the single closest name to ``query`` or ``None``."""
+        hits = self.search(query, k=1, kind=kind, min_score=min_score)
+        return hits[0][0] if hits else None
+
+    # ------------------------------------------------------------------
+    def save(self, path: str | Path) -> None:
+        """Write the index to ``path`` as a NumPy ``.npz`` archive."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        grams = np.array(list(self._grams), dtype=str)
+        with open(path, "wb") as fh:
+            np.savez(
+                fh,
+                names=self.names,
+                kinds=self.kinds,
+                sizes=self.sizes,
+                grams=grams,
+                offsets=self._offsets,
+                ids=self._ids,
+            )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "NameIndex":
+        """Return the index stored at ``path``."""
+        with np.load(path, allow_pickle=False) as data:
+            index = cls.__new__(cls)
+            index.names = data["names"]
+            index.kinds = data["kinds"]
+            index.sizes = data["sizes"]
+            offsets = data["offsets"]
+            index._ids = data["ids"]
+            index._offsets = offsets
+            index._grams = {str(g): (offsets[i], offsets[i + 1]) for i, g in enumerate(data["grams"])}
+        return index
+
+
+def build_name_index(catalog: CardCatalog | None, lang: str = "en") -> NameIndex:
+    """Return an index of the card names of ``catalog`` and all set names."""
+    from scanner.set_mapping import SET_NAMES
+
+    cards = catalog.card_names(lang) if catalog is not None else []
+    sets = sorted({name for names in SET_NAMES.values() for name in names})
+    return NameIndex(cards + sets, [CARD] * len(cards) + [SET] * len(sets))
+
+
+def index_path(catalog: CardCatalog, lang: str = "en") -> Path:
+    """Return where the name index of ``catalog`` for ``lang`` is stored."""
+    return catalog.path.with_name(f"{catalog.path.stem}.names-{lang}.npz")
+
+
+_indexes: dict[tuple[Path, str], NameIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def clear_name_indexes() -> None:
+    """Forget the loaded indexes so the next lookup checks the catalog again."""
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def get_name_index(lang: str = "en") -> NameIndex | None:
+    """Return the shared name index of the synced catalog, or ``None``.
+
+    The persisted index is reused while it is newer than the catalog file;
+    otherwise it is rebuilt and saved.
+    """
+    catalog = get_catalog()
+    if catalog is None:
+        return None
+    path = index_path(catalog, lang)
+    with _indexes_lock:
+        index = _indexes.get((path, lang))
+        if index is not None:
+            return index
+        if path.exists() and path.stat().st_mtime >= catalog.path.stat().st_mtime:
+            index = NameIndex.load(path)
+        else:
+            index = build_name_index(catalog, lang)
+            index.save(path)
+            print(f"[NAMES] Zbudowano indeks {len(index)} nazw: {path}")
+        _indexes[(path, lang)] = index
+        return index
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Build or query the fuzzy card name index")
+    parser.add_argument("command", choices=["build", "query"])
+    parser.add_argument("text", nargs="?", help="OCR text to look up")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    catalog = get_catalog()
+    if catalog is None:
+        raise SystemExit("Catalog not synced; run `python -m scanner.catalog sync` first")
+    if args.command == "build":
+        index = build_name_index(catalog, args.lang)
+        index.save(index_path(catalog, args.lang))
+        print(f"[OK] Indexed {len(index)} names")
+        return
+    index = get_name_index(args.lang)
+    for name, score in index.search(args.text or "", k=args.k):
+        print(f"{score:.2f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
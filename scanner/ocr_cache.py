@@ -0,0 +1,91 @@
+"""Persistent cache of OCR results keyed by crop content, config and engine.
+
+The key hashes the pixels of the preprocessed crop together with the
+Tesseract configuration and the engine version, so re-running the scanner
+or changing the parsing heuristics never OCRs the same crop twice, while a
+different preprocessing, whitelist or Tesseract release misses the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+import threading
+
+from PIL import Image
+
+from scanner.sqlite_cache import SQLiteCache
+
+OCR_CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "ocr_cache.sqlite"
+
+# Upper bound on cached crops; the least recently used ones are evicted.
+DEFAULT_MAX_ENTRIES = 500_000
+
+
+def crop_hash(image: Image.Image) -> str:
+    """Return the SHA-256 hex digest of the pixels of ``image``."""
+    digest = hashlib.sha256(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class OCRCache:
+    """OCR text stored per crop hash, configuration and engine version.
+
+    Entries of other engine versions are removed as soon as the cache is
+    used with a new version.
+
+    Parameters
+    ----------
+    path : Path, optional
+        SQLite file of the cache; ``":memory:"`` keeps it in process.
+    max_entries : int, optional
+        Number of crops kept before the least recently used are evicted.
+    """
+
+    def __init__(self, path: str | Path = OCR_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._path = path
+        self._max_entries = max_entries
+        self._store: SQLiteCache | None = None
+        self._version: str | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def _disk(self) -> SQLiteCache:
+        # Opened on first use so creating the shared engine touches no files.
+        with self._lock:
+            if self._store is None:
+                self._store = SQLiteCache(self._path, table="ocr", max_entries=self._max_entries)
+            return self._store
+
+    def key(self, image: Image.Image, config: str, version: str) -> str:
+        """Return the cache key of ``image`` recognised with ``config``."""
+        if version != self._version:
+            self._disk.retain_prefix(f"{version}:")
+            self._version = version
+        digest = hashlib.sha256(f"{crop_hash(image)}\0{config}".encode()).hexdigest()
+        return f"{version}:{digest}"
+
+    def get(self, key: str) -> str | None:
+        """Return the text cached under ``key`` or ``None``."""
+        return self._disk.get(key)
+
+    def put(self, key: str, text: str) -> None:
+        """Store OCR ``text`` under ``key``."""
+        self._disk.set(key, text)
+
+    def clear(self) -> None:
+        self._disk.clear()
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters, the hit rate and the number of entries."""
+        if self._store is None:
+            return {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0}
+        return self._store.stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
@@ -1,14 +1,245 @@
+"""Tesseract OCR with long-lived workers and batched requests.
+
+Starting a tesseract process per crop dominates OCR time, so crops are
+recognised in batches by :class:`OCREngine`:
+
+* with the optional ``tesserocr`` bindings every pool thread keeps its own
+  initialised Tesseract API per configuration and reuses it for all crops;
+* otherwise crops sharing a configuration are written to a list file and
+  recognised by a single ``tesseract`` process per chunk, with chunks
+  running in parallel.
+
+With an :class:`~scanner.ocr_cache.OCRCache` only crops not seen before with
+the same configuration and Tesseract version are recognised.
+"""
+
 from __future__ import annotations
 
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 import os
+from pathlib import Path
+import subprocess
+import tempfile
+import threading
+
 import pytesseract
 from PIL import Image
 
+from scanner.ocr_cache import OCRCache
+
+try:  # optional: in-process Tesseract API
+    import tesserocr
+except Exception:  # pragma: no cover - tesserocr is optional
+    tesserocr = None
+
 # Allow overriding the Tesseract executable path via environment variable.
 tesseract_cmd = os.getenv("TESSERACT_CMD") or os.getenv("TESSERACT_PATH")
 if tesseract_cmd:
     pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
+NOT_FOUND_MESSAGE = (
+    "Tesseract executable not found. Install Tesseract and add it to your PATH "
+    "or set the TESSERACT_CMD environment variable."
+)
+
+# Crops recognised by one tesseract process in the subprocess backend.
+DEFAULT_CHUNK_SIZE = 16
+
+
+def _parse_config(config: str) -> tuple[int | None, dict[str, str]]:
+    """Return the page segmentation mode and ``-c`` variables of ``config``.
+
+    Options are split on whitespace rather than shell rules so whitelists
+    may contain quote characters, as ``NAME_OCR_CONFIG`` does.
+    """
+    psm = None
+    variables: dict[str, str] = {}
+    args = config.split()
+    for i, arg in enumerate(args):
+        if arg == "--psm" and i + 1 < len(args):
+            psm = int(args[i + 1])
+        elif arg == "-c" and i + 1 < len(args) and "=" in args[i + 1]:
+            key, value = args[i + 1].split("=", 1)
+            variables[key] = value
+    return psm, variables
+
+
+class OCREngine:
+    """Pool of OCR workers recognising batches of ``(image, config)`` crops.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of worker threads; each runs one Tesseract API or process.
+    chunk_size : int, optional
+        Crops per tesseract process when ``tesserocr`` is not installed.
+    backend : str, optional
+        ``"tesserocr"`` or ``"subprocess"``; chosen automatically by default.
+    cache : OCRCache, optional
+        Cache of recognised crops; every crop is recognised when omitted.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        backend: str | None = None,
+        cache: OCRCache | None = None,
+    ):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.backend = backend or ("tesserocr" if tesserocr is not None else "subprocess")
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ocr")
+        self._local = threading.local()
+        self._apis: list = []
+        self._apis_lock = threading.Lock()
+        self._version: str | None = None
+
+    @property
+    def version(self) -> str:
+        """Return the backend and Tesseract version, used in OCR cache keys."""
+        if self._version is None:
+            try:
+                if self.backend == "tesserocr":
+                    release = tesserocr.tesseract_version().splitlines()[0]
+                else:
+                    release = str(pytesseract.get_tesseract_version())
+            except Exception:
+                release = "unknown"
+            self._version = f"{self.backend}-{release}"
+        return self._version
+
+    # ------------------------------------------------------------------
+    def _api(self, config: str):
+        """Return this thread's Tesseract API set up for ``config``."""
+        apis = getattr(self._local, "apis", None)
+        if apis is None:
+            apis = self._local.apis = {}
+        api = apis.get(config)
+        if api is None:
+            psm, variables = _parse_config(config)
+            api = tesserocr.PyTessBaseAPI()
+            if psm is not None:
+                api.SetPageSegMode(psm)
+            for key, value in variables.items():
+                api.SetVariable(key, value)
+            apis[config] = api
+            with self._apis_lock:
+                self._apis.append(api)
+        return api
+
+    def _recognise_api(self, crops: list[Image.Image], config: str) -> list[str]:
+        api = self._api(config)
+        texts = []
+        for image in crops:
+            api.SetImage(image)
+            texts.append(api.GetUTF8Text())
+        return texts
+
+    def _recognise_process(self, crops: list[Image.Image], config: str) -> list[str]:
+        """Recognise ``crops`` with one tesseract process reading a list file."""
+        with tempfile.TemporaryDirectory(prefix="ocr") as tmp:
+            paths = []
+            for i, image in enumerate(crops):
+                path = Path(tmp) / f"{i}.png"
+                image.save(path)
+                paths.append(str(path))
+            listing = Path(tmp) / "crops.txt"
+            listing.write_text("\n".join(paths) + "\n", encoding="utf-8")
+            cmd = [pytesseract.pytesseract.tesseract_cmd, str(listing), "stdout", *config.split()]
+            try:
+                proc = subprocess.run(cmd, capture_output=True, check=True)
+            except FileNotFoundError as exc:
+                raise RuntimeError(NOT_FOUND_MESSAGE) from exc
+        # Tesseract ends the text of every page with a form feed.
+        pages = proc.stdout.decode("utf-8", errors="replace").split("\f")
+        return (pages + [""] * len(crops))[: len(crops)]
+
+    def _recognise(self, crops: list[Image.Image], config: str) -> list[str]:
+        if self.backend == "tesserocr":
+            return self._recognise_api(crops, config)
+        return self._recognise_process(crops, config)
+
+    # ------------------------------------------------------------------
+    def extract_texts(self, items: Sequence[tuple[Image.Image, str]]) -> list[str]:
+        """Return the text of every ``(image, config)`` pair in input order."""
+        texts = [""] * len(items)
+        keys: list[str | None] = [None] * len(items)
+        pending = range(len(items))
+        if self.cache is not None:
+            pending = []
+            for idx, (image, config) in enumerate(items):
+                keys[idx] = self.cache.key(image, config, self.version)
+                cached = self.cache.get(keys[idx])
+                if cached is None:
+                    pending.append(idx)
+                else:
+                    texts[idx] = cached
+
+        groups: dict[str, list[int]] = {}
+        for idx in pending:
+            groups.setdefault(items[idx][1], []).append(idx)
+        jobs = []
+        for config, indices in groups.items():
+            for start in range(0, len(indices), self.chunk_size):
+                chunk = indices[start:start + self.chunk_size]
+                crops = [items[i][0] for i in chunk]
+                jobs.append((chunk, self._executor.submit(self._recognise, crops, config)))
+        for chunk, future in jobs:
+            for idx, text in zip(chunk, future.result()):
+                texts[idx] = text
+                if self.cache is not None:
+                    self.cache.put(keys[idx], text)
+        return texts
+
+    def metrics(self) -> dict:
+        """Return the engine setup and OCR cache statistics."""
+        return {
+            "backend": self.backend,
+            "version": self.version,
+            "workers": self.workers,
+            "cache": self.cache.stats if self.cache is not None else None,
+        }
+
+    def close(self) -> None:
+        """Stop the workers and release their Tesseract APIs and the cache."""
+        self._executor.shutdown(wait=True)
+        with self._apis_lock:
+            for api in self._apis:
+                api.End()
+            self._apis.clear()
+        if self.cache is not None:
+            self.cache.close()
+
+
+_engine: OCREngine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> OCREngine:
+    """Return the process-wide OCR engine."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = OCREngine(cache=OCRCache())
+        return _engine
+
+
+def shutdown() -> None:
+    """Close the process-wide OCR engine; the next call starts a new one."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.close()
+            _engine = None
+
+
+def extract_texts(items: Sequence[tuple[Image.Image, str]]) -> list[str]:
+    """Return raw text for each ``(image, config)`` pair using the shared engine."""
+    return get_engine().extract_texts(items)
+
 
 def extract_text(image: Image.Image, config: str = "--psm 7") -> str:
     """Return raw text from a PIL image.
@@ -18,13 +249,7 @@ def extract_text(image: Image.Image, config: str = "--psm 7") -> str:
     image : PIL.Image.Image
         Image to OCR.
     config : str, optional
-        Configuration string passed directly to ``pytesseract``.
+        Tesseract configuration string, e.g. ``"--psm 7"``.
         Defaults to ``"--psm 7"``.
     """
-    try:
-        return pytesseract.image_to_string(image, config=config)
-    except pytesseract.pytesseract.TesseractNotFoundError as exc:
-        raise RuntimeError(
-            "Tesseract executable not found. Install Tesseract and add it to your PATH "
-            "or set the TESSERACT_CMD environment variable."
-        ) from exc
+    return extract_texts([(image, config)])[0]
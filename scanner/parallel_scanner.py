@@ -0,0 +1,123 @@
+"""Multi-process scanning with models loaded once per worker."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import os
+from pathlib import Path
+
+try:
+    import torch
+except Exception:  # pragma: no cover - torch may be missing
+    torch = None
+
+from scanner import card_scanner, enrichment, image_analyzer
+from scanner.enrichment import EnrichmentQueue
+
+# ``card_scanner`` module settings copied into every worker process.
+WORKER_SETTINGS = ("CARD_MODEL_BACKEND", "CARD_ID_MODE", "CARD_INDEX_PATH")
+
+
+def threads_per_worker(workers: int, cpu_count: int | None = None) -> int:
+    """Return torch intra-op threads for each of ``workers`` processes."""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    return max(1, cpu_count // max(1, workers))
+
+
+def _init_worker(threads: int, multihead: bool, settings: dict) -> None:
+    """Limit torch threads and load the models used by this worker."""
+    if torch:
+        torch.set_num_threads(threads)
+    for name, value in settings.items():
+        setattr(card_scanner, name, value)
+    try:
+        if multihead:
+            card_scanner.multihead_model.load()
+        else:
+            card_scanner._load_card_classifier()
+    except Exception as exc:  # pragma: no cover - surfaced again when scanning
+        print(f"[WORKER] Model preload failed: {exc}")
+    if not multihead:
+        try:
+            image_analyzer.load_type_model(card_scanner.TYPE_MODEL_PATH)
+        except card_scanner.TYPE_MODEL_ERRORS as exc:
+            print(f"[WORKER] Type model preload failed: {exc}")
+
+
+def _scan_chunk(paths: list[Path], multihead: bool) -> list[dict]:
+    """Scan the batch ``paths`` inside a worker process, without card lookups."""
+    return card_scanner.scan_batch(paths, multihead=multihead, enrich=False)
+
+
+def scan_files_parallel(
+    files: list[Path],
+    workers: int | None = None,
+    progress_callback: Callable[[int, int], None] | None = None,
+    batch_size: int = card_scanner.DEFAULT_BATCH_SIZE,
+    multihead: bool = False,
+    enrichment_queue: EnrichmentQueue | None = None,
+) -> list:
+    """Scan ``files`` across ``workers`` processes.
+
+    Files are split into batches of ``batch_size``; each worker runs the
+    batched scan engine with its share of torch threads. Results are merged
+    back in input order. As in the serial path, a batch is scanned in one
+    forward pass, so ``progress_callback`` is called once per file, with the
+    number of finished files and the total, when its batch completes.
+
+    Workers never look up card details: lookups are per process, so the
+    same card in two batches would be requested twice. The parent instead
+    resolves the card IDs of each finished batch it has not seen before, or
+    queues the rows on ``enrichment_queue`` when one is given.
+    """
+    files = list(files)
+    total = len(files)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or total <= batch_size:
+        return card_scanner.scan_files(
+            files,
+            progress_callback,
+            batch_size=batch_size,
+            multihead=multihead,
+            enrichment_queue=enrichment_queue,
+        )
+
+    batch_size = max(1, batch_size)
+    chunks = [files[i:i + batch_size] for i in range(0, total, batch_size)]
+    results: list[list[dict] | None] = [None] * len(chunks)
+    cards: dict[str, dict | None] = {}
+    done = 0
+    # ``spawn`` avoids forking a process whose torch thread pool is running.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(
+            threads_per_worker(workers),
+            multihead,
+            {name: getattr(card_scanner, name) for name in WORKER_SETTINGS},
+        ),
+    ) as executor:
+        futures = {
+            executor.submit(_scan_chunk, chunk, multihead): idx
+            for idx, chunk in enumerate(chunks)
+        }
+        for future in as_completed(futures):
+            idx = futures[future]
+            results[idx] = rows = future.result()
+            if enrichment_queue is not None:
+                enrichment_queue.submit(rows)
+            else:
+                new = list(dict.fromkeys(row["CardID"] for row in rows if row["CardID"] not in cards))
+                cards.update(card_scanner.query_cards_by_id(new))
+                for row in rows:
+                    enrichment.fill_row(row, cards[row["CardID"]])
+            if progress_callback:
+                for _ in chunks[idx]:
+                    done += 1
+                    progress_callback(done, total)
+
+    return [row for chunk in results for row in chunk or []]
@@ -0,0 +1,77 @@
+"""Shared image decoding and model input preprocessing.
+
+All prediction paths go through :func:`load_tensor`. JPEG scans are decoded
+with DCT scaling (``Image.draft``) straight to the smallest scale that is
+still at least the model input size, so a 600 dpi scan is never fully
+decoded just to be shrunk to 64x64. Recently decoded tensors are kept in a
+small cache so the card ID and type models share one decode per image.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+import threading
+
+from PIL import Image
+
+try:
+    import torch
+    from torchvision import transforms
+except Exception:  # pragma: no cover - torch may be missing
+    torch = None
+    transforms = None
+
+from scanner.classifier import INPUT_SIZE
+
+# Number of decoded tensors kept for reuse between models.
+TENSOR_CACHE_SIZE = 64
+
+_tensor_cache: OrderedDict[tuple, "torch.Tensor"] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def open_rgb(path: str | Path, size: tuple[int, int] = INPUT_SIZE) -> Image.Image:
+    """Return ``path`` decoded as RGB at reduced resolution when possible.
+
+    For JPEG files only the DCT scale needed to cover ``size`` is decoded;
+    other formats are decoded in full.
+    """
+    img = Image.open(path)
+    img.draft("RGB", size)
+    return img.convert("RGB")
+
+
+def to_tensor(img: Image.Image, size: tuple[int, int] = INPUT_SIZE) -> "torch.Tensor":
+    """Return ``img`` resized to ``size`` as a CHW float tensor."""
+    if not torch:
+        raise ImportError("PyTorch is required for prediction")
+    transform = transforms.Compose([transforms.Resize(size), transforms.ToTensor()])
+    return transform(img)
+
+
+def load_tensor(path: str | Path, size: tuple[int, int] = INPUT_SIZE) -> "torch.Tensor":
+    """Return the model input tensor for the image at ``path``.
+
+    The result is cached per file path, modification time and ``size``, so
+    repeated calls for the same image do not decode it again.
+    """
+    path = Path(path)
+    key = (str(path.resolve()), path.stat().st_mtime_ns, tuple(size))
+    with _cache_lock:
+        tensor = _tensor_cache.get(key)
+        if tensor is not None:
+            _tensor_cache.move_to_end(key)
+            return tensor
+    tensor = to_tensor(open_rgb(path, size), size)
+    with _cache_lock:
+        _tensor_cache[key] = tensor
+        while len(_tensor_cache) > TENSOR_CACHE_SIZE:
+            _tensor_cache.popitem(last=False)
+    return tensor
+
+
+def clear_cache() -> None:
+    """Forget all cached tensors."""
+    with _cache_lock:
+        _tensor_cache.clear()
@@ -0,0 +1,212 @@
+"""Rate limiting, circuit breaking and latency metrics for the card API.
+
+:class:`AdaptiveRateLimiter` is a token bucket whose rate follows AIMD:
+it grows slowly while responses are fast and halves on errors or slow
+responses. :class:`CircuitBreaker` stops calling the API altogether after
+repeated failures so lookups fall back to local data immediately instead of
+each waiting for its own timeout.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable
+import threading
+import time
+
+import requests
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class AdaptiveRateLimiter:
+    """Token bucket with additive-increase/multiplicative-decrease rate.
+
+    Parameters
+    ----------
+    rate : float, optional
+        Initial number of requests per second.
+    min_rate, max_rate : float, optional
+        Bounds of the adapted rate.
+    burst : float, optional
+        Bucket capacity, i.e. requests allowed back to back.
+    increase : float, optional
+        Requests per second added over one second of successful responses.
+    decrease : float, optional
+        Factor applied to the rate after a failure or slow response.
+    latency_target : float, optional
+        Responses slower than this many seconds count as congestion.
+    clock, sleep : callable, optional
+        Monotonic time source and sleep function; replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        burst: float = 10.0,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_target: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = max(1.0, burst)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; return the time waited."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            self.sleep(wait)
+        return wait
+
+    def on_success(self, latency: float) -> None:
+        if latency > self.latency_target:
+            self.on_failure()
+            return
+        with self._lock:
+            # About ``increase`` more requests per second after each second
+            # of successful traffic at the current rate.
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_failure(self) -> None:
+        with self._lock:
+            now = self.clock()
+            # Requests already in flight fail together; back off once per burst.
+            if now - self._last_decrease < 1.0 / self.rate:
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+
+
+class CircuitBreaker:
+    """Stop calling a failing service and probe it again after a pause.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    :meth:`allow` returns ``False`` for ``reset_timeout`` seconds. Then a
+    single probe request is let through (half-open); its outcome closes the
+    breaker or opens it again. ``clock`` is the monotonic time source.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if self.clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._state = CLOSED
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opened += 1
+                    print(f"[API] Circuit breaker open after {self.failures} failures")
+                self._state = OPEN
+                self._opened_at = self.clock()
+                self._probing = False
+
+
+class LatencyHistogram:
+    """Cumulative request latency histogram with fixed bucket bounds."""
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding quantile ``q``."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q * self.count
+            seen = 0
+            for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+                seen += count
+                if seen >= rank:
+                    return bound
+        return float("inf")  # pragma: no cover
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"<={b:g}s" for b in self.buckets] + [f">{self.buckets[-1]:g}s"]
+            data = {
+                "count": self.count,
+                "mean_s": self.total / self.count if self.count else 0.0,
+                "buckets": dict(zip(labels, self.counts)),
+            }
+        data["p50_s"] = self.quantile(0.5)
+        data["p95_s"] = self.quantile(0.95)
+        return data
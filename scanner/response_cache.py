@@ -0,0 +1,147 @@
+"""Two-tier cache of TCGdex API responses.
+
+Decoded JSON bodies are kept in an in-memory LRU in front of a persistent
+:class:`~scanner.sqlite_cache.SQLiteCache`, keyed by request URL (which holds
+the endpoint and language) and query parameters. Lookups that found nothing
+are cached as well, but with a shorter TTL so newly released cards appear
+soon after they are added to the API.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+import threading
+import time
+from typing import Any
+from urllib.parse import urlencode
+
+from scanner.sqlite_cache import SQLiteCache
+
+RESPONSE_CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "tcgdex_responses.sqlite"
+
+# Card data practically never changes once published.
+DEFAULT_TTL = 7 * 24 * 60 * 60
+# Unknown cards and empty searches are retried after an hour.
+DEFAULT_NEGATIVE_TTL = 60 * 60
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """Memory LRU backed by SQLite with separate positive and negative TTLs.
+
+    Parameters
+    ----------
+    path : Path, optional
+        SQLite file of the persistent tier; ``":memory:"`` keeps everything
+        in process.
+    ttl : float, optional
+        Lifetime in seconds of cached responses.
+    negative_ttl : float, optional
+        Lifetime in seconds of cached "not found" results.
+    memory_size : int, optional
+        Number of responses held in the in-memory tier.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = RESPONSE_CACHE_PATH,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        memory_size: int = 2048,
+        max_entries: int = 200_000,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory_size = memory_size
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._path = path
+        self._max_entries = max_entries
+        self._store: SQLiteCache | None = None
+
+    @property
+    def _disk(self) -> SQLiteCache:
+        # Opened on first use so merely creating a client touches no files.
+        with self._lock:
+            if self._store is None:
+                self._store = SQLiteCache(self._path, table="responses", max_entries=self._max_entries)
+            return self._store
+
+    @staticmethod
+    def key(url: str, params: dict | None = None) -> str:
+        """Return the cache key of a request."""
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted((k, str(v)) for k, v in params.items()))}"
+
+    def _remember(self, key: str, value: Any, expires: float) -> None:
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return ``(found, value)`` for ``key``.
+
+        ``value`` is ``None`` for a cached "not found" result.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self.negative_hits += entry[1] is None
+                return True, entry[1]
+        record = self._disk.get(key, _MISSING)
+        with self._lock:
+            if record is _MISSING:
+                self._memory.pop(key, None)
+                self.misses += 1
+                return False, None
+            expires, value = record
+            self._remember(key, value, expires)
+            self.disk_hits += 1
+            self.negative_hits += value is None
+            return True, value
+
+    def set(self, key: str, value: Any, negative: bool = False) -> None:
+        """Store ``value`` for ``key``.
+
+        ``negative`` results (and ``value`` of ``None``) use ``negative_ttl``.
+        """
+        ttl = self.negative_ttl if negative or value is None else self.ttl
+        expires = time.time() + ttl
+        with self._lock:
+            self._remember(key, value, expires)
+        self._disk.set(key, [expires, value], ttl=ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        self._disk.clear()
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters per tier and the overall hit rate."""
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": len(self._store) if self._store is not None else 0,
+        }
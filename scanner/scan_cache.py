@@ -0,0 +1,74 @@
+"""Persistent cache of scan results keyed by image content and model version."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from scanner.sqlite_cache import SQLiteCache
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "scan_cache.sqlite"
+
+# Upper bound on cached scan rows; the least recently used rows are evicted.
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+def file_hash(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of the file at ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_version(*parts: str | Path) -> str:
+    """Return a short version string for model files and settings.
+
+    Paths contribute their size and modification time, so replacing a
+    checkpoint yields a new version. Other values are used as they are.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, Path):
+            if part.exists():
+                stat = part.stat()
+                digest.update(f"{part.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+            else:
+                digest.update(f"{part}:missing".encode())
+        else:
+            digest.update(str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+class ScanCache:
+    """Scan rows stored per image content hash and model version.
+
+    The version is part of every key, so a retrained checkpoint never
+    serves stale predictions. Rows of all versions are kept side by side,
+    so single-head and multi-head scans can alternate on one cache; rows of
+    versions no longer in use are evicted as least recently used.
+    """
+
+    def __init__(self, path: str | Path = CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._store = SQLiteCache(path, table="scans", max_entries=max_entries)
+
+    def key(self, image_path: str | Path, version: str) -> str:
+        """Return the cache key of ``image_path`` scanned with ``version``."""
+        return f"{version}:{file_hash(image_path)}"
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached row stored under ``key`` or ``None``."""
+        return self._store.get(key)
+
+    def put(self, key: str, row: dict) -> None:
+        """Store scan ``row`` under ``key``."""
+        self._store.set(key, row)
+
+    @property
+    def stats(self) -> dict[str, float]:
+        return self._store.stats
+
+    def close(self) -> None:
+        self._store.close()
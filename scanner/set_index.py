@@ -0,0 +1,102 @@
+"""Cached TCGdex set list indexed by card count.
+
+The ``/sets`` listing changes only when a new expansion is released, so it
+is kept in memory and in a JSON file on disk and refreshed after ``ttl``
+seconds. Lookups of sets by their printed card count use a precomputed
+``total -> [set_id]`` dictionary instead of scanning the list.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+import json
+from pathlib import Path
+import threading
+import time
+
+from scanner.tcgdex_client import get_client
+
+SET_LIST_CACHE = Path(__file__).resolve().parent.parent / "data" / "tcgdex_sets.json"
+SET_LIST_TTL = 24 * 60 * 60
+
+
+def _totals(data: dict) -> set[str]:
+    """Return the card counts a set may be printed with."""
+    counts = data.get("cardCount") if isinstance(data.get("cardCount"), dict) else {}
+    values = {data.get("total"), counts.get("total"), counts.get("official")}
+    return {str(v) for v in values if v is not None}
+
+
+class SetIndex:
+    """Set list of one TCGdex endpoint with a lookup by card count.
+
+    Parameters
+    ----------
+    url : str
+        Address of the ``/sets`` listing.
+    cache_path : Path, optional
+        JSON file the listing is persisted to between runs.
+    ttl : float, optional
+        Age in seconds after which the listing is downloaded again.
+    """
+
+    def __init__(self, url: str, cache_path: str | Path = SET_LIST_CACHE, ttl: float = SET_LIST_TTL):
+        self.url = url
+        self.cache_path = Path(cache_path)
+        self.ttl = ttl
+        self.fetched = 0.0
+        self._by_total: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+
+    def _index(self, sets: list[dict], fetched: float) -> None:
+        by_total: dict[str, list[str]] = defaultdict(list)
+        for data in sets:
+            if not data.get("id"):
+                continue
+            for total in _totals(data):
+                by_total[total].append(data["id"])
+        self._by_total = dict(by_total)
+        self.fetched = fetched
+
+    def _read_disk(self) -> bool:
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if data.get("url") != self.url or time.time() - data.get("fetched", 0) > self.ttl:
+            return False
+        self._index(data.get("sets") or [], data["fetched"])
+        return True
+
+    def refresh(self) -> None:
+        """Download the set list and persist it to ``cache_path``."""
+        sets = get_client().get_json(self.url, timeout=10, cached=False)
+        fetched = time.time()
+        self._index(sets, fetched)
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"url": self.url, "fetched": fetched, "sets": sets}), encoding="utf-8")
+            tmp.replace(self.cache_path)
+        except OSError as exc:  # pragma: no cover - read-only data directory
+            print(f"[TCGdex] Could not store set list: {exc}")
+
+    def set_ids(self, total: str | int) -> list[str]:
+        """Return identifiers of sets printed with ``total`` cards."""
+        with self._lock:
+            if time.time() - self.fetched > self.ttl and not self._read_disk():
+                self.refresh()
+            return list(self._by_total.get(str(total).lstrip("0") or "0", []))
+
+
+_indexes: dict[str, SetIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_set_index(url: str) -> SetIndex:
+    """Return the shared :class:`SetIndex` for ``url``."""
+    with _indexes_lock:
+        index = _indexes.get(url)
+        if index is None:
+            index = _indexes[url] = SetIndex(url)
+        return index
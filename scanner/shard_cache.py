@@ -0,0 +1,236 @@
+"""Preprocessed training images stored as memory-mapped NumPy shards.
+
+Decoding and resizing every JPEG of ``data/card_dataset`` for every epoch
+makes training I/O bound. :func:`build_shards` decodes an ``ImageFolder``
+style directory once into ``uint8`` arrays of shape ``(N, H, W, 3)`` written
+as ``.npy`` shards, and records every image in a JSON manifest with its
+content hash, shard row and class. :class:`ShardDataset` memory-maps the
+shards, so epochs only copy ready-made pixels.
+
+Later builds reuse all rows whose source file is unchanged and decode only
+added or modified scans; changing the input size rebuilds everything::
+
+    python -m scanner.shard_cache data/card_dataset
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from PIL import Image
+
+try:
+    import torch
+except Exception:  # pragma: no cover - torch may be missing
+    torch = None
+
+from scanner.classifier import INPUT_SIZE
+from scanner.preprocessing import open_rgb
+from scanner.scan_cache import file_hash
+
+SHARD_ROOT = Path(__file__).resolve().parent.parent / "data" / "shards"
+MANIFEST_NAME = "manifest.json"
+
+# Images per shard file.
+SHARD_SIZE = 4096
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+# Bumped whenever the decoding below changes, invalidating existing shards.
+_TRANSFORM_VERSION = 1
+
+
+def transform_key(size: tuple[int, int] = INPUT_SIZE) -> str:
+    """Return the manifest key of the preprocessing applied for ``size``."""
+    return f"v{_TRANSFORM_VERSION}-draft-bilinear-{size[0]}x{size[1]}"
+
+
+def shard_dir(dataset_dir: str | Path) -> Path:
+    """Return the default shard directory of ``dataset_dir``."""
+    dataset_dir = Path(dataset_dir).resolve()
+    digest = hashlib.sha256(str(dataset_dir).encode()).hexdigest()[:8]
+    return SHARD_ROOT / f"{dataset_dir.name}-{digest}"
+
+
+def decode(path: str | Path, size: tuple[int, int] = INPUT_SIZE) -> np.ndarray:
+    """Return the image at ``path`` as a ``(H, W, 3)`` uint8 array.
+
+    Matches ``transforms.Resize(size)`` applied to :func:`open_rgb`, the
+    preprocessing of the prediction path.
+    """
+    height, width = size
+    return np.asarray(open_rgb(path, size).resize((width, height), Image.BILINEAR))
+
+
+def _load_manifest(cache_dir: Path) -> dict:
+    try:
+        return json.loads((cache_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _scan_folder(dataset_dir: Path) -> list[tuple[str, str]]:
+    """Return ``(relative path, class)`` of every image in ``dataset_dir``."""
+    files = []
+    for class_dir in sorted(p for p in dataset_dir.iterdir() if p.is_dir()):
+        for path in sorted(class_dir.rglob("*")):
+            if path.suffix.lower() in IMAGE_SUFFIXES and path.is_file():
+                files.append((path.relative_to(dataset_dir).as_posix(), class_dir.name))
+    return files
+
+
+def build_shards(
+    dataset_dir: str | Path,
+    cache_dir: str | Path | None = None,
+    size: tuple[int, int] = INPUT_SIZE,
+    shard_size: int = SHARD_SIZE,
+    workers: int | None = None,
+) -> dict[str, int]:
+    """Create or update the shards of the ``ImageFolder`` at ``dataset_dir``.
+
+    Files whose size and modification time are unchanged are trusted
+    without rehashing; others are rehashed and only decoded again when
+    their content changed. Shards no longer referenced are deleted.
+
+    Returns counts of ``reused``, ``added`` and ``removed`` images.
+    """
+    dataset_dir = Path(dataset_dir)
+    cache_dir = Path(cache_dir) if cache_dir is not None else shard_dir(dataset_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = transform_key(size)
+    manifest = _load_manifest(cache_dir)
+    old = manifest.get("entries", {}) if manifest.get("transform") == key else {}
+
+    entries: dict[str, dict] = {}
+    pending: list[tuple[str, str, str, os.stat_result]] = []
+    for rel, label in _scan_folder(dataset_dir):
+        stat = (dataset_dir / rel).stat()
+        entry = old.get(rel)
+        if entry and (entry["bytes"], entry["mtime"]) == (stat.st_size, stat.st_mtime_ns):
+            entries[rel] = {**entry, "class": label}
+            continue
+        digest = file_hash(dataset_dir / rel)
+        if entry and entry["hash"] == digest:
+            entries[rel] = {**entry, "class": label, "bytes": stat.st_size, "mtime": stat.st_mtime_ns}
+        else:
+            pending.append((rel, label, digest, stat))
+
+    shard_ids = [int(p.stem.split("-")[1]) for p in cache_dir.glob("shard-*.npy")]
+    next_id = max(shard_ids, default=-1) + 1
+    height, width = size
+    with ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1)) as pool:
+        for start in range(0, len(pending), shard_size):
+            chunk = pending[start:start + shard_size]
+            name = f"shard-{next_id:05d}.npy"
+            array = np.lib.format.open_memmap(
+                cache_dir / name, mode="w+", dtype=np.uint8, shape=(len(chunk), height, width, 3)
+            )
+            paths = [dataset_dir / rel for rel, *_ in chunk]
+            for row, pixels in enumerate(pool.map(lambda p: decode(p, size), paths)):
+                array[row] = pixels
+            array.flush()
+            del array
+            for row, (rel, label, digest, stat) in enumerate(chunk):
+                entries[rel] = {
+                    "hash": digest,
+                    "bytes": stat.st_size,
+                    "mtime": stat.st_mtime_ns,
+                    "shard": name,
+                    "row": row,
+                    "class": label,
+                }
+            next_id += 1
+
+    manifest = {"transform": key, "size": list(size), "entries": entries}
+    tmp = cache_dir / f"{MANIFEST_NAME}.tmp"
+    tmp.write_text(json.dumps(manifest), encoding="utf-8")
+    tmp.replace(cache_dir / MANIFEST_NAME)
+
+    used = {entry["shard"] for entry in entries.values()}
+    for path in cache_dir.glob("shard-*.npy"):
+        if path.name not in used:
+            path.unlink()
+    return {
+        "reused": len(entries) - len(pending),
+        "added": len(pending),
+        "removed": len(set(old) - set(entries)),
+    }
+
+
+class ShardDataset(torch.utils.data.Dataset if torch else object):
+    """Dataset of ``(image tensor, class index)`` read from shard files.
+
+    Like ``ImageFolder`` it exposes the sorted class names as ``classes``,
+    so it can be passed straight to :meth:`CardClassifier.fit`. Shards are
+    memory-mapped lazily in every loader worker.
+    """
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+        manifest = _load_manifest(self.cache_dir)
+        if not manifest:
+            raise FileNotFoundError(f"No shard manifest in {self.cache_dir}")
+        entries = [manifest["entries"][rel] for rel in sorted(manifest["entries"])]
+        self.classes = sorted({entry["class"] for entry in entries})
+        class_to_idx = {c: i for i, c in enumerate(self.classes)}
+        self.shards = sorted({entry["shard"] for entry in entries})
+        shard_idx = {name: i for i, name in enumerate(self.shards)}
+        self.locations = np.array(
+            [(shard_idx[e["shard"]], e["row"]) for e in entries], dtype=np.int64
+        ).reshape(-1, 2)
+        self.targets = [class_to_idx[e["class"]] for e in entries]
+        self._arrays: dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def __getstate__(self) -> dict:
+        # Workers map the shards themselves instead of receiving copies.
+        return {**self.__dict__, "_arrays": {}}
+
+    def _shard(self, idx: int) -> np.ndarray:
+        array = self._arrays.get(idx)
+        if array is None:
+            array = self._arrays[idx] = np.load(self.cache_dir / self.shards[idx], mmap_mode="r")
+        return array
+
+    def __getitem__(self, idx: int):
+        shard, row = self.locations[idx]
+        pixels = torch.from_numpy(np.array(self._shard(int(shard))[row]))
+        return pixels.permute(2, 0, 1).float().div_(255), self.targets[idx]
+
+
+def prepare_dataset(dataset_dir: str | Path, size: tuple[int, int] = INPUT_SIZE) -> ShardDataset:
+    """Update the shards of ``dataset_dir`` and return them as a dataset."""
+    cache_dir = shard_dir(dataset_dir)
+    counts = build_shards(dataset_dir, cache_dir, size)
+    print(
+        f"[SHARDS] {dataset_dir}: {counts['reused']} z cache, "
+        f"{counts['added']} nowych, {counts['removed']} usuniętych"
+    )
+    return ShardDataset(cache_dir)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Preprocess a training image folder into shards")
+    parser.add_argument("dataset_dir")
+    parser.add_argument("--cache-dir", help="Output directory (default: data/shards/<name>)")
+    parser.add_argument("--size", type=int, nargs=2, default=list(INPUT_SIZE), metavar=("H", "W"))
+    args = parser.parse_args()
+
+    counts = build_shards(args.dataset_dir, args.cache_dir, tuple(args.size))
+    print(f"[OK] {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Small persistent key/value cache backed by SQLite.
+
+Values are stored as JSON. Entries may carry a time-to-live and the table is
+kept below ``max_entries`` by evicting the least recently used rows.
+
+The row count is tracked in memory, so inserts only touch the LRU index once
+the table is full, and access times of hits are written in batches instead
+of committing on every read.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Any
+
+# Hits whose access time is buffered before it is written to the table.
+TOUCH_BATCH = 256
+
+# Inserts between sweeps of expired rows, which also resync the row count.
+PURGE_INTERVAL = 1024
+
+
+class SQLiteCache:
+    """Size-bounded LRU cache stored in a single SQLite table."""
+
+    def __init__(self, path: str | Path, table: str = "cache", max_entries: int = 100_000):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.path = Path(path)
+        self.table = table
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}
+        self._count: int | None = None
+        self._inserts = 0
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "accessed REAL NOT NULL, expires REAL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table}(accessed)")
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value stored for ``key`` or ``default`` if absent or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._delete(key)
+                    self._conn.commit()
+                self.misses += 1
+                return default
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH:
+                self._flush_touched()
+                self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` for ``key``, expiring after ``ttl`` seconds if given."""
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            exists = self._conn.execute(
+                f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, accessed, expires) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, expires),
+            )
+            self._touched.pop(key, None)
+            if self._count is not None and exists is None:
+                self._count += 1
+            self._inserts += 1
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._delete(key)
+            self._conn.commit()
+
+    def retain_prefix(self, prefix: str) -> int:
+        """Delete all entries whose key does not start with ``prefix``.
+
+        Returns the number of deleted rows.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE substr(key, 1, ?) != ?", (len(prefix), prefix)
+            )
+            self._conn.commit()
+            self._count = None
+            return cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+            self._touched.clear()
+            self._count = 0
+
+    def flush(self) -> None:
+        """Write the buffered access times of recent hits."""
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    def _delete(self, key: str) -> None:
+        cur = self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        self._touched.pop(key, None)
+        if self._count is not None:
+            self._count -= cur.rowcount
+
+    def _flush_touched(self) -> None:
+        if self._touched:
+            self._conn.executemany(
+                f"UPDATE {self.table} SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        """Drop expired rows and the least recently used rows over the limit.
+
+        Expired rows are swept every ``PURGE_INTERVAL`` inserts; the LRU
+        index is only consulted when the tracked count exceeds the limit.
+        """
+        if self._count is None or self._inserts >= PURGE_INTERVAL:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE expires IS NOT NULL AND expires <= ?", (time.time(),)
+            )
+            self._count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            self._inserts = 0
+        excess = self._count - self.max_entries
+        if excess > 0:
+            self._flush_touched()
+            cur = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+            self._count -= cur.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters and the hit rate."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self),
+        }
@@ -0,0 +1,281 @@
+"""Shared HTTP client for the TCGdex API.
+
+All requests go through one :class:`requests.Session` so connections (and
+their TLS handshakes) are reused. Batches of requests run on a bounded
+thread pool so enrichment of a scan batch overlaps instead of waiting for
+each card in turn, while the pool size caps concurrent load on the API.
+Decoded responses are cached by :class:`~scanner.response_cache.ResponseCache`
+so repeated lookups of the same card do not reach the network. The shared
+client also paces requests with an adaptive rate limiter and stops sending
+them while its circuit breaker is open (see :mod:`scanner.rate_limit`).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import random
+import threading
+import time
+from typing import TypeVar
+
+import requests
+
+from scanner.rate_limit import (
+    OPEN,
+    AdaptiveRateLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyHistogram,
+)
+from scanner.response_cache import ResponseCache
+
+try:  # connection pool sizing
+    from requests.adapters import HTTPAdapter
+except Exception:  # pragma: no cover - stubbed requests in tests
+    HTTPAdapter = None
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Responses worth retrying: rate limiting and transient server errors.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TCGdexClient:
+    """Pooled, concurrency-limited HTTP client.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Maximum number of requests in flight at once.
+    timeout : float, optional
+        Connect and read timeout of a single request in seconds.
+    retries : int, optional
+        Extra attempts after a connection error, timeout or retryable status.
+    backoff : float, optional
+        Base delay in seconds; attempt ``n`` waits about ``backoff * 2**n``
+        with random jitter so parallel retries do not arrive together.
+    max_backoff : float, optional
+        Upper bound in seconds on any single wait, including one requested
+        by the server through ``Retry-After``.
+    cache : ResponseCache, optional
+        Cache consulted by :meth:`get_json`; ``None`` disables caching.
+    limiter : AdaptiveRateLimiter, optional
+        Paces requests and adapts its rate to latency and errors.
+    breaker : CircuitBreaker, optional
+        Fails requests with :class:`CircuitOpenError` while the API is down.
+    clock, sleep : callable, optional
+        Time source for request latencies and sleep function for retry
+        waits; replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        timeout: float = 5.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        cache: ResponseCache | None = None,
+        limiter: AdaptiveRateLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.cache = cache
+        self.limiter = limiter
+        self.breaker = breaker
+        self.clock = clock
+        self.sleep = sleep
+        self.latency = LatencyHistogram()
+        self.requests_sent = 0
+        self._session: requests.Session | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                if HTTPAdapter is not None:
+                    adapter = HTTPAdapter(
+                        pool_connections=self.max_workers, pool_maxsize=self.max_workers
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _delay(self, attempt: int, response: requests.Response | None = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5), self.max_backoff)
+
+    # ------------------------------------------------------------------
+    def get(self, url: str, params: dict | None = None, timeout: float | None = None) -> requests.Response:
+        """Return the response for ``url``, retrying transient failures.
+
+        Raises :class:`requests.HTTPError` for error statuses once retries
+        are exhausted, and the last connection error or timeout otherwise.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            if self.breaker is not None and not self.breaker.allow():
+                raise CircuitOpenError(f"Circuit breaker open, not requesting {url}")
+            if self.limiter is not None:
+                self.limiter.acquire()
+            with self._lock:
+                self.requests_sent += 1
+            start = self.clock()
+            try:
+                resp = self.session.get(url, params=params, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(self.clock() - start, failed=True)
+                if last or self._tripped():
+                    raise
+                self.sleep(self._delay(attempt))
+                continue
+            failed = resp.status_code in RETRY_STATUSES
+            self._record(self.clock() - start, failed)
+            if failed and not last and not self._tripped():
+                self.sleep(self._delay(attempt, resp))
+                continue
+            resp.raise_for_status()
+            return resp
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _record(self, latency: float, failed: bool) -> None:
+        self.latency.observe(latency)
+        if self.limiter is not None:
+            if failed:
+                self.limiter.on_failure()
+            else:
+                self.limiter.on_success(latency)
+        if self.breaker is not None:
+            if failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+    def _tripped(self) -> bool:
+        return self.breaker is not None and self.breaker.state == OPEN
+
+    def metrics(self) -> dict:
+        """Return request counters, breaker state, rate and latency histogram."""
+        data = {"requests_sent": self.requests_sent, "latency": self.latency.snapshot()}
+        if self.breaker is not None:
+            data["breaker"] = self.breaker.state
+        if self.limiter is not None:
+            data["rate_per_s"] = round(self.limiter.rate, 3)
+        if self.cache is not None:
+            data["cache"] = self.cache.stats
+        return data
+
+    def get_json(
+        self,
+        url: str,
+        params: dict | None = None,
+        timeout: float | None = None,
+        cached: bool = True,
+    ):
+        """Return the decoded JSON body of ``url``.
+
+        With ``cached`` the response cache is consulted first. Not found
+        responses and empty bodies are cached as negative results; a cached
+        "not found" raises :class:`requests.HTTPError` like the original.
+        """
+        if not cached or self.cache is None:
+            return self.get(url, params=params, timeout=timeout).json()
+        key = self.cache.key(url, params)
+        found, data = self.cache.get(key)
+        if found:
+            if data is None:
+                raise requests.HTTPError(f"404 Client Error: Not Found (cached) for url: {key}")
+            return data
+        try:
+            data = self.get(url, params=params, timeout=timeout).json()
+        except requests.HTTPError as exc:
+            if exc.response is not None and exc.response.status_code == 404:
+                self.cache.set(key, None)
+            raise
+        self.cache.set(key, data, negative=not data or data == {"cards": []})
+        return data
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """Return ``[fn(item) for item in items]`` evaluated concurrently.
+
+        At most ``max_workers`` calls run at once across all callers.
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        return list(self._pool().map(fn, items))
+
+    def find_first(
+        self,
+        fn: Callable[[T], R],
+        items: Iterable[T],
+        accept: Callable[[R], bool],
+    ) -> tuple[R | None, list[R]]:
+        """Evaluate ``fn`` concurrently and stop at the first accepted result.
+
+        Returns the accepted result (or ``None``) and every result collected
+        so far. Calls that have not started yet are cancelled once a result
+        is accepted.
+        """
+        futures = [self._pool().submit(fn, item) for item in items]
+        results: list[R] = []
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if accept(result):
+                    return result, results
+        finally:
+            for future in futures:
+                future.cancel()
+        return None, results
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="tcgdex"
+                )
+            return self._executor
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_client: TCGdexClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> TCGdexClient:
+    """Return the process-wide TCGdex client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = TCGdexClient(
+                cache=ResponseCache(),
+                limiter=AdaptiveRateLimiter(),
+                breaker=CircuitBreaker(),
+            )
+        return _client
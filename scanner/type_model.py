@@ -4,7 +4,6 @@ from __future__ import annotations
 
 from scanner.classifier import CardClassifier
 from torchvision import datasets, transforms
-from torch.utils.data import DataLoader
 from pathlib import Path
 import torch
 import csv
@@ -18,12 +17,13 @@ except Exception:  # pragma: no cover - torch may be missing
     transforms = None
 
 from .classifier import CardClassifier
+from .model_registry import get_classifier
+from .preprocessing import load_tensor, open_rgb
+from .shard_cache import prepare_dataset
 
 DATASET_PATH = Path(__file__).resolve().parent / "dataset.csv"
 MODEL_PATH = Path(__file__).resolve().parent / "type_model.pt"
 
-_model: CardClassifier | None = None
-
 
 def _load_dataset(csv_path: str | Path) -> tuple[list[torch.Tensor], list[str]]:
     """Return tensors and labels from ``csv_path``."""
@@ -47,35 +47,38 @@ def _load_dataset(csv_path: str | Path) -> tuple[list[torch.Tensor], list[str]]:
     return images, labels
 
 
-def train_type_classifier(dataset_dir: Path, output_model_path: Path):
-    """Train a model to classify card types (e.g. common, holo, reverse)."""
-    transform = transforms.Compose([
-        transforms.Resize((64, 64)),
-        transforms.ToTensor(),
-    ])
-    dataset = datasets.ImageFolder(dataset_dir, transform=transform)
-    loader = DataLoader(dataset, batch_size=32, shuffle=True)
-
-    X, y = [], []
-    for img, label in loader:
-        for i in range(img.size(0)):
-            X.append(img[i])
-            y.append(dataset.classes[label[i]])
-
-    clf = CardClassifier(model_name="resnet18", num_classes=len(set(y)))
-    clf.fit(X, y, epochs=5)
+def train_type_classifier(
+    dataset_dir: Path,
+    output_model_path: Path,
+    num_workers: int | None = None,
+    use_shards: bool = True,
+):
+    """Train a model to classify card types (e.g. common, holo, reverse).
+
+    Images are read from the preprocessed shards of ``dataset_dir`` (see
+    :mod:`scanner.shard_cache`), which are brought up to date first. With
+    ``use_shards=False`` they are streamed from the JPEGs by loader workers.
+    """
+    if use_shards:
+        dataset = prepare_dataset(dataset_dir)
+    else:
+        transform = transforms.Compose([
+            transforms.Resize((64, 64)),
+            transforms.ToTensor(),
+        ])
+        dataset = datasets.ImageFolder(dataset_dir, transform=transform, loader=open_rgb)
+
+    clf = CardClassifier(model_name="resnet18", num_classes=len(dataset.classes))
+    clf.fit(dataset, epochs=5, num_workers=num_workers)
     clf.save(output_model_path)
     print(f"[OK] Model zapisany do {output_model_path}")
 
 
 def _ensure_loaded(model_path: str | Path = MODEL_PATH) -> CardClassifier:
-    """Load the classifier if not already loaded."""
-    global _model
-    if _model is None:
-        if not Path(model_path).exists():
-            raise RuntimeError("Type classifier model not found")
-        _model = CardClassifier.load(model_path, device="cpu")
-    return _model
+    """Return the shared classifier from the model registry."""
+    if not Path(model_path).exists():
+        raise RuntimeError("Type classifier model not found")
+    return get_classifier(model_path)
 
 
 def predict_type(image_path: str, model_path: str | Path = MODEL_PATH) -> str:
@@ -83,10 +86,7 @@ def predict_type(image_path: str, model_path: str | Path = MODEL_PATH) -> str:
     if not torch:
         raise ImportError("PyTorch is required for prediction")
     clf = _ensure_loaded(model_path)
-    transform = transforms.Compose([transforms.Resize((64, 64)), transforms.ToTensor()])
-    img = Image.open(image_path).convert("RGB")
-    tensor = transform(img)
-    return clf.predict([tensor])[0]
+    return clf.predict([load_tensor(image_path)])[0]
 
 if __name__ == "__main__":
     dataset_path = Path("data/type_dataset")
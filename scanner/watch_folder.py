@@ -0,0 +1,323 @@
+"""Headless ingestion service scanning images dropped into a folder.
+
+The watcher notices new files through inotify when the optional
+``inotify_simple`` package is installed and falls back to polling the
+directory otherwise. A file is queued once its size and modification time
+have not changed for ``settle_seconds`` so partially written scans are never
+read. Queued files are scanned in batches and appended to the collection CSV.
+When a batch fails its files are scanned one by one; a file failing
+``max_attempts`` times is moved to the ``failed`` subfolder.
+
+Run it from the repository root::
+
+    python -m scanner.watch_folder /mnt/scanner/out --collection data/ingested_cards.csv
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from collections import deque
+from collections.abc import Callable
+import json
+from pathlib import Path
+import sys
+import threading
+import time
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:  # optional: event-driven watching on Linux
+    from inotify_simple import INotify, flags
+except Exception:  # pragma: no cover - polling fallback
+    INotify = None
+    flags = None
+
+from scanner import card_scanner
+from scanner.data_exporter import CsvAppender, read_column, read_header
+from scanner.scan_cache import ScanCache
+from scanner.tcgdex_client import get_client
+
+COLLECTION_PATH = Path(__file__).resolve().parent.parent / "data" / "ingested_cards.csv"
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+# Subfolder of the watched directory receiving files that cannot be scanned.
+QUARANTINE_DIR = "failed"
+
+
+class IngestMetrics:
+    """Counters describing the ingestion pipeline."""
+
+    def __init__(self, window: float = 60.0):
+        self.window = window
+        self.files_seen = 0
+        self.files_scanned = 0
+        self.batches = 0
+        self.errors = 0
+        self.quarantined = 0
+        self.queue_depth = 0
+        self.pending_files = 0
+        self.last_batch_seconds = 0.0
+        self.started = time.time()
+        self._completions: deque[tuple[float, int]] = deque()
+
+    def record_batch(self, size: int, seconds: float, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        self.batches += 1
+        self.files_scanned += size
+        self.last_batch_seconds = seconds
+        self._completions.append((now, size))
+
+    def throughput(self, now: float | None = None) -> float:
+        """Return scanned files per second over the last ``window`` seconds."""
+        now = time.time() if now is None else now
+        while self._completions and self._completions[0][0] < now - self.window:
+            self._completions.popleft()
+        span = min(self.window, max(now - self.started, 1e-9))
+        return sum(size for _, size in self._completions) / span
+
+    def snapshot(self, now: float | None = None) -> dict:
+        return {
+            "files_seen": self.files_seen,
+            "files_scanned": self.files_scanned,
+            "batches": self.batches,
+            "errors": self.errors,
+            "quarantined": self.quarantined,
+            "queue_depth": self.queue_depth,
+            "pending_files": self.pending_files,
+            "throughput_per_s": round(self.throughput(now), 3),
+            "last_batch_seconds": round(self.last_batch_seconds, 3),
+        }
+
+
+class FolderWatcher:
+    """Watch ``directory`` and scan new images in batches.
+
+    Parameters
+    ----------
+    directory : Path
+        Folder the scanner hardware writes images to.
+    collection_path : Path, optional
+        CSV file the scan rows are appended to. An existing file must have
+        all ``card_scanner.SCAN_FIELDS`` columns.
+    batch_size : int, optional
+        Number of files scanned together.
+    settle_seconds : float, optional
+        Time a file must stay unchanged before it is considered complete.
+    max_wait : float, optional
+        Maximum time a queued file waits for a full batch.
+    max_attempts : int, optional
+        Failed scans of a file before it is moved to ``QUARANTINE_DIR``.
+    scan : callable, optional
+        Function turning a list of paths into rows; defaults to
+        :func:`scanner.card_scanner.scan_files` with a :class:`ScanCache`.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        collection_path: str | Path = COLLECTION_PATH,
+        batch_size: int = card_scanner.DEFAULT_BATCH_SIZE,
+        settle_seconds: float = 2.0,
+        poll_interval: float = 1.0,
+        max_wait: float = 10.0,
+        max_attempts: int = 3,
+        metrics_path: str | Path | None = None,
+        scan: Callable[[list[Path]], list[dict]] | None = None,
+        use_inotify: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.collection_path = Path(collection_path)
+        header = read_header(str(self.collection_path))
+        missing = [c for c in card_scanner.SCAN_FIELDS if header is not None and c not in header]
+        if missing:
+            raise ValueError(
+                f"{self.collection_path} has no {', '.join(missing)} column(s); "
+                "use a CSV written by the scanner"
+            )
+        self.batch_size = max(1, batch_size)
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self.max_attempts = max(1, max_attempts)
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self.metrics = IngestMetrics()
+        self._scan = scan or self._default_scan
+        self._cache: ScanCache | None = None
+        self._candidates: dict[Path, tuple[int, int, float]] = {}
+        self._queue: deque[tuple[Path, float]] = deque()
+        self._failures: dict[Path, int] = {}
+        self._seen: set[str] = read_column(str(self.collection_path), "ImagePath")
+        self._listed = False
+        self._inotify = None
+        if use_inotify and INotify is not None:
+            self._inotify = INotify()
+            self._inotify.add_watch(
+                str(self.directory), flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+            )
+
+    # ------------------------------------------------------------------
+    def _default_scan(self, paths: list[Path]) -> list[dict]:
+        if self._cache is None:
+            self._cache = ScanCache()
+        return card_scanner.scan_files(paths, batch_size=self.batch_size, cache=self._cache)
+
+    def _discover(self) -> list[Path]:
+        """Return image paths that may be new.
+
+        The folder is listed in full once; afterwards inotify events are used
+        when available.
+        """
+        if self._inotify is not None and self._listed:
+            events = self._inotify.read(timeout=int(self.poll_interval * 1000))
+            return [self.directory / e.name for e in events if e.name]
+        self._listed = True
+        return sorted(p for p in self.directory.iterdir() if p.is_file())
+
+    def observe(self, paths: list[Path], now: float | None = None) -> None:
+        """Register ``paths`` as candidates and queue files that have settled."""
+        now = time.time() if now is None else now
+        for path in paths:
+            if path.suffix.lower() not in IMAGE_SUFFIXES or str(path) in self._seen:
+                continue
+            if path not in self._candidates:
+                self._candidates[path] = (-1, -1, now)
+                self.metrics.files_seen += 1
+
+        for path, (size, mtime, since) in list(self._candidates.items()):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                del self._candidates[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                self._candidates[path] = (stat.st_size, stat.st_mtime_ns, now)
+            elif stat.st_size and now - since >= self.settle_seconds:
+                del self._candidates[path]
+                self._seen.add(str(path))
+                self._queue.append((path, now))
+        self.metrics.queue_depth = len(self._queue)
+        self.metrics.pending_files = len(self._candidates)
+
+    def process(self, now: float | None = None, force: bool = False) -> int:
+        """Scan queued files whose batch is full or has waited ``max_wait``.
+
+        Returns the number of files scanned.
+        """
+        now = time.time() if now is None else now
+        scanned = 0
+        while self._queue and (
+            force
+            or len(self._queue) >= self.batch_size
+            or now - self._queue[0][1] >= self.max_wait
+        ):
+            batch = [self._queue.popleft()[0] for _ in range(min(self.batch_size, len(self._queue)))]
+            start = time.perf_counter()
+            try:
+                rows = self._scan(batch)
+            except Exception as exc:
+                print(f"[INGEST] Scan failed for {len(batch)} files: {exc}")
+                self.metrics.errors += 1
+                rows = self._scan_each(batch)
+            with CsvAppender(str(self.collection_path)) as out:
+                for row in rows:
+                    out.write(row)
+            self.metrics.record_batch(len(rows), time.perf_counter() - start, now)
+            scanned += len(rows)
+        self.metrics.queue_depth = len(self._queue)
+        return scanned
+
+    def _scan_each(self, batch: list[Path]) -> list[dict]:
+        """Return the rows of the files of ``batch`` that scan on their own."""
+        rows = []
+        for path in batch:
+            try:
+                rows.extend(self._scan([path]))
+                self._failures.pop(path, None)
+            except Exception as exc:
+                self._failed(path, exc)
+        return rows
+
+    def _failed(self, path: Path, exc: Exception) -> None:
+        """Retry ``path`` on the next full listing or quarantine it."""
+        attempts = self._failures.get(path, 0) + 1
+        if attempts < self.max_attempts:
+            print(f"[INGEST] {path.name}: {exc} (próba {attempts}/{self.max_attempts})")
+            self._failures[path] = attempts
+            self._seen.discard(str(path))
+            self._listed = False
+            return
+        self._failures.pop(path, None)
+        self.metrics.quarantined += 1
+        target = self.directory / QUARANTINE_DIR / path.name
+        try:
+            target.parent.mkdir(exist_ok=True)
+            path.replace(target)
+            print(f"[INGEST] {path.name}: {exc}; przeniesiono do {target.parent}")
+        except OSError as move_exc:
+            # Stays in ``_seen`` so it is not retried during this run.
+            print(f"[INGEST] {path.name}: {exc}; nie można przenieść: {move_exc}")
+
+    def write_metrics(self) -> None:
+        """Write the current metrics snapshot as JSON to ``metrics_path``.
+
+        Card API metrics (breaker state, rate, latency histogram) are
+        included under ``api``.
+        """
+        if self.metrics_path is None:
+            return
+        data = {**self.metrics.snapshot(), "api": get_client().metrics()}
+        self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        self.metrics_path.write_text(json.dumps(data, indent=2))
+
+    def run(self, stop: threading.Event | None = None, report_every: float = 30.0) -> None:
+        """Watch the folder until ``stop`` is set."""
+        stop = stop or threading.Event()
+        mode = "inotify" if self._inotify is not None else "polling"
+        print(f"[INGEST] Obserwuję {self.directory} ({mode})")
+        last_report = time.time()
+        self.observe(self._discover())
+        while not stop.is_set():
+            if self._inotify is None:
+                stop.wait(self.poll_interval)
+            self.observe(self._discover())
+            self.process()
+            if time.time() - last_report >= report_every:
+                print(f"[METRICS] {self.metrics.snapshot()}")
+                self.write_metrics()
+                last_report = time.time()
+        self.process(force=True)
+        self.write_metrics()
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Continuously scan images dropped into a folder")
+    parser.add_argument("directory", help="Folder watched for new scans")
+    parser.add_argument("--collection", default=str(COLLECTION_PATH))
+    parser.add_argument("--batch-size", type=int, default=card_scanner.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--settle", type=float, default=2.0, help="Seconds a file must stay unchanged")
+    parser.add_argument("--max-wait", type=float, default=10.0, help="Seconds before a partial batch is scanned")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Failed scans before a file is quarantined")
+    parser.add_argument("--metrics", help="JSON file updated with pipeline metrics")
+    parser.add_argument("--poll", action="store_true", help="Disable inotify and poll the folder")
+    args = parser.parse_args()
+
+    watcher = FolderWatcher(
+        args.directory,
+        collection_path=args.collection,
+        batch_size=args.batch_size,
+        settle_seconds=args.settle,
+        max_wait=args.max_wait,
+        max_attempts=args.max_attempts,
+        metrics_path=args.metrics,
+        use_inotify=not args.poll,
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.process(force=True)
+        watcher.write_metrics()
+
+
+if __name__ == "__main__":
+    main()
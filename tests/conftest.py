@@ -0,0 +1,97 @@
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+import pytest
+
+
+class FakeClock:
+    """Manually advanced time source; ``sleep`` advances it instantly."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.now += max(0.0, seconds)
+
+    advance = sleep
+
+
+class FakeServer:
+    """Local HTTP server answering GET requests through ``respond``.
+
+    ``respond(path, attempt)`` returns ``(status, body)`` where ``attempt``
+    counts the requests of ``path`` so far and ``body`` is sent as JSON
+    unless it is ``None``. Every request first waits ``delay`` seconds with
+    ``sleep``, which tests may replace by a :class:`FakeClock`.
+    """
+
+    def __init__(self):
+        self.respond: Callable[[str, int], tuple[int, object]] = lambda path, attempt: (404, None)
+        self.delay = 0.0
+        self.sleep: Callable[[float], None] = time.sleep
+        self.paths: list[str] = []
+        self.calls: dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def hits(self) -> int:
+        return len(self.paths)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with fake._lock:
+                    fake.paths.append(self.path)
+                    attempt = fake.calls[self.path] = fake.calls.get(self.path, 0) + 1
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                try:
+                    if fake.delay:
+                        fake.sleep(fake.delay)
+                    status, body = fake.respond(self.path, attempt)
+                    data = json.dumps(body).encode() if body is not None else b""
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fake_server():
+    server = FakeServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
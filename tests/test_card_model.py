@@ -0,0 +1,42 @@
+import numpy as np
+from PIL import Image
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from scanner import shard_cache
+from scanner.card_model import extend_card_classifier, replay_indices
+from scanner.classifier import CardClassifier
+
+
+def test_replay_indices_keeps_new_classes_and_samples_known():
+    targets = [0, 0, 0, 1, 1, 2, 2, 2]
+    classes = ["a-1", "b-2", "c-3"]
+
+    indices = replay_indices(targets, classes, {"a-1", "b-2"}, per_class=1)
+
+    picked = [targets[i] for i in indices]
+    assert picked.count(0) == 1 and picked.count(1) == 1 and picked.count(2) == 3
+
+
+def test_extend_card_classifier_adds_new_set(tmp_path, monkeypatch):
+    monkeypatch.setattr(shard_cache, "SHARD_ROOT", tmp_path / "shards")
+    rng = np.random.default_rng(0)
+    for card in ["base1-4", "base1-58", "sv1-1", "sv1-2"]:
+        for i in range(3):
+            path = tmp_path / "cards" / card / f"{i}.jpg"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            Image.fromarray(rng.integers(0, 256, (88, 63, 3), dtype=np.uint8)).save(path)
+    torch.manual_seed(0)
+    model_path = tmp_path / "card_model.pt"
+    clf = CardClassifier(device="cpu")
+    clf.fit(list(torch.rand(2, 3, 64, 64)), ["base1-4", "base1-58"])
+    clf.save(model_path)
+
+    added = extend_card_classifier(
+        tmp_path / "cards", model_path, replay_per_class=1, epochs=1, freeze_backbone=True, num_workers=0
+    )
+
+    assert added == ["sv1-1", "sv1-2"]
+    assert CardClassifier.load(model_path, device="cpu").classes_ == ["base1-4", "base1-58", "sv1-1", "sv1-2"]
+    assert extend_card_classifier(tmp_path / "cards", model_path, num_workers=0) == []
@@ -1,4 +1,7 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import threading
 import types
 import sys
 
@@ -41,8 +44,10 @@ def test_scan_image_with_api(tmp_path, monkeypatch):
     img = tmp_path / "img.jpg"
     create_dummy_image(img)
 
-    monkeypatch.setattr(card_scanner, "predict_card_id", lambda p: "base-1/102")
-    monkeypatch.setattr(card_scanner, "predict_type", lambda p: "holo")
+    decoded = []
+    monkeypatch.setattr(card_scanner, "_image_tensor", lambda p: decoded.append(p) or p)
+    monkeypatch.setattr(card_scanner, "predict_card_ids", lambda ts: ["base-1/102"] * len(ts))
+    monkeypatch.setattr(card_scanner, "predict_types", lambda ts: ["holo"] * len(ts))
 
     captured = {}
 
@@ -61,14 +66,17 @@ def test_scan_image_with_api(tmp_path, monkeypatch):
     assert data["Type"] == "holo"
     assert data["ImagePath"] == str(img)
     assert data["CardID"] == "base-1/102"
+    assert decoded == [img]
 
 
 def test_scan_image_fallback(tmp_path, monkeypatch):
     img = tmp_path / "img.jpg"
     create_dummy_image(img)
 
-    monkeypatch.setattr(card_scanner, "predict_card_id", lambda p: "base-2")
-    monkeypatch.setattr(card_scanner, "predict_type", lambda p: "common")
+    decoded = []
+    monkeypatch.setattr(card_scanner, "_image_tensor", lambda p: decoded.append(p) or p)
+    monkeypatch.setattr(card_scanner, "predict_card_ids", lambda ts: ["base-2"] * len(ts))
+    monkeypatch.setattr(card_scanner, "predict_types", lambda ts: ["common"] * len(ts))
     monkeypatch.setattr(card_scanner, "query_card_by_id", lambda *a, **k: None)
 
     data = card_scanner.scan_image(img)
@@ -91,3 +99,166 @@ def test_export_to_csv(tmp_path):
     text = out_file.read_text()
     assert "Name" in text
     assert "Test" in text
+
+
+def test_scan_files_batches_in_order(tmp_path, monkeypatch):
+    paths = [tmp_path / f"img{i}.jpg" for i in range(5)]
+    batches = []
+
+    def fake_predict_ids(tensors):
+        batches.append(len(tensors))
+        return [f"base-{Path(t).stem[3:]}" for t in tensors]
+
+    monkeypatch.setattr(card_scanner, "_image_tensor", lambda p: p)
+    monkeypatch.setattr(card_scanner, "predict_card_ids", fake_predict_ids)
+    monkeypatch.setattr(card_scanner, "predict_types", lambda ts: ["holo"] * len(ts))
+    monkeypatch.setattr(card_scanner, "query_card_by_id", lambda *a, **k: None)
+
+    progress = []
+    data = card_scanner.scan_files(
+        paths, progress_callback=lambda i, t: progress.append((i, t)), batch_size=2
+    )
+
+    assert batches == [2, 2, 1]
+    assert [row["CardID"] for row in data] == [f"base-{i}" for i in range(5)]
+    assert [row["ImagePath"] for row in data] == [str(p) for p in paths]
+    assert progress == [(i, 5) for i in range(1, 6)]
+
+
+def test_scan_batch_falls_back_to_common_without_type_model(tmp_path, monkeypatch, capsys):
+    paths = [tmp_path / f"img{i}.jpg" for i in range(2)]
+
+    def missing_model(tensors):
+        raise FileNotFoundError("type_resnet.pt")
+
+    monkeypatch.setattr(card_scanner, "_image_tensor", lambda p: p)
+    monkeypatch.setattr(card_scanner, "predict_card_ids", lambda ts: ["base-1"] * len(ts))
+    monkeypatch.setattr(card_scanner, "predict_types", missing_model)
+
+    data = card_scanner.scan_batch(paths, enrich=False)
+
+    assert [row["Type"] for row in data] == ["common", "common"]
+    assert "Type model unavailable" in capsys.readouterr().out
+
+    monkeypatch.setattr(card_scanner, "predict_types", lambda ts: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        card_scanner.scan_batch(paths, enrich=False)
+
+
+def test_threads_per_worker():
+    from scanner.parallel_scanner import threads_per_worker
+
+    assert threads_per_worker(4, 16) == 4
+    assert threads_per_worker(3, 16) == 5
+    assert threads_per_worker(32, 16) == 1
+
+
+class _ThreadPool(ThreadPoolExecutor):
+    """Stands in for the process pool so stubs reach the workers."""
+
+    def __init__(self, max_workers, mp_context=None, initializer=None, initargs=()):
+        super().__init__(max_workers, initializer=initializer, initargs=initargs)
+
+
+def test_scan_files_parallel_merges_out_of_order_batches(tmp_path, monkeypatch):
+    from scanner import parallel_scanner
+
+    paths = [tmp_path / f"img{i}.jpg" for i in range(5)]
+    last_done = threading.Event()
+
+    def fake_scan_chunk(batch, multihead):
+        if batch[0] == paths[0]:
+            # The first batch finishes only after all the others.
+            assert last_done.wait(5)
+        rows = [{"CardID": f"base-{int(p.stem[3:]) % 2}", "ImagePath": str(p)} for p in batch]
+        if batch[0] == paths[4]:
+            last_done.set()
+        return rows
+
+    inits = []
+    monkeypatch.setattr(parallel_scanner, "ProcessPoolExecutor", _ThreadPool)
+    monkeypatch.setattr(parallel_scanner, "_init_worker", lambda *a: inits.append(a))
+    monkeypatch.setattr(parallel_scanner, "_scan_chunk", fake_scan_chunk)
+    lookups = []
+
+    def fake_lookup(card_ids, lang="en"):
+        lookups.extend(card_ids)
+        return {card_id: {"Name": f"Card {card_id}"} for card_id in card_ids}
+
+    monkeypatch.setattr(card_scanner, "query_cards_by_id", fake_lookup)
+
+    progress = []
+    data = parallel_scanner.scan_files_parallel(
+        paths, workers=2, progress_callback=lambda i, t: progress.append((i, t)), batch_size=2
+    )
+
+    assert [row["ImagePath"] for row in data] == [str(p) for p in paths]
+    assert progress == [(i, 5) for i in range(1, 6)]
+    # Cards repeated across batches are looked up once, by the parent.
+    assert sorted(lookups) == ["base-0", "base-1"]
+    assert [row["Name"] for row in data] == ["Card base-0", "Card base-1"] * 2 + ["Card base-0"]
+    assert len(inits) == 2
+
+
+def test_init_worker_preloads_card_and_type_models(monkeypatch):
+    from scanner import parallel_scanner
+
+    loaded = []
+    monkeypatch.setattr(parallel_scanner, "torch", None)
+    monkeypatch.setattr(card_scanner, "_load_card_classifier", lambda: loaded.append("card"))
+    monkeypatch.setattr(
+        parallel_scanner.image_analyzer, "load_type_model", lambda path: loaded.append(path)
+    )
+
+    parallel_scanner._init_worker(1, False, {})
+
+    assert loaded == ["card", card_scanner.TYPE_MODEL_PATH]
+
+
+def test_iter_scan_directory_resumes_from_output(tmp_path, monkeypatch):
+    from scanner.data_exporter import CsvAppender, iter_csv_rows, read_column
+
+    for i in range(5):
+        (tmp_path / f"img{i}.jpg").write_bytes(b"")
+    scanned = []
+
+    def fake_scan_batch(batch, multihead=False):
+        scanned.extend(p.name for p in batch)
+        return [{"CardID": p.stem, "Name": p.stem, "ImagePath": str(p)} for p in batch]
+
+    monkeypatch.setattr(card_scanner, "scan_batch", fake_scan_batch)
+    out = tmp_path / "out" / "rows.csv"
+
+    with CsvAppender(str(out), flush_every=2) as writer:
+        for row in card_scanner.iter_scan_directory(tmp_path, batch_size=2):
+            writer.write(row)
+            if row["CardID"] == "img2":
+                break
+    assert len(list(iter_csv_rows(str(out)))) == 3
+
+    done = read_column(str(out), "ImagePath")
+    scanned.clear()
+    with CsvAppender(str(out)) as writer:
+        for row in card_scanner.iter_scan_directory(tmp_path, skip=done, batch_size=2):
+            writer.write(row)
+    assert scanned == ["img3.jpg", "img4.jpg"]
+    assert [r["CardID"] for r in iter_csv_rows(str(out))] == [f"img{i}" for i in range(5)]
+
+
+def test_csv_appender_drops_partial_last_row(tmp_path):
+    from scanner.data_exporter import CsvAppender, iter_csv_rows
+
+    out = tmp_path / "rows.csv"
+    out.write_text("CardID,ImagePath\nbase-1,a.jpg\nbase-2,b.jpg", encoding="utf-8")
+    # Readers already ignore the cut-off row, so a resume scans it again.
+    assert [r["CardID"] for r in iter_csv_rows(str(out))] == ["base-1"]
+
+    with CsvAppender(str(out)) as writer:
+        writer.write({"CardID": "base-3", "ImagePath": "c.jpg"})
+
+    assert [r["CardID"] for r in iter_csv_rows(str(out))] == ["base-1", "base-3"]
+
+    out.write_text("CardI", encoding="utf-8")
+    with CsvAppender(str(out)) as writer:
+        writer.write({"CardID": "base-4", "ImagePath": "d.jpg"})
+    assert list(iter_csv_rows(str(out))) == [{"CardID": "base-4", "ImagePath": "d.jpg"}]
@@ -0,0 +1,100 @@
+import pytest
+
+import scanner.card_scanner as card_scanner
+from scanner import catalog as catalog_module
+from scanner.catalog import CardCatalog, sync_catalog
+from scanner.tcgdex_client import TCGdexClient
+
+SETS = {
+    "base1": {
+        "id": "base1",
+        "name": "Base Set",
+        "cardCount": {"total": 102, "official": 102},
+        "cards": [
+            {"id": "base1-4", "localId": "4", "name": "Charizard"},
+            {"id": "base1-58", "localId": "58", "name": "Pikachu"},
+        ],
+    },
+    "jungle": {
+        "id": "jungle",
+        "name": "Jungle",
+        "cardCount": {"total": 64, "official": 64},
+        "cards": [{"id": "jungle-60", "localId": "60", "name": "Pikachu"}],
+    },
+}
+
+
+def _tcgdex(path, attempt):
+    """Route ``/sets``, ``/sets/<id>`` and ``/cards/<id>`` like TCGdex."""
+    parts = path.strip("/").split("/")
+    if parts[-1] == "sets":
+        return 200, [{k: v for k, v in s.items() if k != "cards"} for s in SETS.values()]
+    if parts[-2] == "sets" and parts[-1] in SETS:
+        return 200, SETS[parts[-1]]
+    if parts[-2] == "cards":
+        for s in SETS.values():
+            for card in s["cards"]:
+                if card["id"] == parts[-1]:
+                    return 200, {**card, "number": card["localId"], "set": {"id": s["id"]}}
+    return 404, None
+
+
+@pytest.fixture
+def tcgdex_server(fake_server):
+    fake_server.respond = _tcgdex
+    return f"{fake_server.url}/v2"
+
+
+@pytest.fixture
+def synced_catalog(tmp_path, tcgdex_server, fake_server, monkeypatch):
+    monkeypatch.setattr(catalog_module, "get_client", TCGdexClient)
+    path = tmp_path / "catalog.sqlite"
+    catalog = CardCatalog(path)
+    assert sync_catalog(catalog, "en", base_url=tcgdex_server) == 3
+    monkeypatch.setattr(catalog_module, "CATALOG_PATH", path)
+    monkeypatch.setattr(catalog_module, "_catalog", catalog)
+    fake_server.paths.clear()
+    return catalog
+
+
+def test_catalog_lookups(synced_catalog):
+    assert synced_catalog.card_count("en") == 3
+    assert synced_catalog.get_card("base1-58") == {"Name": "Pikachu", "Number": "58", "Set": "base1"}
+    assert synced_catalog.get_card("base1-58", lang="fr") is None
+    assert [c["Set"] for c in synced_catalog.find_cards(name="pika")] == ["base1", "jungle"]
+    assert synced_catalog.find_cards(number="058/102")[0]["Name"] == "Pikachu"
+    assert synced_catalog.find_cards(number="58/64") == []
+    assert synced_catalog.set_ids_by_total(64) == ["jungle"]
+
+
+def test_scanner_lookups_use_catalog_offline(synced_catalog, fake_server):
+    assert card_scanner.query_card_by_id("base1-4")["Name"] == "Charizard"
+    assert card_scanner.query_tcg_api("Pikachu", "60/64")["Set"] == "jungle"
+    assert card_scanner.lookup_card_by_number_and_total("58", "102", "Pikachu")["Set"] == "base1"
+    assert fake_server.paths == []
+
+
+def test_query_card_by_id_falls_back_to_api(tmp_path, tcgdex_server, fake_server, monkeypatch):
+    monkeypatch.setattr(catalog_module, "CATALOG_PATH", tmp_path / "missing.sqlite")
+    monkeypatch.setattr(catalog_module, "_catalog", None)
+    monkeypatch.setattr(card_scanner, "API_BASE_URL", tcgdex_server)
+    monkeypatch.setattr(card_scanner, "get_client", TCGdexClient)
+
+    card = card_scanner.query_card_by_id("jungle-60")
+
+    assert card == {"Name": "Pikachu", "Number": "60", "Set": "jungle"}
+    assert fake_server.paths == ["/v2/en/cards/jungle-60"]
+
+
+def test_resync_refreshes_name_index(synced_catalog, tcgdex_server, monkeypatch):
+    from scanner import name_index
+
+    monkeypatch.setattr(name_index, "_indexes", {})
+    assert name_index.get_name_index().best("Raichu", kind=name_index.CARD) != "Raichu"
+
+    raichu = {"id": "jungle-14", "localId": "14", "name": "Raichu"}
+    jungle = {**SETS["jungle"], "cards": SETS["jungle"]["cards"] + [raichu]}
+    monkeypatch.setitem(SETS, "jungle", jungle)
+    sync_catalog(synced_catalog, "en", base_url=tcgdex_server)
+
+    assert name_index.get_name_index().best("Raichu", kind=name_index.CARD) == "Raichu"
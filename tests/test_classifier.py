@@ -0,0 +1,119 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+from scanner.classifier import CardClassifier
+
+
+def _fitted(tmp_path):
+    torch.manual_seed(0)
+    clf = CardClassifier(num_classes=3, device="cpu")
+    clf.classes_ = ["a-1", "b-2", "c-3"]
+    path = tmp_path / "card_model.pt"
+    clf.save(path)
+    return path
+
+
+@pytest.mark.parametrize("backend", ["torchscript", "dynamic_int8", "static_int8"])
+def test_load_with_backend_and_export(tmp_path, backend):
+    path = _fitted(tmp_path)
+    X = list(torch.rand(4, 3, 64, 64))
+
+    clf = CardClassifier.load(path, device="cpu", backend=backend, calibration=X)
+    assert clf.backend == backend
+    preds = clf.predict(X)
+    assert all(p in clf.classes_ for p in preds)
+
+    with pytest.raises(RuntimeError):
+        clf.save(tmp_path / "compiled.pt")
+
+    exported = tmp_path / "card_model.ts"
+    clf.export(exported)
+    loaded = CardClassifier.load(exported, device="cpu")
+    assert loaded.backend == backend
+    assert loaded.classes_ == clf.classes_
+    assert loaded.predict(X) == preds
+
+
+def test_static_int8_requires_calibration(tmp_path):
+    from scanner.model_registry import get_classifier
+
+    path = _fitted(tmp_path)
+    with pytest.raises(ValueError, match="calibration"):
+        CardClassifier.load(path, device="cpu", backend="static_int8")
+    with pytest.raises(ValueError, match="archive"):
+        get_classifier(path, backend="static_int8")
+
+    exported = tmp_path / "card_model.static_int8.ts"
+    X = list(torch.rand(4, 3, 64, 64))
+    CardClassifier.load(path, device="cpu", backend="static_int8", calibration=X).export(exported)
+    assert get_classifier(exported, backend="static_int8").backend == "static_int8"
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        CardClassifier.load(_fitted(tmp_path), device="cpu", backend="tensorrt")
+
+
+class _LazyCards(torch.utils.data.Dataset):
+    """Dataset generating images on access and counting the reads."""
+
+    classes = ["a-1", "b-2"]
+
+    def __init__(self, size: int):
+        self.size = size
+        self.reads = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, idx):
+        self.reads += 1
+        return torch.full((3, 64, 64), float(idx % 2)), idx % 2
+
+
+def test_fit_streams_dataset_and_loader():
+    torch.manual_seed(0)
+    dataset = _LazyCards(12)
+
+    clf = CardClassifier(device="cpu").fit(dataset, epochs=2, batch_size=4, num_workers=0)
+
+    assert clf.classes_ == ["a-1", "b-2"]
+    assert clf.num_classes == 2
+    assert dataset.reads == 24
+    assert set(clf.predict([torch.zeros(3, 64, 64)])) <= {"a-1", "b-2"}
+
+    loader = torch.utils.data.DataLoader(dataset, batch_size=6)
+    clf.fit(loader, ["x", "y"])
+    assert clf.classes_ == ["x", "y"]
+
+
+def test_fit_dataset_requires_class_names():
+    dataset = torch.utils.data.TensorDataset(torch.rand(2, 3, 64, 64), torch.tensor([0, 1]))
+
+    with pytest.raises(ValueError):
+        CardClassifier(device="cpu").fit(dataset, num_workers=0)
+
+
+def test_partial_fit_grows_head_and_keeps_known_rows(tmp_path):
+    torch.manual_seed(0)
+    clf = CardClassifier(device="cpu").fit(list(torch.rand(4, 3, 64, 64)), ["a-1", "b-2", "a-1", "b-2"])
+    X = torch.rand(2, 3, 64, 64)
+    clf.model.eval()
+    with torch.no_grad():
+        before = clf.model(X)
+    backbone = {k: v.clone() for k, v in clf.model.state_dict().items() if not k.startswith("fc.")}
+
+    assert clf.extend_classes(["b-2", "c-3"]) == ["c-3"]
+    clf.model.eval()
+    with torch.no_grad():
+        assert torch.equal(clf.model(X)[:, :2], before)
+
+    clf.partial_fit(list(torch.rand(4, 3, 64, 64)), ["d-4", "a-1", "d-4", "c-3"], freeze_backbone=True)
+
+    assert clf.classes_ == ["a-1", "b-2", "c-3", "d-4"]
+    state = clf.model.state_dict()
+    assert all(torch.equal(state[k], v) for k, v in backbone.items())
+    clf.save(tmp_path / "card_model.pt")
+    loaded = CardClassifier.load(tmp_path / "card_model.pt", device="cpu")
+    assert loaded.classes_ == clf.classes_
+    assert loaded.predict(list(X)) == clf.predict(list(X))
@@ -0,0 +1,45 @@
+import numpy as np
+
+from scanner.embedding_index import BruteForceIndex, IVFIndex, load_index
+
+
+def _gallery(n=200, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, dim)).astype(np.float32), [f"card-{i}" for i in range(n)]
+
+
+def test_brute_force_incremental_add_and_persist(tmp_path):
+    X, labels = _gallery()
+    index = BruteForceIndex()
+    index.add(X[:100], labels[:100])
+    index.add(X[100:], labels[100:])
+    assert len(index) == 200
+
+    hits = index.search(X[[5, 150]] * 3, k=2)
+    assert [h[0][0] for h in hits] == ["card-5", "card-150"]
+    assert hits[0][0][1] > hits[0][1][1]
+
+    path = tmp_path / "index.npz"
+    index.save(path)
+    loaded = load_index(path)
+    assert isinstance(loaded, BruteForceIndex)
+    assert loaded.search(X[[42]], k=1)[0][0][0] == "card-42"
+
+
+def test_ivf_finds_neighbours_and_persists(tmp_path):
+    X, labels = _gallery(n=500)
+    index = IVFIndex(nlist=16, nprobe=4)
+    index.train(X)
+    index.add(X, labels)
+    index.add(X[:1] * -1, ["new-card"])
+
+    queries = X[:50] + 0.01
+    hits = index.search(queries, k=1)
+    assert sum(h[0][0] == f"card-{i}" for i, h in enumerate(hits)) >= 45
+    assert index.search(X[:1] * -1, k=1)[0][0][0] == "new-card"
+
+    path = tmp_path / "ivf.npz"
+    index.save(path)
+    loaded = load_index(path)
+    assert isinstance(loaded, IVFIndex)
+    assert loaded.search(queries[:5], k=1) == hits[:5]
@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+import scanner.card_scanner as card_scanner
+from scanner.data_exporter import export_to_csv, iter_csv_rows
+from scanner.enrichment import EnrichmentQueue, SingleFlight, fill_row, resolve, without_status
+from scanner.scan_cache import ScanCache
+
+
+def test_single_flight_shares_concurrent_calls():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(1)
+        return {"Name": "Pikachu"}
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = [pool.submit(flight.do, "base1-58", slow) for _ in range(6)]
+        time.sleep(0.05)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert calls == [1]
+    assert results == [{"Name": "Pikachu"}] * 6
+    assert (flight.calls, flight.shared) == (1, 5)
+    # Finished keys are looked up again.
+    assert flight.do("base1-58", lambda: None) is None
+
+
+def test_single_flight_propagates_errors():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        flight.do("x", fail)
+    assert flight.do("x", lambda: 1) == 1
+
+
+def test_resolve_and_fill_row():
+    seen = []
+    details = resolve(["a-1", "b-2", "a-1"], lambda k: seen.append(k) or ({"Name": k} if k == "a-1" else None))
+
+    assert seen == ["a-1", "b-2"]
+    assert fill_row({"CardID": "a-1", "Name": "Unknown"}, details["a-1"]) == {"CardID": "a-1", "Name": "a-1"}
+    assert fill_row({"CardID": "b-2"}, details["b-2"]) == {"CardID": "b-2", "Set": "b", "Number": "2"}
+
+
+def test_rows_without_status_export_together(tmp_path):
+    cached = {"CardID": "a-1", "Name": "Pikachu"}
+    fresh = {"CardID": "b-2", "Name": "Raichu", "Enrichment": "done"}
+
+    export_to_csv([without_status(row) for row in (cached, fresh)], str(tmp_path / "out.csv"))
+
+    assert list(iter_csv_rows(str(tmp_path / "out.csv"))) == [cached, {"CardID": "b-2", "Name": "Raichu"}]
+    assert fresh["Enrichment"] == "done"
+
+
+def test_scan_batch_resolves_each_card_once(tmp_path, monkeypatch):
+    paths = [tmp_path / f"{i}.jpg" for i in range(6)]
+    monkeypatch.setattr(card_scanner, "_image_tensor", lambda p: p)
+    monkeypatch.setattr(card_scanner, "predict_card_ids", lambda ts: ["base1-58", "base1-4"] * 3)
+    monkeypatch.setattr(card_scanner, "predict_types", lambda ts: ["common"] * len(ts))
+    lookups = []
+    lock = threading.Lock()
+
+    def fake_query(card_id, lang="en"):
+        with lock:
+            lookups.append(card_id)
+        time.sleep(0.05)
+        return {"Name": card_id.upper(), "Set": "base1"}
+
+    monkeypatch.setattr(card_scanner, "query_card_by_id", fake_query)
+
+    # Two concurrent scans of overlapping batches share in-flight lookups.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        rows = list(pool.map(card_scanner.scan_batch, [paths, paths[:2]]))
+
+    assert sorted(lookups) == ["base1-4", "base1-58"]
+    assert [r["Name"] for r in rows[0]] == ["BASE1-58", "BASE1-4"] * 3
+    assert [r["ImagePath"] for r in rows[0]] == [str(p) for p in paths]
+
+
+def test_deferred_enrichment_returns_before_lookups(tmp_path, monkeypatch):
+    paths = []
+    for i in range(4):
+        p = tmp_path / f"{i}.jpg"
+        p.write_bytes(f"image-{i}".encode())
+        paths.append(p)
+    monkeypatch.setattr(card_scanner, "_image_tensor", lambda p: p)
+    monkeypatch.setattr(card_scanner, "predict_card_ids", lambda ts: ["base1-58", "fake-9"] * (len(ts) // 2))
+    monkeypatch.setattr(card_scanner, "predict_types", lambda ts: ["holo"] * len(ts))
+    monkeypatch.setattr(card_scanner, "scan_model_version", lambda multihead=False: "v1")
+    release = threading.Event()
+
+    def slow_lookup(card_ids):
+        release.wait(2)
+        return {cid: ({"Name": "Pikachu", "Number": "58"} if cid == "base1-58" else None) for cid in card_ids}
+
+    updated = []
+    queue = EnrichmentQueue(slow_lookup, on_update=updated.append)
+    cache = ScanCache(tmp_path / "cache.sqlite")
+    rows = card_scanner.scan_files(paths, batch_size=2, cache=cache, enrichment_queue=queue)
+
+    assert [r["Enrichment"] for r in rows] == ["pending"] * 4
+    assert [r["Name"] for r in rows] == ["Unknown"] * 4
+    assert [r["Set"] for r in rows] == ["base1", "fake"] * 2
+    assert cache.get(cache.key(paths[0], "v1")) is None
+
+    release.set()
+    assert queue.join(timeout=2)
+    queue.close()
+    assert [r["Enrichment"] for r in rows] == ["done", "unresolved"] * 2
+    assert [r["Name"] for r in rows] == ["Pikachu", "Unknown"] * 2
+    assert sorted(map(id, updated)) == sorted(map(id, rows))
+    assert (queue.resolved, queue.unresolved, queue.pending) == (2, 2, 0)
+    assert cache.get(cache.key(paths[0], "v1"))["Name"] == "Pikachu"
+    assert "Enrichment" not in cache.get(cache.key(paths[0], "v1"))
+    # Unresolved rows are looked up again on the next scan.
+    assert cache.get(cache.key(paths[1], "v1")) is None
@@ -48,3 +48,34 @@ def test_train_and_predict(tmp_path, monkeypatch):
     ia.train_type_classifier(csv_path, tmp_path / "model.pt", epochs=1)
     pred = ia.predict_type(str(img), tmp_path / "model.pt")
     assert pred == "holo"
+
+
+def test_train_type_classifier_uses_mini_batches(tmp_path, monkeypatch, capsys):
+    from PIL import Image
+    import torch
+
+    rows = ["image_path,holo,reverse", f"{tmp_path / 'missing.jpg'},1,0"]
+    for i in range(5):
+        path = tmp_path / f"card{i}.jpg"
+        Image.new("RGB", (80, 110), (40 * i, 0, 0)).save(path)
+        rows.append(f"{path},{int(i < 2)},0")
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("\n".join(rows) + "\n")
+
+    steps = []
+
+    class CountingAdam(torch.optim.Adam):
+        def step(self, *args, **kwargs):
+            steps.append(1)
+            return super().step(*args, **kwargs)
+
+    monkeypatch.setattr(ia.optim, "Adam", CountingAdam)
+    model_path = tmp_path / "type_model.pt"
+
+    ia.train_type_classifier(csv_path, model_path, epochs=2, batch_size=2, num_workers=0)
+
+    assert len(steps) == 6  # three batches of at most two images per epoch
+    checkpoint = torch.load(model_path, map_location="cpu")
+    assert checkpoint["class_to_idx"] == {"holo": 0, "normal": 1}
+    assert "img/s" in capsys.readouterr().out
+    assert ia.predict_type(tmp_path / "card0.jpg", model_path) in {"holo", "normal"}
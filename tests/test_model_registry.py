@@ -0,0 +1,40 @@
+import os
+
+from scanner.model_registry import ModelRegistry
+
+
+def test_loads_once_and_reloads_on_mtime_change(tmp_path):
+    path = tmp_path / "model.pt"
+    path.write_text("v1")
+    calls = []
+
+    def loader(p):
+        calls.append(p.read_text())
+        return object()
+
+    reg = ModelRegistry()
+    first = reg.get(path, loader, "test")
+    assert reg.get(path, loader, "test") is first
+    assert calls == ["v1"]
+
+    path.write_text("v2")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert reg.get(path, loader, "test") is not first
+    assert calls == ["v1", "v2"]
+
+
+def test_evicts_least_recently_used(tmp_path):
+    paths = [tmp_path / f"m{i}.pt" for i in range(3)]
+    for p in paths:
+        p.write_text("x")
+
+    reg = ModelRegistry(max_models=2)
+    reg.get(paths[0], lambda p: 0, "test")
+    reg.get(paths[1], lambda p: 1, "test")
+    reg.get(paths[0], lambda p: 0, "test")
+    reg.get(paths[2], lambda p: 2, "test")
+
+    assert len(reg) == 2
+    assert paths[0] in reg
+    assert paths[1] not in reg
@@ -0,0 +1,81 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+from scanner.classifier import MultiHeadCardClassifier
+
+
+def test_fit_predict_save_load(tmp_path):
+    torch.manual_seed(0)
+    X = list(torch.rand(4, 3, 64, 64))
+    ids = ["base-1", "base-2", "base-1", "base-2"]
+    types = ["holo", "common", "holo", "reverse"]
+
+    clf = MultiHeadCardClassifier(device="cpu")
+    clf.fit(X, ids, types, epochs=1, batch_size=2)
+    assert clf.classes_ == ["base-1", "base-2"]
+    assert clf.type_classes_ == ["common", "holo", "reverse"]
+
+    pairs = clf.predict_with_type(X)
+    assert len(pairs) == 4
+    assert all(cid in clf.classes_ and t in clf.type_classes_ for cid, t in pairs)
+
+    path = tmp_path / "multi.pt"
+    clf.save(path)
+    loaded = MultiHeadCardClassifier.load(path, device="cpu")
+    assert loaded.predict_with_type(X) == pairs
+    assert loaded.predict(X) == [cid for cid, _ in pairs]
+
+
+def test_partial_fit_extends_both_heads(tmp_path):
+    torch.manual_seed(0)
+    clf = MultiHeadCardClassifier(device="cpu")
+    clf.fit(list(torch.rand(2, 3, 64, 64)), ["base-1", "base-2"], ["holo", "common"])
+    X = torch.rand(2, 3, 64, 64)
+    clf.model.eval()
+    with torch.no_grad():
+        before = clf.model(X)[0]
+
+    assert clf.extend_classes(["base-3"]) == ["base-3"]
+    clf.model.eval()
+    with torch.no_grad():
+        assert torch.equal(clf.model(X)[0][:, :2], before)
+
+    backbone = {k: v.clone() for k, v in clf.model.backbone.state_dict().items()}
+    clf.partial_fit(
+        list(torch.rand(2, 3, 64, 64)), ["sv-1", "base-1"], ["reverse", "holo"], freeze_backbone=True
+    )
+
+    assert clf.classes_ == ["base-1", "base-2", "base-3", "sv-1"]
+    assert clf.type_classes_ == ["common", "holo", "reverse"]
+    state = clf.model.backbone.state_dict()
+    assert all(torch.equal(state[k], v) for k, v in backbone.items())
+    clf.save(tmp_path / "multi.pt")
+    loaded = MultiHeadCardClassifier.load(tmp_path / "multi.pt", device="cpu")
+    assert loaded.predict_with_type(list(X)) == clf.predict_with_type(list(X))
+
+
+def test_train_streams_images_from_csv(tmp_path, monkeypatch):
+    from PIL import Image
+
+    from scanner import multihead_model
+
+    rows = ["card_id,image_path,holo,reverse"]
+    for i, (card_id, holo) in enumerate([("base-1", "1"), ("base-2", "0"), ("base-1", "0"), ("unknown", "0")]):
+        path = tmp_path / f"{i}.jpg"
+        Image.new("RGB", (600, 840), (i * 60, 0, 0)).save(path)
+        rows.append(f"{card_id},{path},{holo},0")
+    csv_path = tmp_path / "dataset.csv"
+    csv_path.write_text("\n".join(rows) + "\n")
+
+    decoded = []
+    open_rgb = multihead_model.open_rgb
+    monkeypatch.setattr(multihead_model, "open_rgb", lambda path: decoded.append(path) or open_rgb(path))
+
+    dataset = multihead_model._load_dataset(csv_path)
+    assert (len(dataset), dataset.classes, dataset.type_classes) == (3, ["base-1", "base-2"], ["common", "holo"])
+    assert decoded == []  # nothing is decoded until training asks for a batch
+
+    clf = multihead_model.train_multihead_classifier(csv_path, tmp_path / "multi.pt", epochs=1, num_workers=0)
+    assert len(decoded) == 3
+    assert clf.classes_ == ["base-1", "base-2"]
+    assert clf.type_classes_ == ["common", "holo"]
@@ -0,0 +1,70 @@
+import scanner.card_scanner as card_scanner
+from scanner import catalog as catalog_module
+from scanner import name_index
+from scanner.catalog import CardCatalog
+from scanner.name_index import CARD, SET, NameIndex, trigrams
+
+NAMES = ["Pikachu", "Pikachu ex", "Raichu", "Charizard", "Charmander", "Mew", "Mewtwo"]
+
+
+def test_trigrams_pad_and_normalise():
+    assert trigrams("Mew!") == {"  m", " me", "mew", "ew "}
+    assert trigrams("  ") == set()
+
+
+def test_search_ranks_ocr_typos():
+    index = NameIndex(NAMES)
+
+    hits = index.search("Pikachv", k=3)
+
+    assert hits[0][0] == "Pikachu"
+    assert [name for name, _ in hits][:2] == ["Pikachu", "Pikachu ex"]
+    assert index.best("CHARIZARO") == "Charizard"
+    assert index.best("Mew") == "Mew"
+    assert index.search("qqqq") == []
+
+
+def test_search_breaks_ties_by_length_at_the_cut():
+    # Every name scores 0.5 against "abc"; only "abx" has as many trigrams.
+    longer = ["abcdefg", "abchijk", "abclmno", "abcpqrs", "abctuvw"]
+    index = NameIndex(longer + ["abx"])
+
+    assert {score for _, score in index.search("abc", k=6)} == {0.5}
+    assert index.search("abc", k=1) == [("abx", 0.5)]
+    assert index.search("abc", k=3)[0] == ("abx", 0.5)
+
+
+def test_search_filters_kind_and_score():
+    index = NameIndex(["Jungle", "Fossil", "Jungle"], [SET, SET, CARD])
+
+    assert len(index) == 3
+    assert [name for name, _ in index.search("Jungl", kind=CARD)] == ["Jungle"]
+    assert index.best("Fosil", kind=CARD) is None
+    assert index.best("Fosil", kind=SET) == "Fossil"
+    assert index.search("Fxxxxx", min_score=0.5) == []
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    index = NameIndex(NAMES)
+    index.save(tmp_path / "names.npz")
+
+    loaded = NameIndex.load(tmp_path / "names.npz")
+
+    assert len(loaded) == len(NAMES)
+    assert loaded.search("Charmandr", k=2) == index.search("Charmandr", k=2)
+
+
+def test_parse_card_text_snaps_name_to_catalog(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.sqlite"
+    catalog = CardCatalog(path)
+    catalog.store_set(
+        {"id": "base1", "total": 102, "cards": [{"id": "base1-58", "localId": "58", "name": "Pikachu"}]}
+    )
+    monkeypatch.setattr(catalog_module, "CATALOG_PATH", path)
+    monkeypatch.setattr(catalog_module, "_catalog", catalog)
+    monkeypatch.setattr(name_index, "_indexes", {})
+
+    result = card_scanner.parse_card_text("Pikachv", "58/102")
+
+    assert result == {"Name": "Pikachu", "Number": "58", "Set": "base1"}
+    assert name_index.index_path(catalog).exists()
@@ -0,0 +1,140 @@
+import sys
+
+from PIL import Image
+import pytest
+import pytesseract
+
+import scanner.card_scanner as card_scanner
+from scanner import ocr_engine
+from scanner.ocr_cache import OCRCache
+from scanner.ocr_engine import OCREngine
+
+# Stand-in tesseract: "recognises" every image of a list file as its size
+# and the page segmentation mode, separating pages with form feeds.
+FAKE_TESSERACT = """\
+import sys
+from PIL import Image
+
+with open(LOG, "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+psm = sys.argv[sys.argv.index("--psm") + 1]
+for path in open(sys.argv[1]).read().split():
+    w, h = Image.open(path).size
+    sys.stdout.write(f"{w}x{h} psm{psm}\\f")
+"""
+
+
+@pytest.fixture
+def fake_tesseract(tmp_path, monkeypatch):
+    log = tmp_path / "calls.log"
+    script = tmp_path / "tesseract"
+    script.write_text(f"#!{sys.executable}\nLOG = {str(log)!r}\n" + FAKE_TESSERACT)
+    script.chmod(0o755)
+    monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", str(script))
+    return log
+
+
+def test_subprocess_backend_batches_per_config(fake_tesseract):
+    engine = OCREngine(workers=2, chunk_size=2, backend="subprocess")
+    items = [
+        (Image.new("L", (10 + i, 5)), card_scanner.NAME_OCR_CONFIG if i % 2 == 0 else "--psm 6")
+        for i in range(5)
+    ]
+
+    texts = engine.extract_texts(items)
+    engine.close()
+
+    assert texts == ["10x5 psm7", "11x5 psm6", "12x5 psm7", "13x5 psm6", "14x5 psm7"]
+    calls = fake_tesseract.read_text().splitlines()
+    assert len(calls) == 3
+    assert any("tessedit_char_whitelist=" in call for call in calls)
+
+
+def test_ocr_card_texts_crops_name_and_number(fake_tesseract, monkeypatch):
+    monkeypatch.setattr(ocr_engine, "_engine", OCREngine(workers=1, backend="subprocess"))
+    cards = [Image.new("RGB", (1000, 1400), "white"), Image.new("RGB", (500, 700), "white")]
+
+    texts = card_scanner.ocr_card_texts(cards)
+
+    # Crops of every card are brought to the common region sizes.
+    assert texts == [("432x64 psm7", "308x64 psm6")] * 2
+    assert len(fake_tesseract.read_text().splitlines()) == 2
+
+
+def test_cache_skips_recognised_crops(fake_tesseract, tmp_path):
+    items = [(Image.new("L", (10 + i, 5)), "--psm 7") for i in range(3)]
+    engine = OCREngine(workers=1, backend="subprocess", cache=OCRCache(tmp_path / "ocr.sqlite"))
+    engine._version = "test"
+
+    first = engine.extract_texts(items)
+    changed = items[:2] + [(items[2][0], "--psm 6")]
+    second = engine.extract_texts(changed)
+
+    assert first == ["10x5 psm7", "11x5 psm7", "12x5 psm7"]
+    assert second == ["10x5 psm7", "11x5 psm7", "12x5 psm6"]
+    # Only the crop with a new config reached tesseract the second time.
+    calls = fake_tesseract.read_text().splitlines()
+    assert len(calls) == 2 and "--psm 6" in calls[1]
+    stats = engine.metrics()["cache"]
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 4, 4)
+
+    engine._version = "other"
+    engine.extract_texts(items[:1])
+    assert engine.cache.stats["entries"] == 1
+    engine.close()
+
+
+def test_iter_ocr_files_identifies_cards_in_batches(tmp_path, monkeypatch):
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"card{i}.png")
+        Image.new("RGB", (50, 70), "white").save(paths[-1])
+    batches = []
+
+    def fake_texts(images):
+        batches.append(len(images))
+        return [("Pikachu", "58/102")] * len(images)
+
+    monkeypatch.setattr(card_scanner, "ocr_card_texts", fake_texts)
+    monkeypatch.setattr(
+        card_scanner, "parse_card_text", lambda name, number: {"Name": name, "Number": number}
+    )
+
+    rows = list(card_scanner.iter_ocr_files(paths, batch_size=2))
+
+    assert batches == [2, 1]
+    assert [row["ImagePath"] for row in rows] == [str(p) for p in paths]
+    assert rows[0]["Name"] == "Pikachu"
+
+
+class FakeTessAPI:
+    ended = 0
+
+    def SetPageSegMode(self, psm):
+        pass
+
+    def SetVariable(self, key, value):
+        pass
+
+    def SetImage(self, image):
+        self.size = image.size
+
+    def GetUTF8Text(self):
+        return f"{self.size[0]}x{self.size[1]}"
+
+    def End(self):
+        FakeTessAPI.ended += 1
+
+
+def test_close_ends_tesserocr_apis(monkeypatch):
+    monkeypatch.setattr(ocr_engine, "tesserocr", type("tesserocr", (), {"PyTessBaseAPI": FakeTessAPI}))
+    monkeypatch.setattr(FakeTessAPI, "ended", 0)
+    engine = OCREngine(workers=2, chunk_size=1, backend="tesserocr")
+    items = [(Image.new("L", (10 + i, 5)), f"--psm {6 + i % 2}") for i in range(4)]
+
+    assert engine.extract_texts(items) == ["10x5", "11x5", "12x5", "13x5"]
+    created = len(engine._apis)
+    engine.close()
+
+    assert 2 <= created <= 4
+    assert FakeTessAPI.ended == created
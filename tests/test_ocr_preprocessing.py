@@ -0,0 +1,68 @@
+import math
+
+import numpy as np
+from PIL import Image
+
+from scanner.ocr_preprocessing import (
+    NAME_REGION,
+    enhance_batch,
+    extract_rois,
+    prepare_card_rois,
+    region_box,
+)
+
+
+def reference_enhance(crop: np.ndarray, block: int, offset: float) -> np.ndarray:
+    levels = np.sort(crop.ravel()).astype(np.int64)
+    lo = levels[math.ceil(0.02 * levels.size) - 1]
+    hi = levels[math.ceil(0.98 * levels.size) - 1]
+    x = np.clip((crop.astype(np.int64) - lo) * (255.0 / max(hi - lo, 1)), 0, 255).round()
+    pad = block // 2
+    padded = np.pad(x, pad, mode="edge")
+    area = block * block
+    out = np.empty(x.shape, dtype=np.uint8)
+    for i in range(x.shape[0]):
+        for j in range(x.shape[1]):
+            total = padded[i:i + block, j:j + block].sum()
+            out[i, j] = 0 if x[i, j] * area < total - offset * area else 255
+    return out
+
+
+def test_enhance_batch_matches_per_pixel_reference():
+    rng = np.random.default_rng(0)
+    stack = rng.integers(0, 256, size=(3, 12, 17), dtype=np.uint8)
+
+    result = enhance_batch(stack, block=5, offset=8)
+
+    for crop, out in zip(stack, result):
+        np.testing.assert_array_equal(out, reference_enhance(crop, 5, 8))
+
+
+def test_enhance_batch_separates_text_from_uneven_background():
+    background = np.tile(np.linspace(90, 230, 120, dtype=np.float32), (40, 1))
+    crop = background.copy()
+    crop[15:25, 30:90] -= 60  # a dark stroke on a lighting gradient
+
+    out = enhance_batch(crop.astype(np.uint8)[None], block=31, offset=12)[0]
+
+    assert (out[17:23, 35:85] == 0).all()
+    assert (out[:8] == 255).all() and (out[-8:] == 255).all()
+
+
+def test_empty_batch_returns_no_crops():
+    assert enhance_batch(np.empty((0, 12, 17), dtype=np.uint8)).shape == (0, 12, 17)
+    assert prepare_card_rois([]) == ([], [])
+
+
+def test_extract_rois_crops_regions_to_common_size():
+    cards = []
+    for size in ((1000, 1400), (500, 700)):
+        card = Image.new("RGB", size, "white")
+        card.paste((0, 0, 0), region_box(size, NAME_REGION))
+        cards.append(card)
+
+    rois = extract_rois(cards, NAME_REGION, (100, 20))
+
+    assert rois.shape == (2, 20, 100)
+    assert rois.dtype == np.uint8
+    assert rois.max() < 10
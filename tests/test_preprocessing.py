@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("torch")
+from PIL import Image
+
+from scanner import preprocessing
+
+
+def test_open_rgb_uses_reduced_jpeg_decode(tmp_path):
+    path = tmp_path / "scan.jpg"
+    Image.new("RGB", (1600, 2000), "red").save(path)
+    img = preprocessing.open_rgb(path)
+    assert img.mode == "RGB"
+    assert 64 <= img.size[0] < 1600 and 64 <= img.size[1] < 2000
+
+
+def test_load_tensor_decodes_once(tmp_path, monkeypatch):
+    path = tmp_path / "scan.png"
+    Image.new("RGB", (300, 400), "blue").save(path)
+    preprocessing.clear_cache()
+    calls = []
+    original = preprocessing.open_rgb
+    monkeypatch.setattr(
+        preprocessing, "open_rgb", lambda *a, **k: calls.append(a) or original(*a, **k)
+    )
+
+    first = preprocessing.load_tensor(path)
+    second = preprocessing.load_tensor(path)
+    assert tuple(first.shape) == (3, 64, 64)
+    assert second is first
+    assert len(calls) == 1
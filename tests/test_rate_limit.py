@@ -0,0 +1,106 @@
+import pytest
+
+import scanner.card_scanner as card_scanner
+from scanner import catalog
+from scanner.rate_limit import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    AdaptiveRateLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyHistogram,
+)
+from scanner.tcgdex_client import TCGdexClient
+
+PIKACHU = {"name": "Pikachu", "number": "58", "set": {"id": "base1"}}
+
+
+@pytest.fixture
+def faulty_server(fake_server, clock):
+    """Card endpoint failing with 503 while ``fake_server.fail`` is set.
+
+    Its ``delay`` passes on the test ``clock`` rather than in real time.
+    """
+    fake_server.fail = False
+    fake_server.sleep = clock.sleep
+    fake_server.respond = lambda path, attempt: (503, None) if fake_server.fail else (200, PIKACHU)
+    return fake_server
+
+
+def test_breaker_opens_and_lookups_fall_back(tmp_path, faulty_server, clock, monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.2, clock=clock)
+    limiter = AdaptiveRateLimiter(rate=100, clock=clock, sleep=clock.sleep)
+    client = TCGdexClient(
+        retries=1, backoff=0.01, breaker=breaker, limiter=limiter, clock=clock, sleep=clock.sleep
+    )
+    base_url = f"{faulty_server.url}/v2"
+    monkeypatch.setattr(card_scanner, "get_client", lambda: client)
+    monkeypatch.setattr(card_scanner, "API_BASE_URL", base_url)
+    monkeypatch.setattr(catalog, "CATALOG_PATH", tmp_path / "missing.sqlite")
+    monkeypatch.setattr(catalog, "_catalog", None)
+
+    faulty_server.fail = True
+    faulty_server.delay = 0.05
+    assert card_scanner.query_card_by_id("base1-58") is None
+    assert card_scanner.query_card_by_id("base1-58") is None
+    assert breaker.state == OPEN
+    hits = faulty_server.hits
+
+    # While open, lookups skip the API and use the local fallback at once.
+    start = clock()
+    with pytest.raises(CircuitOpenError):
+        client.get_json(f"{base_url}/en/cards/base1-4")
+    details = card_scanner.query_card_by_id("base1-4")
+    row = card_scanner._build_result(tmp_path / "x.jpg", "base1-4", "holo", details)
+    assert clock() == start
+    assert (row["Set"], row["Number"]) == ("base1", "4")
+    assert faulty_server.hits == hits
+
+    # After the reset timeout one probe is sent; success closes the breaker.
+    faulty_server.fail = False
+    faulty_server.delay = 0.0
+    clock.advance(0.25)
+    assert breaker.state == HALF_OPEN
+    assert card_scanner.query_card_by_id("base1-58")["Name"] == "Pikachu"
+    assert breaker.state == CLOSED
+
+    metrics = client.metrics()
+    assert metrics["breaker"] == CLOSED
+    assert metrics["latency"]["count"] == faulty_server.hits
+    assert faulty_server.hits == 4  # three failures before opening, one probe
+
+
+def test_limiter_adapts_to_latency_and_errors(faulty_server, clock):
+    limiter = AdaptiveRateLimiter(rate=20, burst=1, latency_target=0.1, clock=clock, sleep=clock.sleep)
+    client = TCGdexClient(retries=0, limiter=limiter, clock=clock, sleep=clock.sleep)
+    url = f"{faulty_server.url}/v2/en/cards/base1-58"
+
+    start = clock()
+    for _ in range(5):
+        client.get_json(url)
+    # Four waits of about 1/20 s between five requests with a burst of one.
+    assert clock() - start == pytest.approx(4 / 20, rel=0.05)
+    assert limiter.rate > 20
+
+    faulty_server.delay = 0.15
+    client.get_json(url)
+    slow_rate = limiter.rate
+    assert slow_rate < 20
+
+    faulty_server.delay = 0.0
+    faulty_server.fail = True
+    clock.advance(1.0)  # well past the once-per-burst backoff window
+    with pytest.raises(Exception):
+        client.get_json(url)
+    assert limiter.rate == pytest.approx(slow_rate / 2, rel=0.05)
+
+
+def test_latency_histogram_quantiles():
+    hist = LatencyHistogram(buckets=(0.1, 1.0))
+    for seconds in (0.01, 0.05, 0.5, 3.0):
+        hist.observe(seconds)
+    snap = hist.snapshot()
+    assert snap["buckets"] == {"<=0.1s": 2, "<=1s": 1, ">1s": 1}
+    assert snap["p50_s"] == 0.1
+    assert snap["p95_s"] == float("inf")
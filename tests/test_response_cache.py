@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+import scanner.card_scanner as card_scanner
+from scanner import catalog
+from scanner.response_cache import ResponseCache
+from scanner.tcgdex_client import TCGdexClient
+
+CARDS = {"base1-4": "Charizard", "base1-58": "Pikachu", "jungle-60": "Pikachu"}
+
+
+def _card(path, attempt):
+    card_id = path.rsplit("/", 1)[-1]
+    if card_id not in CARDS:
+        return 404, None
+    return 200, {"name": CARDS[card_id], "set": {"id": card_id.split("-")[0]}}
+
+
+@pytest.fixture
+def server_url(fake_server):
+    fake_server.respond = _card
+    return f"{fake_server.url}/v2"
+
+
+def test_bulk_lot_hits_api_once_per_card(tmp_path, server_url, monkeypatch):
+    client = TCGdexClient(cache=ResponseCache(tmp_path / "responses.sqlite"))
+    monkeypatch.setattr(card_scanner, "get_client", lambda: client)
+    monkeypatch.setattr(card_scanner, "API_BASE_URL", server_url)
+    monkeypatch.setattr(catalog, "CATALOG_PATH", tmp_path / "missing.sqlite")
+    monkeypatch.setattr(catalog, "_catalog", None)
+
+    lot = ["base1-4", "base1-58", "jungle-60", "fake-1"] * 10
+    results = [card_scanner.query_card_by_id(card_id) for card_id in lot]
+
+    assert results[:4] == [
+        {"Name": "Charizard", "Number": None, "Set": "base1"},
+        {"Name": "Pikachu", "Number": None, "Set": "base1"},
+        {"Name": "Pikachu", "Number": None, "Set": "jungle"},
+        None,
+    ]
+    assert results[4:8] == results[:4]
+    assert client.requests_sent == 4
+    stats = client.cache.stats
+    assert stats["misses"] == 4
+    assert stats["memory_hits"] == 36
+    assert stats["negative_hits"] == 9
+
+    # A new process answers from the persistent tier.
+    restarted = TCGdexClient(cache=ResponseCache(tmp_path / "responses.sqlite"))
+    monkeypatch.setattr(card_scanner, "get_client", lambda: restarted)
+    assert card_scanner.query_card_by_id("base1-4")["Name"] == "Charizard"
+    assert restarted.requests_sent == 0
+    assert restarted.cache.stats["disk_hits"] == 1
+
+
+def test_negative_results_expire_sooner(tmp_path):
+    cache = ResponseCache(":memory:", ttl=60, negative_ttl=0.01)
+    cache.set(cache.key("https://x/cards", {"name": "Mew", "lang": "en"}), {"cards": [1]})
+    cache.set("https://x/cards/none", None)
+    cache.set("https://x/cards?name=Zzz", {"cards": []}, negative=True)
+    time.sleep(0.02)
+
+    assert cache.get("https://x/cards?lang=en&name=Mew") == (True, {"cards": [1]})
+    assert cache.get("https://x/cards/none") == (False, None)
+    assert cache.get("https://x/cards?name=Zzz") == (False, None)
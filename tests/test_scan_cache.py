@@ -0,0 +1,123 @@
+import time
+
+import scanner.card_scanner as card_scanner
+from scanner.scan_cache import ScanCache
+from scanner.sqlite_cache import SQLiteCache
+
+
+def test_sqlite_cache_lru_and_ttl(tmp_path):
+    cache = SQLiteCache(tmp_path / "c.sqlite", max_entries=2)
+    cache.set("a", {"v": 1})
+    time.sleep(0.01)
+    cache.set("b", [2])
+    time.sleep(0.01)
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", None)
+    assert cache.get("b", "missing") == "missing"
+    assert cache.get("c", "missing") is None
+    cache.set("d", 4, ttl=-1)
+    assert cache.get("d") is None
+    assert cache.stats["hits"] == 2
+    assert cache.stats["misses"] == 2
+
+
+def test_sqlite_cache_tracks_count_and_buffers_touches(tmp_path):
+    cache = SQLiteCache(tmp_path / "c.sqlite", max_entries=3)
+    for key in "abc":
+        cache.set(key, key)
+        time.sleep(0.01)
+    cache.set("a", "A")  # replacing a key does not grow the table
+    assert len(cache) == 3
+    time.sleep(0.01)
+    assert cache.get("b") == "b"  # access time is only buffered
+    cache.set("d", "d")
+    assert len(cache) == 3
+    assert cache.get("c") is None
+    assert [cache.get(k) for k in "abd"] == ["A", "b", "d"]
+    cache.close()
+
+    reopened = SQLiteCache(tmp_path / "c.sqlite", max_entries=3)
+    assert len(reopened) == 3
+
+
+def test_scan_files_uses_cache(tmp_path, monkeypatch):
+    paths = []
+    for i in range(3):
+        p = tmp_path / f"img{i}.jpg"
+        p.write_bytes(f"image-{i}".encode())
+        paths.append(p)
+
+    scanned = []
+
+    def fake_scan_batch(batch, multihead=False):
+        scanned.extend(batch)
+        return [{"CardID": f"base-{p.stem[3:]}", "ImagePath": str(p)} for p in batch]
+
+    monkeypatch.setattr(card_scanner, "scan_batch", fake_scan_batch)
+    monkeypatch.setattr(card_scanner, "scan_model_version", lambda multihead=False: "v1")
+
+    cache = ScanCache(tmp_path / "cache.sqlite")
+    first = card_scanner.scan_files(paths[:2], cache=cache)
+    assert scanned == paths[:2]
+
+    copy = tmp_path / "copy.jpg"
+    copy.write_bytes(b"image-0")
+    progress = []
+    second = card_scanner.scan_files(
+        [copy] + paths, progress_callback=lambda i, t: progress.append(i), cache=cache
+    )
+    assert scanned == paths[:2] + [paths[2]]
+    assert [r["CardID"] for r in second] == ["base-0", "base-0", "base-1", "base-2"]
+    assert second[0]["ImagePath"] == str(copy)
+    assert second[1:3] == first
+    assert progress == [1, 2, 3, 4]
+
+    monkeypatch.setattr(card_scanner, "scan_model_version", lambda multihead=False: "v2")
+    card_scanner.scan_files(paths[:1], cache=cache)
+    assert scanned[-1] == paths[0]
+
+
+def test_versions_share_the_cache(tmp_path, monkeypatch):
+    path = tmp_path / "img.jpg"
+    path.write_bytes(b"image")
+    scanned = []
+
+    def fake_scan_batch(batch, multihead=False):
+        scanned.append(multihead)
+        return [{"CardID": "base-1", "ImagePath": str(p)} for p in batch]
+
+    monkeypatch.setattr(card_scanner, "scan_batch", fake_scan_batch)
+    monkeypatch.setattr(
+        card_scanner, "scan_model_version", lambda multihead=False: "multi" if multihead else "single"
+    )
+    cache = ScanCache(tmp_path / "cache.sqlite")
+
+    # Alternating single-head and multi-head scans keep each other's rows.
+    for multihead in (False, True, False, True):
+        card_scanner.scan_files([path], cache=cache, multihead=multihead)
+    assert scanned == [False, True]
+
+
+def test_failed_lookups_are_not_cached(tmp_path, monkeypatch):
+    paths = []
+    for i in range(2):
+        p = tmp_path / f"img{i}.jpg"
+        p.write_bytes(f"image-{i}".encode())
+        paths.append(p)
+    monkeypatch.setattr(card_scanner, "scan_model_version", lambda multihead=False: "v1")
+    monkeypatch.setattr(card_scanner, "_image_tensor", lambda p: p)
+    monkeypatch.setattr(card_scanner, "predict_card_ids", lambda ts, *a, **k: ["base1-58"] * len(ts))
+    monkeypatch.setattr(card_scanner, "predict_types", lambda ts, *a, **k: ["holo"] * len(ts))
+    details = {"base1-58": None}
+    monkeypatch.setattr(card_scanner, "query_cards_by_id", lambda ids, lang="en": dict(details))
+    cache = ScanCache(tmp_path / "cache.sqlite")
+
+    assert card_scanner.scan_image(paths[0], cache=cache)["Name"] == "Unknown"
+    assert card_scanner.scan_files(paths[1:], cache=cache)[0]["Name"] == "Unknown"
+    assert cache.get(cache.key(paths[0], "v1")) is None
+    assert cache.get(cache.key(paths[1], "v1")) is None
+
+    # Once the API answers again the rows are looked up and cached.
+    details["base1-58"] = {"Name": "Pikachu"}
+    assert card_scanner.scan_image(paths[0], cache=cache)["Name"] == "Pikachu"
+    assert cache.get(cache.key(paths[0], "v1"))["Name"] == "Pikachu"
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import requests
+
+import scanner.card_scanner as card_scanner
+from scanner import catalog, set_index
+from scanner.set_index import SetIndex
+from scanner.tcgdex_client import TCGdexClient
+
+SETS_URL = "https://tcgdex.test/v2/en/sets"
+SETS = [
+    {"id": "base1", "cardCount": {"total": 102, "official": 102}},
+    {"id": "base4", "cardCount": {"total": 130, "official": 130}},
+    {"id": "ex1", "cardCount": {"total": 109, "official": 102}},
+    {"id": "sv1", "cardCount": {"total": 258, "official": 198}},
+]
+CARDS = {
+    "https://tcgdex.test/v2/en/cards/base1-58": {"name": "Pikachu", "number": "58"},
+    "https://tcgdex.test/v2/en/cards/ex1-58": {"name": "Ekans", "number": "58"},
+}
+
+
+class FakeClient(TCGdexClient):
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self.urls = []
+        self._urls_lock = threading.Lock()
+
+    def get_json(self, url, params=None, timeout=None, cached=True):
+        with self._urls_lock:
+            self.urls.append(url)
+        if url == SETS_URL:
+            return SETS
+        if url not in CARDS:
+            raise requests.HTTPError("404")
+        return CARDS[url]
+
+
+def test_set_index_persists_and_expires(tmp_path, monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(set_index, "get_client", lambda: client)
+    cache = tmp_path / "sets.json"
+
+    index = SetIndex(SETS_URL, cache_path=cache)
+    assert sorted(index.set_ids(102)) == ["base1", "ex1"]
+    assert index.set_ids("198") == ["sv1"]
+    assert index.set_ids(7) == []
+    assert client.urls == [SETS_URL]
+
+    # A fresh process reads the listing from disk.
+    assert sorted(SetIndex(SETS_URL, cache_path=cache).set_ids(102)) == ["base1", "ex1"]
+    assert client.urls == [SETS_URL]
+
+    stale = SetIndex(SETS_URL, cache_path=cache, ttl=0)
+    time.sleep(0.01)
+    stale.set_ids(102)
+    assert client.urls == [SETS_URL, SETS_URL]
+
+
+def test_lookup_by_number_and_total_uses_index(tmp_path, monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(set_index, "get_client", lambda: client)
+    monkeypatch.setattr(card_scanner, "get_client", lambda: client)
+    monkeypatch.setattr(catalog, "CATALOG_PATH", tmp_path / "missing.sqlite")
+    monkeypatch.setattr(catalog, "_catalog", None)
+    monkeypatch.setitem(set_index._indexes, SETS_URL, SetIndex(SETS_URL, tmp_path / "s.json"))
+    monkeypatch.setattr(card_scanner, "SET_LIST_URL", SETS_URL)
+    monkeypatch.setattr(card_scanner, "CARD_URL_TEMPLATE", "https://tcgdex.test/v2/en/cards/{set_id}-{card_number}")
+
+    assert card_scanner.lookup_card_by_number_and_total("58", "102", "Pikachu")["Set"] == "base1"
+    assert card_scanner.lookup_card_by_number_and_total("58", "102", "Ekans")["Set"] == "ex1"
+    assert card_scanner.lookup_card_by_number_and_total("58", "102") is None
+    assert card_scanner.lookup_card_by_number_and_total("1", "130") is None
+    assert client.urls.count(SETS_URL) == 1
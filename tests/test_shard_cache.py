@@ -0,0 +1,68 @@
+import os
+import pickle
+
+import numpy as np
+from PIL import Image
+import pytest
+
+torch = pytest.importorskip("torch")
+from torchvision import transforms
+
+from scanner import shard_cache
+from scanner.preprocessing import open_rgb
+from scanner.shard_cache import ShardDataset, build_shards
+
+
+def _write_card(path, seed):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    Image.fromarray(rng.integers(0, 256, (140, 100, 3), dtype=np.uint8)).save(path)
+
+
+@pytest.fixture
+def folder(tmp_path):
+    root = tmp_path / "cards"
+    for i, name in enumerate(["base1-4/a.jpg", "base1-4/b.jpg", "base1-58/a.png"]):
+        _write_card(root / name, i)
+    return root
+
+
+def test_shards_match_imagefolder_transform(folder, tmp_path):
+    cache = tmp_path / "shards"
+
+    assert build_shards(folder, cache, shard_size=2) == {"reused": 0, "added": 3, "removed": 0}
+    dataset = ShardDataset(cache)
+
+    assert dataset.classes == ["base1-4", "base1-58"]
+    assert dataset.targets == [0, 0, 1]
+    assert len(list(cache.glob("shard-*.npy"))) == 2
+    transform = transforms.Compose([transforms.Resize((64, 64)), transforms.ToTensor()])
+    image, label = dataset[2]
+    assert label == 1
+    assert torch.equal(image, transform(open_rgb(folder / "base1-58" / "a.png")))
+    # Workers receive the index only, not mapped shard data.
+    dataset[0]
+    assert pickle.loads(pickle.dumps(dataset))._arrays == {}
+
+
+def test_incremental_rebuild(folder, tmp_path, monkeypatch):
+    cache = tmp_path / "shards"
+    build_shards(folder, cache)
+    decoded = []
+    decode = shard_cache.decode
+    monkeypatch.setattr(shard_cache, "decode", lambda p, size: decoded.append(p.name) or decode(p, size))
+
+    # Touching a file without changing it does not decode it again.
+    path = folder / "base1-4" / "a.jpg"
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    _write_card(folder / "base2-1" / "c.jpg", 7)
+    (folder / "base1-4" / "b.jpg").unlink()
+
+    assert build_shards(folder, cache) == {"reused": 2, "added": 1, "removed": 1}
+    assert decoded == ["c.jpg"]
+    assert ShardDataset(cache).classes == ["base1-4", "base1-58", "base2-1"]
+
+    # A different input size rebuilds all rows and drops the old shards.
+    assert build_shards(folder, cache, size=(32, 32))["added"] == 3
+    assert len(list(cache.glob("shard-*.npy"))) == 1
+    assert ShardDataset(cache)[0][0].shape == (3, 32, 32)
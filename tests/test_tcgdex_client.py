@@ -0,0 +1,51 @@
+import pytest
+import requests
+
+from scanner.tcgdex_client import TCGdexClient
+
+
+def _flaky(path, attempt):
+    """503 on the first request of ``/flaky``, 404 for ``/missing``."""
+    if path.startswith("/flaky") and attempt == 1:
+        return 503, None
+    if path.startswith("/missing"):
+        return 404, None
+    return 200, {"path": path}
+
+
+@pytest.fixture
+def server_url(fake_server):
+    fake_server.respond = _flaky
+    fake_server.delay = 0.05
+    return fake_server.url
+
+
+def test_retries_transient_errors_but_not_missing(server_url, fake_server, clock):
+    client = TCGdexClient(retries=2, backoff=0.01, clock=clock, sleep=clock.sleep)
+    assert client.get_json(f"{server_url}/flaky") == {"path": "/flaky"}
+    assert fake_server.calls["/flaky"] == 2
+
+    with pytest.raises(requests.HTTPError):
+        client.get_json(f"{server_url}/missing")
+    assert fake_server.calls["/missing"] == 1
+    client.close()
+
+
+def test_map_runs_concurrently_within_cap(server_url, fake_server):
+    client = TCGdexClient(max_workers=3)
+    paths = [f"/card/{i}" for i in range(9)]
+    results = client.map(lambda p: client.get_json(server_url + p), paths)
+
+    assert [r["path"] for r in results] == paths
+    # Requests overlapped, but never more than the pool size at once.
+    assert fake_server.max_in_flight == 3
+    client.close()
+
+
+def test_retry_after_is_capped():
+    client = TCGdexClient(backoff=10, max_backoff=2)
+    response = requests.Response()
+    response.headers["Retry-After"] = "86400"
+
+    assert client._delay(0, response) == 2
+    assert client._delay(5) == 2
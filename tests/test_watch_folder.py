@@ -0,0 +1,109 @@
+import pytest
+
+from scanner.data_exporter import iter_csv_rows
+from scanner.watch_folder import FolderWatcher
+
+
+def test_debounce_batch_and_append(tmp_path):
+    drop = tmp_path / "drop"
+    drop.mkdir()
+    collection = tmp_path / "main.csv"
+    collection.write_text("CardID,Name,Number,Set,Type,ImagePath\n")
+    scanned = []
+
+    def fake_scan(paths):
+        scanned.append([p.name for p in paths])
+        return [{"Name": p.stem, "Set": "base", "Number": "1", "ImagePath": str(p)} for p in paths]
+
+    watcher = FolderWatcher(
+        drop,
+        collection_path=collection,
+        batch_size=2,
+        settle_seconds=5,
+        max_wait=30,
+        scan=fake_scan,
+        use_inotify=False,
+    )
+
+    (drop / "a.jpg").write_bytes(b"a")
+    (drop / "notes.txt").write_text("ignored")
+    watcher.observe(watcher._discover(), now=0)
+    watcher.observe([], now=1)
+    assert watcher.metrics.queue_depth == 0
+
+    (drop / "b.jpg").write_bytes(b"b")
+    watcher.observe(watcher._discover(), now=6)
+    assert watcher.metrics.queue_depth == 1
+    assert watcher.process(now=6) == 0
+
+    watcher.observe([], now=12)
+    assert watcher.metrics.queue_depth == 2
+    assert watcher.process(now=12) == 2
+    assert scanned == [["a.jpg", "b.jpg"]]
+
+    (drop / "c.jpg").write_bytes(b"c")
+    watcher.observe(watcher._discover(), now=20)
+    watcher.observe(watcher._discover(), now=26)
+    assert watcher.process(now=50) == 0
+    assert watcher.process(now=56) == 1
+
+    rows = list(iter_csv_rows(str(collection)))
+    assert [r["Name"] for r in rows] == ["a", "b", "c"]
+    snapshot = watcher.metrics.snapshot(now=56)
+    assert snapshot["files_scanned"] == 3
+    assert snapshot["batches"] == 2
+    assert snapshot["queue_depth"] == 0
+
+    restarted = FolderWatcher(drop, collection_path=collection, scan=fake_scan, use_inotify=False)
+    restarted.observe(restarted._discover(), now=100)
+    assert restarted.metrics.files_seen == 0
+
+
+def test_bad_file_is_retried_alone_then_quarantined(tmp_path):
+    drop = tmp_path / "drop"
+    drop.mkdir()
+    collection = tmp_path / "main.csv"
+    calls = []
+
+    def fake_scan(paths):
+        calls.append([p.name for p in paths])
+        if any(p.name == "bad.jpg" for p in paths):
+            raise OSError("cannot identify image file")
+        return [{"Name": p.stem, "ImagePath": str(p)} for p in paths]
+
+    watcher = FolderWatcher(
+        drop,
+        collection_path=collection,
+        batch_size=3,
+        settle_seconds=0,
+        max_attempts=2,
+        scan=fake_scan,
+        use_inotify=False,
+    )
+    for name in ("a.jpg", "bad.jpg", "c.jpg"):
+        (drop / name).write_bytes(name.encode())
+
+    watcher.observe(watcher._discover(), now=0)
+    watcher.observe([], now=0)
+    assert watcher.process(now=0, force=True) == 2
+    assert calls == [["a.jpg", "bad.jpg", "c.jpg"], ["a.jpg"], ["bad.jpg"], ["c.jpg"]]
+    assert [r["Name"] for r in iter_csv_rows(str(collection))] == ["a", "c"]
+
+    # The bad file comes back with the next full listing and fails again.
+    watcher.observe(watcher._discover(), now=1)
+    watcher.observe([], now=1)
+    assert watcher.process(now=1, force=True) == 0
+    assert not (drop / "bad.jpg").exists()
+    assert (drop / "failed" / "bad.jpg").exists()
+    assert watcher.metrics.snapshot()["quarantined"] == 1
+
+    watcher.observe(watcher._discover(), now=2)
+    assert watcher.metrics.queue_depth == 0
+
+
+def test_collection_without_scanner_columns_is_rejected(tmp_path):
+    collection = tmp_path / "main.csv"
+    collection.write_text("Name,Set,Rarity,Number,ImagePath\n")
+
+    with pytest.raises(ValueError, match="CardID, Type"):
+        FolderWatcher(tmp_path, collection_path=collection, scan=lambda p: [], use_inotify=False)